@@ -5,6 +5,7 @@ from logging import getLogger
 import pandas as pd
 import wblca_benchmark_v2_data_prep.utils.general as gen
 import wblca_benchmark_v2_data_prep.data_record.internal_data_calcs as calc
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
 
 
@@ -79,4 +80,6 @@ def create_internal_data():
 
 
 if __name__ == '__main__':
-    create_internal_data()
+    report = RunReport.for_script(Path(__file__).parents[2], 'data_record/1_internal_data')
+    with report.measure('internal_data'):
+        create_internal_data()
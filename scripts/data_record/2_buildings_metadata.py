@@ -5,6 +5,7 @@ from logging import getLogger
 import pandas as pd
 import wblca_benchmark_v2_data_prep.utils.general as gen
 import wblca_benchmark_v2_data_prep.data_record.metadata_calcs as calc
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
 
 
@@ -28,7 +29,6 @@ def create_buildings_metadata():
     config_path = main_directory.joinpath('references/config_data_record.yml')
     public_dataset_directory = main_directory.joinpath('data/data_record/public')
 
-    wblca_output = gen.read_csv(wblca_output_path)
     internal_data = pd.read_excel(internal_data_path, index_col=False).set_index('project_index')
 
     # instantiate logger
@@ -56,6 +56,12 @@ def create_buildings_metadata():
     assert impact_renaming is not None, 'The dict for impact renaming could not be set'
     buildings_metadata_logger.info('End configuration.')
 
+    # only the columns the totals are calculated from are read
+    wblca_output = gen.read_csv(
+        wblca_output_path,
+        usecols=['CLF Model ID', 'Life Cycle Stage', 'Cat_Ele_1', *impact_type_list]
+    )
+
     # remove module d and site, mep and ffe scopes
     buildings_metadata_logger.info('Exclude Module D and scopes that are not in %s.', scope_type)
     excluding_d_wblca_output = (
@@ -115,4 +121,6 @@ def create_buildings_metadata():
 
 
 if __name__ == '__main__':
-    create_buildings_metadata()
+    report = RunReport.for_script(Path(__file__).parents[2], 'data_record/2_buildings_metadata')
+    with report.measure('buildings_metadata'):
+        create_buildings_metadata()
@@ -6,6 +6,7 @@ import pandas as pd
 import wblca_benchmark_v2_data_prep.utils.general as gen
 import wblca_benchmark_v2_data_prep.data_record.results_calcs as calc
 import wblca_benchmark_v2_data_prep.data_record.metadata_calcs as meta
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
 
 
@@ -114,4 +115,6 @@ def create_lca_full_results():
 
 
 if __name__ == '__main__':
-    create_lca_full_results()
+    report = RunReport.for_script(Path(__file__).parents[2], 'data_record/3_lca_full_results')
+    with report.measure('lca_full_results'):
+        create_lca_full_results()
@@ -2,12 +2,14 @@
 """Cleans raw tally and oneclick models."""
 from pathlib import Path
 from logging import getLogger
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
-import wblca_benchmark_v2_data_prep.lca_results.clean as clean_util
-import wblca_benchmark_v2_data_prep.utils.general as general_util
+from wblca_benchmark_v2_data_prep.utils.manifest import StageManifest, map_changed_files
+from wblca_benchmark_v2_data_prep.utils.parallel import parse_workers
+import wblca_benchmark_v2_data_prep.lca_results.stages as stages
 
 
-def clean_raw_tally_files():
+def clean_raw_tally_files(workers: int = 1):
     """Clean raw tally files for further analysis.
 
     This script does the following:
@@ -16,6 +18,9 @@ def clean_raw_tally_files():
     - Cleans tally files
     - adjusts the csi division of tally walls
     - writes tally files to cleaned directory
+
+    Args:
+        workers (int): Number of worker processes used to clean the files
     """
     current_file_path = Path(__file__)
     main_directory = current_file_path.parents[2]
@@ -33,27 +38,26 @@ def clean_raw_tally_files():
     main_clean_logger = getLogger('1_clean_script')
     main_clean_logger.info('Logger has been set up.')
 
-    for tally_file in raw_tally_directory.glob('*.csv'):
-        main_clean_logger.info('Begin cleaning of %s', tally_file.stem)
-        # read tally files
-        tally_df = general_util.read_csv(tally_file)
-
-        tally_df = clean_util.clean_tally_df(
-            tally_df=tally_df,
-            tally_file=tally_file
-        )
-
-        adjusted_tally_df = clean_util.adjust_tally_walls(tally_df)
-
-        general_util.write_to_csv(
-            adjusted_tally_df,
-            cleaned_tally_directory,
-            tally_file.stem
-        )
-        main_clean_logger.info('End cleaning of %s', tally_file.stem)
+    storage_config_path = main_directory.joinpath('references/config_storage.yml')
+    harmonize_config_path = main_directory.joinpath('references/config_harmonize.yml')
+    storage = stages.table_storage(storage_config_path, harmonize_config_path)
+    report = RunReport.for_script(main_directory, 'lca_results/1_clean')
+    manifest = StageManifest.load(
+        cleaned_tally_directory,
+        stages.stage_rules_hash(storage_config_path, harmonize_config_path)
+    )
+    map_changed_files(
+        stages.clean_tally_file,
+        raw_tally_directory.glob('*.csv'),
+        manifest,
+        workers,
+        write_directory=cleaned_tally_directory,
+        storage=storage,
+        report=report
+    )
 
 
-def clean_raw_oneclick_files():
+def clean_raw_oneclick_files(workers: int = 1):
     """Clean raw One Click LCA files for further analysis.
 
     This script does the following:
@@ -61,6 +65,9 @@ def clean_raw_oneclick_files():
     - Reads oneclick files in raw directory
     - Cleans oneclick files
     - writes oneclick files to cleaned directory
+
+    Args:
+        workers (int): Number of worker processes used to clean the files
     """
     current_file_path = Path(__file__)
     main_directory = current_file_path.parents[2]
@@ -78,24 +85,26 @@ def clean_raw_oneclick_files():
     main_clean_logger = getLogger('1_clean_script')
     main_clean_logger.info('Logger has been set up.')
 
-    for oneclick_file in raw_oneclick_directory.glob('*.xlsx'):
-        main_clean_logger.info('Begin cleaning of %s', oneclick_file.stem)
-        # read oneclick files
-        oneclick_df = clean_util.read_excel(oneclick_file)
-
-        oneclick_df = clean_util.clean_oneclick_df(
-            oneclick_df=oneclick_df,
-            oneclick_file=oneclick_file
-        )
-
-        general_util.write_to_csv(
-            oneclick_df,
-            cleaned_oneclick_directory,
-            oneclick_file.stem
-        )
-        main_clean_logger.info('End cleaning of %s', oneclick_file.stem)
+    storage_config_path = main_directory.joinpath('references/config_storage.yml')
+    harmonize_config_path = main_directory.joinpath('references/config_harmonize.yml')
+    storage = stages.table_storage(storage_config_path, harmonize_config_path)
+    report = RunReport.for_script(main_directory, 'lca_results/1_clean')
+    manifest = StageManifest.load(
+        cleaned_oneclick_directory,
+        stages.stage_rules_hash(storage_config_path, harmonize_config_path)
+    )
+    map_changed_files(
+        stages.clean_oneclick_file,
+        raw_oneclick_directory.glob('*.xlsx'),
+        manifest,
+        workers,
+        write_directory=cleaned_oneclick_directory,
+        storage=storage,
+        report=report
+    )
 
 
 if __name__ == '__main__':
-    clean_raw_tally_files()
-    clean_raw_oneclick_files()
+    number_of_workers = parse_workers(__doc__)
+    clean_raw_tally_files(number_of_workers)
+    clean_raw_oneclick_files(number_of_workers)
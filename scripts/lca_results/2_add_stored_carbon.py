@@ -2,12 +2,14 @@
 """Adds stored carbon to Tally models."""
 from pathlib import Path
 from logging import getLogger
-import pandas as pd
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
-import wblca_benchmark_v2_data_prep.utils.general as gen
+from wblca_benchmark_v2_data_prep.utils.manifest import StageManifest, map_changed_files
+from wblca_benchmark_v2_data_prep.utils.parallel import parse_workers
+import wblca_benchmark_v2_data_prep.lca_results.stages as stages
 
 
-def add_stored_carbon():
+def add_stored_carbon(workers: int = 1):
     """
     Adds stored carbon to projects with biogenic carbon.
 
@@ -19,6 +21,9 @@ def add_stored_carbon():
     - Creates new Stored Biogenic Carbon column
     - Updates each A1-A3 value in Stored Biogenic Carbon column with mass * stored carbon factor
     - Writes file to csc directory
+
+    Args:
+        workers (int): Number of worker processes used to process the files
     """
     current_file_path = Path(__file__)
     main_directory = current_file_path.parents[2]
@@ -38,41 +43,31 @@ def add_stored_carbon():
     csc_logger = getLogger('2_add_stored_carbon_script')
     csc_logger.info('Logger has been set up.')
 
-    csc_logger.info('Read stored carbon database.')
-    full_stored_bio_database = pd.read_excel(stored_bio_database_path, sheet_name='csc')
-    stored_bio_data_short = full_stored_bio_database[
-        ['Name_Tally Material', 'Stored Carbon (C02eq/kg)']
-    ]
-
-    for tally_file in cleaned_tally_directory.glob('*.csv'):
-        csc_logger.info('Begin adding stored carbon to %s', tally_file.name)
-        tally_df = gen.read_csv(tally_file)
-
-        csc_logger.info('Merge stored carbon database based on material name.')
-        merged_tally_df = tally_df.merge(
-            right=stored_bio_data_short,
-            left_on='Material Name',
-            right_on='Name_Tally Material',
-            how='left'
-        )
-
-        merged_tally_df['Stored Biogenic Carbon'] = 0.0
-
-        csc_logger.info('Calculate stored carbon for materials in A1-A3 stage')
-        merged_tally_df.loc[
-            (merged_tally_df['Life Cycle Stage'] == '[A1-A3] Product')
-            | (merged_tally_df['Life Cycle Stage'] == 'Product'),
-            'Stored Biogenic Carbon'
-        ] = merged_tally_df['Mass Total (kg)'] * merged_tally_df['Stored Carbon (C02eq/kg)']
-
-        gen.write_to_csv(
-            merged_tally_df,
-            csc_tally_directory,
-            f'{tally_file.stem}_csc'
+    storage_config_path = main_directory.joinpath('references/config_storage.yml')
+    harmonize_config_path = main_directory.joinpath('references/config_harmonize.yml')
+    storage = stages.table_storage(storage_config_path, harmonize_config_path)
+    stored_bio_data_short = stages.read_stored_carbon_database(
+        stored_bio_database_path, storage.excel_engine
+    )
+    report = RunReport.for_script(main_directory, 'lca_results/2_add_stored_carbon')
+    manifest = StageManifest.load(
+        csc_tally_directory,
+        stages.stage_rules_hash(
+            storage_config_path, harmonize_config_path, stored_bio_database_path
         )
-        csc_logger.info('Added stored carbon to %s', tally_file.name)
+    )
+    map_changed_files(
+        stages.add_stored_carbon_file,
+        storage.glob(cleaned_tally_directory),
+        manifest,
+        workers,
+        write_directory=csc_tally_directory,
+        stored_bio_data_short=stored_bio_data_short,
+        storage=storage,
+        report=report
+    )
 
 
 if __name__ == "__main__":
 
-    add_stored_carbon()
+    add_stored_carbon(parse_workers(__doc__))
@@ -2,15 +2,16 @@
 """Module that implements element mapping for Tally and One Click LCA"""
 from pathlib import Path
 from logging import getLogger
-from wblca_benchmark_v2_data_prep.lca_results.MappingImplementation import \
-    TallyElementMapper, OneClickElementMapper
-import wblca_benchmark_v2_data_prep.lca_results.oneclick_ele_filters as oc_fi
-import wblca_benchmark_v2_data_prep.lca_results.tally_ele_filters as t_fi
-import wblca_benchmark_v2_data_prep.utils.general as gen
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
+from wblca_benchmark_v2_data_prep.utils.manifest import \
+    StageManifest, map_changed_files, map_changed_files_batched
+from wblca_benchmark_v2_data_prep.utils.parallel import workers_parser
+from wblca_benchmark_v2_data_prep.lca_results.classification_cache import ClassificationCache
+import wblca_benchmark_v2_data_prep.lca_results.stages as stages
 
 
-def map_tally_elements():
+def map_tally_elements(workers: int = 1, batch: bool = False):
     """Maps Tally elements.
 
     This script does the following:
@@ -18,8 +19,13 @@ def map_tally_elements():
     - Instantiates filters created in tally_ele_filters
     - Reads tally files
     - Instantiates a mapper object
-    - Loops through the filters and applies them to the tally file
+    - Compiles the filters and applies them to the tally file in one pass
     - Writes the element mapped file to the element_mapped directory
+
+    Args:
+        workers (int): Number of worker processes used to map the files
+        batch (bool): Map the changed files together with one pass of the filters instead
+            of one file at a time, workers are then not used
     """
     current_file_path = Path(__file__)
     main_directory = current_file_path.parents[2]
@@ -36,48 +42,45 @@ def map_tally_elements():
     main_map_ele_logger = getLogger('3_map_elements_script')
     main_map_ele_logger.info('Logger has been set up.')
 
-    tally_filters = [
-        t_fi.CurtainWallPanels('CLF Omni'),
-        t_fi.CurtainWallMullions('CLF Omni'),
-        t_fi.Doors('CLF Omni'),
-        t_fi.Floors('CLF Omni'),
-        t_fi.Roofs('CLF Omni'),
-        t_fi.Railings('CLF Omni'),
-        t_fi.Stairs('CLF Omni'),
-        t_fi.StructuralColumns('CLF Omni'),
-        t_fi.StructuralConnections('CLF Omni'),
-        t_fi.StructuralFoundations('CLF Omni'),
-        t_fi.StructuralFraming('CLF Omni'),
-        t_fi.Walls('CLF Omni'),
-        t_fi.Windows('CLF Omni'),
-    ]
-
-    for tally_file in ex_bio_tally_directory.glob('*.csv'):
-        main_map_ele_logger.info('Begin mapping elements for %s', tally_file.name)
-        # read combined tally files
-        tally_df = gen.read_csv(tally_file)
-
-        # instantiate ElementMapper
-        Mapper = TallyElementMapper(
-            tally_df,
-            t_fi.Ceilings('CLF Omni')
+    storage_config_path = main_directory.joinpath('references/config_storage.yml')
+    harmonize_config_path = main_directory.joinpath('references/config_harmonize.yml')
+    storage = stages.table_storage(storage_config_path, harmonize_config_path)
+    report = RunReport.for_script(main_directory, 'lca_results/3_map_elements')
+    cache = ClassificationCache(
+        main_directory.joinpath('data/lca_results/classification_cache.sqlite'),
+        stages.stage_rules_hash()
+    )
+    write_directory = main_directory.joinpath('data/lca_results/element_mapped/tally')
+    manifest = StageManifest.load(
+        write_directory,
+        stages.stage_rules_hash(storage_config_path, harmonize_config_path)
+    )
+    if batch:
+        map_changed_files_batched(
+            stages.map_files_batched,
+            storage.glob(ex_bio_tally_directory),
+            manifest,
+            write_directory=write_directory,
+            stage='tally_elements',
+            storage=storage,
+            cache=cache,
+            report=report
         )
-        Mapper.do_filtering()
-
-        for fil in tally_filters:
-            Mapper.change_filter_type(fil)
-            Mapper.do_filtering()
-
-        Mapper.write_csv(
-            main_directory.joinpath(
-                f'data/lca_results/element_mapped/tally/{tally_file.stem}_EleMapped.csv'
-            )
+    else:
+        map_changed_files(
+            stages.map_model_file,
+            storage.glob(ex_bio_tally_directory),
+            manifest,
+            workers,
+            write_directory=write_directory,
+            stage='tally_elements',
+            storage=storage,
+            cache=cache,
+            report=report
         )
-        main_map_ele_logger.info('Elements mapped for %s.', tally_file.name)
-        # Mapper.write_pickle()
 
 
-def map_oneclick_elements():
+def map_oneclick_elements(workers: int = 1, batch: bool = False):
     """Maps oneclick elements.
 
     This script does the following:
@@ -85,8 +88,13 @@ def map_oneclick_elements():
     - Instantiates filters created in oneclick_ele_filters
     - Reads oneclick files
     - Instantiates a mapper object
-    - Loops through the filters and applies them to the oneclick file
+    - Compiles the filters and applies them to the oneclick file in one pass
     - Writes the element mapped file to the element_mapped directory
+
+    Args:
+        workers (int): Number of worker processes used to map the files
+        batch (bool): Map the changed files together with one pass of the filters instead
+            of one file at a time, workers are then not used
     """
     current_file_path = Path(__file__)
     main_directory = current_file_path.parents[2]
@@ -104,39 +112,51 @@ def map_oneclick_elements():
     main_map_ele_logger = getLogger('3_map_elements_script')
     main_map_ele_logger.info('Logger has been set up.')
 
-    oneclick_filters = [
-        oc_fi.OmniClassShellSuperstructure('CLF Omni'),
-        oc_fi.OmniClassShellEnclosure('CLF Omni'),
-        oc_fi.OmniClassInteriorConstruction('CLF Omni'),
-        oc_fi.OmniClassInteriorFinishes('CLF Omni'),
-        oc_fi.OmniClassMEP('CLF Omni'),
-        oc_fi.OmniClassNotDefined('CLF Omni'),
-        oc_fi.CSIDivision('CLF Omni'),
-    ]
-
-    for oneclick_file in cleaned_oneclick_directory.glob('*.csv*'):
-        main_map_ele_logger.info('Begin mapping elements for %s', oneclick_file.name)
-        oneclick_df = gen.read_csv(oneclick_file)
-
-        Mapper = OneClickElementMapper(
-            oneclick_df,
-            oc_fi.OmniClassSubstructure('CLF Omni')
+    storage_config_path = main_directory.joinpath('references/config_storage.yml')
+    harmonize_config_path = main_directory.joinpath('references/config_harmonize.yml')
+    storage = stages.table_storage(storage_config_path, harmonize_config_path)
+    report = RunReport.for_script(main_directory, 'lca_results/3_map_elements')
+    cache = ClassificationCache(
+        main_directory.joinpath('data/lca_results/classification_cache.sqlite'),
+        stages.stage_rules_hash()
+    )
+    write_directory = main_directory.joinpath('data/lca_results/element_mapped/oneclick')
+    manifest = StageManifest.load(
+        write_directory,
+        stages.stage_rules_hash(storage_config_path, harmonize_config_path)
+    )
+    if batch:
+        map_changed_files_batched(
+            stages.map_files_batched,
+            storage.glob(cleaned_oneclick_directory),
+            manifest,
+            write_directory=write_directory,
+            stage='oneclick_elements',
+            storage=storage,
+            cache=cache,
+            report=report
         )
-        Mapper.do_filtering()
-
-        for fil in oneclick_filters:
-            Mapper.change_filter_type(fil)
-            Mapper.do_filtering()
-
-        Mapper.write_csv(
-            main_directory.joinpath(
-                f'data/lca_results/element_mapped/oneclick/{oneclick_file.stem}_EleMapped.csv'
-            )
+    else:
+        map_changed_files(
+            stages.map_model_file,
+            storage.glob(cleaned_oneclick_directory),
+            manifest,
+            workers,
+            write_directory=write_directory,
+            stage='oneclick_elements',
+            storage=storage,
+            cache=cache,
+            report=report
         )
-        main_map_ele_logger.info('Elements mapped for %s.', oneclick_file.name)
-        # Mapper.write_pickle()
 
 
 if __name__ == '__main__':
-    map_tally_elements()
-    map_oneclick_elements()
+    parser = workers_parser(__doc__)
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='map all changed files of a tool together instead of one at a time'
+    )
+    arguments = parser.parse_args()
+    map_tally_elements(arguments.workers, arguments.batch)
+    map_oneclick_elements(arguments.workers, arguments.batch)
@@ -2,14 +2,16 @@
 """Module that implements element mapping for Tally and One Click LCA"""
 from pathlib import Path
 from logging import getLogger
-from wblca_benchmark_v2_data_prep.lca_results.MappingImplementation import \
-    TallyRefinedElementMapper, OneClickRefinedElementMapper
-import wblca_benchmark_v2_data_prep.lca_results.comb_refined_ele_filters as ref
-import wblca_benchmark_v2_data_prep.utils.general as gen
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
+from wblca_benchmark_v2_data_prep.utils.manifest import \
+    StageManifest, map_changed_files, map_changed_files_batched
+from wblca_benchmark_v2_data_prep.utils.parallel import workers_parser
+from wblca_benchmark_v2_data_prep.lca_results.classification_cache import ClassificationCache
+import wblca_benchmark_v2_data_prep.lca_results.stages as stages
 
 
-def map_tally_elements_refined():
+def map_tally_elements_refined(workers: int = 1, batch: bool = False):
     """Maps Tally elements a second time.
 
     This script does the following:
@@ -18,6 +20,11 @@ def map_tally_elements_refined():
     - Instatiates the refined element mapper.
     - filters the tally file based on material mapping that has occured.
     - Writes the file to the ref_ele_mapped directory.
+
+    Args:
+        workers (int): Number of worker processes used to map the files
+        batch (bool): Map the changed files together with one pass of the filters instead
+            of one file at a time, workers are then not used
     """
     current_file_path = Path(__file__)
     main_directory = current_file_path.parents[2]
@@ -33,29 +40,45 @@ def map_tally_elements_refined():
     main_map_ele_ref_logger = getLogger('5_map_elements_refined_script')
     main_map_ele_ref_logger.info('Logger has been set up.')
 
-    for tally_file in mat_mapped_tally_directory.glob('*.csv'):
-        main_map_ele_ref_logger.info(
-            'Begin mapping elements in a refined method for %s', tally_file.name
-        )
-        # read combined tally files
-        tally_df = gen.read_csv(tally_file)
-
-        # instantiate ElementMapper
-        Mapper = TallyRefinedElementMapper(
-            tally_df,
-            ref.RefinedElementFilter('CLF Omni')
+    storage_config_path = main_directory.joinpath('references/config_storage.yml')
+    harmonize_config_path = main_directory.joinpath('references/config_harmonize.yml')
+    storage = stages.table_storage(storage_config_path, harmonize_config_path)
+    report = RunReport.for_script(main_directory, 'lca_results/5_map_elements_refined')
+    cache = ClassificationCache(
+        main_directory.joinpath('data/lca_results/classification_cache.sqlite'),
+        stages.stage_rules_hash()
+    )
+    write_directory = main_directory.joinpath('data/lca_results/ref_ele_mapped/tally')
+    manifest = StageManifest.load(
+        write_directory,
+        stages.stage_rules_hash(storage_config_path, harmonize_config_path)
+    )
+    if batch:
+        map_changed_files_batched(
+            stages.map_files_batched,
+            storage.glob(mat_mapped_tally_directory),
+            manifest,
+            write_directory=write_directory,
+            stage='tally_elements_refined',
+            storage=storage,
+            cache=cache,
+            report=report
         )
-        Mapper.do_filtering()
-
-        Mapper.write_csv(
-            main_directory.joinpath(
-                f'data/lca_results/ref_ele_mapped/tally/{tally_file.stem}_RefMapped.csv'
-            )
+    else:
+        map_changed_files(
+            stages.map_model_file,
+            storage.glob(mat_mapped_tally_directory),
+            manifest,
+            workers,
+            write_directory=write_directory,
+            stage='tally_elements_refined',
+            storage=storage,
+            cache=cache,
+            report=report
         )
-        # Mapper.write_pickle()
 
 
-def map_oneclick_elements_refined():
+def map_oneclick_elements_refined(workers: int = 1, batch: bool = False):
     """Maps One Click elements a second time.
 
     This script does the following:
@@ -64,6 +87,11 @@ def map_oneclick_elements_refined():
     - Instatiates the refined element mapper.
     - filters the oneclick file based on material mapping that has occured.
     - Writes the file to the ref_ele_mapped directory.
+
+    Args:
+        workers (int): Number of worker processes used to map the files
+        batch (bool): Map the changed files together with one pass of the filters instead
+            of one file at a time, workers are then not used
     """
     current_file_path = Path(__file__)
     main_directory = current_file_path.parents[2]
@@ -81,26 +109,51 @@ def map_oneclick_elements_refined():
     main_map_ele_ref_logger = getLogger('5_map_elements_refined_script')
     main_map_ele_ref_logger.info('Logger has been set up.')
 
-    for oneclick_file in cleaned_oneclick_directory.glob('*.csv*'):
-        main_map_ele_ref_logger.info(
-            'Begin mapping elements in a refined method for %s', oneclick_file.name
-        )
-        oneclick_df = gen.read_csv(oneclick_file)
-
-        Mapper = OneClickRefinedElementMapper(
-            oneclick_df,
-            ref.RefinedElementFilter('CLF Omni')
+    storage_config_path = main_directory.joinpath('references/config_storage.yml')
+    harmonize_config_path = main_directory.joinpath('references/config_harmonize.yml')
+    storage = stages.table_storage(storage_config_path, harmonize_config_path)
+    report = RunReport.for_script(main_directory, 'lca_results/5_map_elements_refined')
+    cache = ClassificationCache(
+        main_directory.joinpath('data/lca_results/classification_cache.sqlite'),
+        stages.stage_rules_hash()
+    )
+    write_directory = main_directory.joinpath('data/lca_results/ref_ele_mapped/oneclick')
+    manifest = StageManifest.load(
+        write_directory,
+        stages.stage_rules_hash(storage_config_path, harmonize_config_path)
+    )
+    if batch:
+        map_changed_files_batched(
+            stages.map_files_batched,
+            storage.glob(cleaned_oneclick_directory),
+            manifest,
+            write_directory=write_directory,
+            stage='oneclick_elements_refined',
+            storage=storage,
+            cache=cache,
+            report=report
         )
-        Mapper.do_filtering()
-
-        Mapper.write_csv(
-            main_directory.joinpath(
-                f'data/lca_results/ref_ele_mapped/oneclick/{oneclick_file.stem}_EleMapped.csv'
-            )
+    else:
+        map_changed_files(
+            stages.map_model_file,
+            storage.glob(cleaned_oneclick_directory),
+            manifest,
+            workers,
+            write_directory=write_directory,
+            stage='oneclick_elements_refined',
+            storage=storage,
+            cache=cache,
+            report=report
         )
-        # Mapper.write_pickle()
 
 
 if __name__ == '__main__':
-    map_tally_elements_refined()
-    map_oneclick_elements_refined()
+    parser = workers_parser(__doc__)
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='map all changed files of a tool together instead of one at a time'
+    )
+    arguments = parser.parse_args()
+    map_tally_elements_refined(arguments.workers, arguments.batch)
+    map_oneclick_elements_refined(arguments.workers, arguments.batch)
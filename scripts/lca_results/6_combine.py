@@ -2,36 +2,39 @@
 """Combines tally and oneclick models into tool specific files."""
 from pathlib import Path
 from logging import getLogger
-import pandas as pd
+import wblca_benchmark_v2_data_prep.lca_results.stages as stages
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport, measure
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
+from wblca_benchmark_v2_data_prep.utils.storage import TableStorage
 
 
-def combine(directory_to_read: Path, write_directory: Path) -> None:
+def combine(directory_to_read: Path, write_directory: Path, file_name: str,
+            storage: TableStorage, report: RunReport = None) -> None:
     """Combines all models in either tally or oneclick folders.
 
+    Models are appended to the combined file one at a time, so the models do not all have
+    to fit in memory.
+
     Args:
         directory_to_read (Path): directory with all models
-        write_directory (Path): location to save combined models
+        write_directory (Path): directory to save combined models to
+        file_name (str): file name of combined models without suffix
+        storage (TableStorage): format of the model files
+        report (RunReport): report of the run, None to not measure the stage
     """
-    df_list = []
-    for file in directory_to_read.glob('*.csv'):
-        temp_df = pd.read_csv(file)
-        df_list.append(temp_df)
-
-    final_df = pd.concat(df_list)
-
-    final_df.to_csv(write_directory, index=False)
+    with measure(report, 'combine', file_name) as measurement:
+        measurement.rows_in = stages.combine_model_files(
+            storage.glob(directory_to_read), write_directory, file_name, storage
+        )
+        measurement.rows_out = measurement.rows_in
 
 
 if __name__ == '__main__':
     current_file_path = Path(__file__)
     main_directory = current_file_path.parents[2]
     tally_directory_to_read = main_directory.joinpath('data/lca_results/ref_ele_mapped/tally')
-    tally_write_path = main_directory.joinpath('data/lca_results/combined/Tally_Model_Combined.csv')
     oneclick_directory_to_read = main_directory.joinpath('data/lca_results/ref_ele_mapped/oneclick')
-    oneclick_write_path = main_directory.joinpath(
-        'data/lca_results/combined/OneClick_Model_Combined.csv'
-    )
+    combined_write_directory = main_directory.joinpath('data/lca_results/combined')
     setup_logger(
         log_file_path=main_directory.joinpath(
             'data/logs/lca_results/combine_lca_results.log'
@@ -42,7 +45,14 @@ if __name__ == '__main__':
     main_combine_logger = getLogger('6_combine_script')
     main_combine_logger.info('Logger has been set up.')
 
+    table_storage = stages.table_storage(
+        main_directory.joinpath('references/config_storage.yml'),
+        main_directory.joinpath('references/config_harmonize.yml')
+    )
+    run_report = RunReport.for_script(main_directory, 'lca_results/6_combine')
     main_combine_logger.info('Combine tally files.')
-    combine(tally_directory_to_read, tally_write_path)
+    combine(tally_directory_to_read, combined_write_directory, 'Tally_Model_Combined',
+            table_storage, run_report)
     main_combine_logger.info('Combine oneclick files.')
-    combine(oneclick_directory_to_read, oneclick_write_path)
+    combine(oneclick_directory_to_read, combined_write_directory, 'OneClick_Model_Combined',
+            table_storage, run_report)
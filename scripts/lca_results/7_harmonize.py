@@ -2,8 +2,9 @@
 """Harmonize tally and one click files."""
 from pathlib import Path
 from logging import getLogger
-import pandas as pd
+import wblca_benchmark_v2_data_prep.lca_results.stages as stages
 import wblca_benchmark_v2_data_prep.utils.general as utils
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
 
 
@@ -34,101 +35,52 @@ def harmonize():
     main_harmonize_logger.info('Logger has been set up.')
 
     main_harmonize_logger.info('Begin configuration.')
-    tally_combined_path = main_directory.joinpath(
-        'data/lca_results/combined/Tally_Model_Combined.csv'
-    )
-    oneclick_combined_path = main_directory.joinpath(
-        'data/lca_results/combined/OneClick_Model_Combined.csv'
+    config_path = main_directory.joinpath('references/config_harmonize.yml')
+    storage = stages.table_storage(
+        main_directory.joinpath('references/config_storage.yml'), config_path
     )
+    combined_directory = main_directory.joinpath('data/lca_results/combined')
+    tally_combined_path = storage.path(combined_directory, 'Tally_Model_Combined')
+    oneclick_combined_path = storage.path(combined_directory, 'OneClick_Model_Combined')
     harmonized_write_path = main_directory.joinpath('data/lca_results/harmonized')
     data_record_write_path = main_directory.joinpath('data/data_record/raw')
-    config_path = main_directory.joinpath('references/config_harmonize.yml')
 
     # read config file
-    config = utils.read_yaml(config_path)
-    assert config is not None, 'The config dictionary could not be set'
-
-    column_removal_tally = config.get('column_removal_tally')
-    assert column_removal_tally is not None, 'The list for column removal for Tally could not \
-be set'
-
-    column_rename_tally = config.get('column_rename_tally')
-    assert column_rename_tally is not None, 'The dict for column renaming for Tally could not \
-be set'
-
-    column_removal_oneclick = config.get('column_removal_oneclick')
-    assert column_removal_oneclick is not None, 'The list for column removal for One Click \
-could not be set'
-
-    column_rename_oneclick = config.get('column_rename_oneclick')
-    assert column_rename_oneclick is not None, 'The dict for column renaming for One Click \
-could not be set'
-
-    column_null_replacement = config.get('column_null_replacement')
-    assert column_null_replacement is not None, 'The list for column null replacement \
-could not be set'
+    config = stages.read_harmonize_config(config_path)
     main_harmonize_logger.info('End configuration.')
 
-    # read combined files
-    main_harmonize_logger.info('Read combined lca_results files.')
-    combined_tally = utils.read_csv(tally_combined_path)
-    combined_oneclick = utils.read_csv(oneclick_combined_path)
-
-    # get the combined sets of columns to drop
-    tally_columns_to_drop = list(
-        set(combined_tally.columns.to_list()) & set(column_removal_tally)
-    )
-    oneclick_columns_to_drop = list(
-        set(combined_oneclick.columns.to_list()) & set(column_removal_oneclick)
-    )
-
-    # rename, drop, and set index for tally and one click
-    main_harmonize_logger.info('Rename, drop, and set index of tally and oneclick files.')
-    combined_tally_adjusted = (combined_tally
-                               .rename(columns=column_rename_tally)
-                               .drop(columns=tally_columns_to_drop)
-                               .set_index('CLF Model ID')
-                               )
-    combined_oneclick_adjusted = (combined_oneclick
-                                  .rename(columns=column_rename_oneclick)
-                                  .drop(columns=oneclick_columns_to_drop)
-                                  .set_index('CLF Model ID')
-                                  )
-
-    # replace values for tally and one click
-    main_harmonize_logger.info('Replace values for tally and oneclick files.')
-    for df_key, value_to_replace_dict in config.get('column_value_replace_oneclick').items():
-        combined_oneclick_adjusted[df_key] = \
-            combined_oneclick_adjusted[df_key].replace(value_to_replace_dict)
-    for df_key, value_to_replace_dict in config.get('column_value_replace_tally').items():
-        combined_tally_adjusted[df_key] = \
-            combined_tally_adjusted[df_key].replace(value_to_replace_dict)
-
-    # fill nulls in impacts & other values
-    main_harmonize_logger.info(
-        'Fill null values for impacts and mess for tally and oneclick files.'
-    )
-    for col_null_replace in column_null_replacement:
-        combined_oneclick_adjusted[col_null_replace] = \
-            combined_oneclick_adjusted[col_null_replace].fillna(0)
-    for col_null_replace in column_null_replacement:
-        combined_tally_adjusted[col_null_replace] = \
-            combined_tally_adjusted[col_null_replace].fillna(0)
-
-    # write the harmonized files
-    utils.write_to_csv(combined_tally_adjusted, harmonized_write_path, 'tally_harmonized')
-    utils.write_to_csv(combined_oneclick_adjusted, harmonized_write_path, 'oneclick_harmonized')
-
-    # combine the raw wblca output files
-    main_harmonize_logger.info('Concatenate tally and oneclick files.')
-    combined_raw_wblca_output = pd.concat(
-        [combined_tally_adjusted, combined_oneclick_adjusted],
-        join='outer'
-    )
-
-    # write to csv
-    utils.write_to_csv(combined_raw_wblca_output, harmonized_write_path, 'combined_harmonized')
-    utils.write_to_csv(combined_raw_wblca_output, data_record_write_path, 'combined_harmonized')
+    report = RunReport.for_script(main_directory, 'lca_results/7_harmonize')
+    with report.measure('harmonize') as measurement:
+        # read combined files
+        main_harmonize_logger.info('Read combined lca_results files.')
+        # columns dropped by the harmonization are not read
+        tally_columns_to_drop = set(config.get('column_removal_tally'))
+        oneclick_columns_to_drop = set(config.get('column_removal_oneclick'))
+        combined_tally = storage.read(
+            tally_combined_path, usecols=lambda column: column not in tally_columns_to_drop
+        )
+        combined_oneclick = storage.read(
+            oneclick_combined_path, usecols=lambda column: column not in oneclick_columns_to_drop
+        )
+        measurement.rows_in = len(combined_tally) + len(combined_oneclick)
+
+        combined_tally_adjusted, combined_oneclick_adjusted, combined_raw_wblca_output = \
+            stages.harmonize_models(combined_tally, combined_oneclick, config)
+        measurement.rows_out = len(combined_raw_wblca_output)
+
+        # write the harmonized files, always as csv for the public record
+        utils.write_to_csv(combined_tally_adjusted, harmonized_write_path, 'tally_harmonized')
+        utils.write_to_csv(
+            combined_oneclick_adjusted, harmonized_write_path, 'oneclick_harmonized'
+        )
+
+        # write to csv
+        utils.write_to_csv(
+            combined_raw_wblca_output, harmonized_write_path, 'combined_harmonized'
+        )
+        utils.write_to_csv(
+            combined_raw_wblca_output, data_record_write_path, 'combined_harmonized'
+        )
 
 
 if __name__ == '__main__':
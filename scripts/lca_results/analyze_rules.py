@@ -0,0 +1,67 @@
+# pylint: disable=C0103
+"""Report the rules of the mapping filter classes that change no row of the models.
+
+Runs each mapping stage on the models it reads (the outputs of scripts 2 to 4) and writes,
+for every rule, the rows it matched, won and changed and the time spent on it, plus a
+summary by filter class, to data/lca_results/rule_analysis. Dead rules change no row:
+they never match, are always overwritten by a later rule, or write the value a row already
+has. The mapped files are not written.
+"""
+import argparse
+from pathlib import Path
+from logging import getLogger
+from wblca_benchmark_v2_data_prep.lca_results.rule_analysis import corpus_rule_usage, \
+    summarize_filters
+from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
+import wblca_benchmark_v2_data_prep.lca_results.stages as stages
+import wblca_benchmark_v2_data_prep.utils.general as gen
+
+
+def analyze_rules(stage_names: list):
+    """Write the rule usage of mapping stages on the models they read.
+
+    Args:
+        stage_names (list): Names of the mapping stages, keys of stages.MAPPING_STAGES
+    """
+    current_file_path = Path(__file__)
+    main_directory = current_file_path.parents[2]
+    setup_logger(
+        log_file_path=main_directory.joinpath('data/logs/lca_results/analyze_rules.log'),
+        level='info'
+    )
+
+    main_analyze_logger = getLogger('analyze_rules_script')
+    main_analyze_logger.info('Logger has been set up.')
+
+    storage = stages.table_storage(
+        main_directory.joinpath('references/config_storage.yml'),
+        main_directory.joinpath('references/config_harmonize.yml')
+    )
+    write_directory = main_directory.joinpath('data/lca_results/rule_analysis')
+    write_directory.mkdir(parents=True, exist_ok=True)
+    for stage in stage_names:
+        files = storage.glob(
+            main_directory.joinpath(stages.MAPPING_INPUT_DIRECTORIES[stage])
+        )
+        if not files:
+            main_analyze_logger.warning('No models to analyze for %s.', stage)
+            continue
+        main_analyze_logger.info('Analyze the rules of %s on %s models.', stage, len(files))
+        mapper_class, filter_stages, _ = stages.MAPPING_STAGES[stage]
+        corpus = corpus_rule_usage(
+            (storage.read(file) for file in files), mapper_class, filter_stages()
+        )
+        gen.write_to_csv(corpus, write_directory, f'{stage}_rules')
+        gen.write_to_csv(summarize_filters(corpus), write_directory, f'{stage}_filters')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--stage',
+        action='append',
+        choices=list(stages.MAPPING_STAGES),
+        help='mapping stage to analyze, can be repeated (default: every stage)'
+    )
+    arguments = parser.parse_args()
+    analyze_rules(arguments.stage or list(stages.MAPPING_STAGES))
@@ -0,0 +1,86 @@
+# pylint: disable=C0103
+"""Profile the filter classes of the mapping stages on the models they read.
+
+Runs each mapping stage on the models it reads (the outputs of scripts 2 to 4) with a
+profile per model recording the time of every filter class, the time and rows matched and
+changed of every rule, and the time spent evaluating every filter. Profiles are written to
+data/logs/lca_results/profiles/<stage> as json, with a summary by filter class, the
+slowest filters and folded stacks of all models for flame graph tools. The mapped files
+are not written.
+"""
+import argparse
+from pathlib import Path
+from logging import getLogger
+import pandas as pd
+from wblca_benchmark_v2_data_prep.lca_results.profiling import FilterProfile, \
+    fold_profiles, summarize_profiles
+from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
+import wblca_benchmark_v2_data_prep.lca_results.stages as stages
+import wblca_benchmark_v2_data_prep.utils.general as gen
+
+
+def profile_mapping(stage_names: list):
+    """Write the profiles of mapping stages on the models they read.
+
+    Args:
+        stage_names (list): Names of the mapping stages, keys of stages.MAPPING_STAGES
+    """
+    current_file_path = Path(__file__)
+    main_directory = current_file_path.parents[2]
+    setup_logger(
+        log_file_path=main_directory.joinpath('data/logs/lca_results/profile_mapping.log'),
+        level='info'
+    )
+
+    main_profile_logger = getLogger('profile_mapping_script')
+    main_profile_logger.info('Logger has been set up.')
+
+    storage = stages.table_storage(
+        main_directory.joinpath('references/config_storage.yml'),
+        main_directory.joinpath('references/config_harmonize.yml')
+    )
+    for stage in stage_names:
+        files = storage.glob(
+            main_directory.joinpath(stages.MAPPING_INPUT_DIRECTORIES[stage])
+        )
+        if not files:
+            main_profile_logger.warning('No models to profile for %s.', stage)
+            continue
+        write_directory = main_directory.joinpath(f'data/logs/lca_results/profiles/{stage}')
+        write_directory.mkdir(parents=True, exist_ok=True)
+        mapper_class, filter_stages, _ = stages.MAPPING_STAGES[stage]
+
+        profiles = []
+        for file in files:
+            main_profile_logger.info('Profile %s for %s.', stage, file.name)
+            profile = FilterProfile(name=file.stem)
+            mapper = mapper_class(storage.read(file), deduplicate=True, profile=profile)
+            for filter_stage in filter_stages():
+                mapper.apply_filters(filter_stage)
+            profile.write(write_directory)
+            profiles.append(profile)
+
+        gen.write_to_csv(summarize_profiles(profiles), write_directory, f'{stage}_filters')
+        masks = pd.concat([profile.frames()['masks'] for profile in profiles])
+        if len(masks):
+            masks = (masks.groupby(['mapper', 'keys', 'predicate'], sort=False)['seconds']
+                     .sum()
+                     .reset_index()
+                     .sort_values('seconds', ascending=False, kind='stable'))
+        gen.write_to_csv(masks, write_directory, f'{stage}_masks')
+        write_directory.joinpath(f'{stage}.folded').write_text(
+            '\n'.join(fold_profiles(profiles)) + '\n', encoding='utf-8'
+        )
+        main_profile_logger.info('Profiles of %s written to %s.', stage, write_directory)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--stage',
+        action='append',
+        choices=list(stages.MAPPING_STAGES),
+        help='mapping stage to profile, can be repeated (default: every stage)'
+    )
+    arguments = parser.parse_args()
+    profile_mapping(arguments.stage or list(stages.MAPPING_STAGES))
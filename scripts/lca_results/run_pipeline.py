@@ -0,0 +1,51 @@
+# pylint: disable=C0103
+"""Run the lca results workflow in memory, from raw models to harmonized files.
+
+Gives the same harmonized files as running scripts 1 to 7 in order without writing the
+intermediate files of each stage. Use --checkpoints to write them as well.
+"""
+from pathlib import Path
+from logging import getLogger
+from wblca_benchmark_v2_data_prep.lca_results.pipeline import LcaResultsPipeline
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
+from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
+from wblca_benchmark_v2_data_prep.utils.parallel import workers_parser
+
+
+def run_pipeline(workers: int = 1, checkpoints: bool = False):
+    """Run every lca results stage for the raw tally and oneclick models.
+
+    Args:
+        workers (int): Number of worker processes used to run the models
+        checkpoints (bool): Write the output of every stage like scripts 1 to 6 do
+    """
+    current_file_path = Path(__file__)
+    main_directory = current_file_path.parents[2]
+    setup_logger(
+        log_file_path=main_directory.joinpath(
+            'data/logs/lca_results/pipeline_lca_results.log'
+        ),
+        level='info'
+    )
+
+    main_pipeline_logger = getLogger('run_pipeline_script')
+    main_pipeline_logger.info('Logger has been set up.')
+
+    LcaResultsPipeline(
+        main_directory,
+        workers=workers,
+        checkpoints=checkpoints,
+        report=RunReport.for_script(main_directory, 'lca_results/run_pipeline')
+    ).run()
+    main_pipeline_logger.info('Pipeline has finished.')
+
+
+if __name__ == '__main__':
+    parser = workers_parser(__doc__)
+    parser.add_argument(
+        '--checkpoints',
+        action='store_true',
+        help='write the intermediate files of every stage'
+    )
+    arguments = parser.parse_args()
+    run_pipeline(arguments.workers, arguments.checkpoints)
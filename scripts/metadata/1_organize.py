@@ -2,15 +2,23 @@
 """Organize project and energy data entry templates."""
 from pathlib import Path
 from logging import getLogger
+from typing import Iterable
+from wblca_benchmark_v2_data_prep.utils.excel_cache import excel_engine
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
+from wblca_benchmark_v2_data_prep.utils.parallel import map_files, parse_workers
 import wblca_benchmark_v2_data_prep.metadata.organize as o_utils
 import wblca_benchmark_v2_data_prep.metadata.general as utils
 
 
-def organize_det(project_or_energy: str):
+def organize_det(project_or_energy: Iterable[str] = ('project', 'energy'),
+                 workers: int = 1):
     """
     Organize project and energy tabs from data entry templates.
 
+    Each data entry template is read once for all of the tabs, and templates are organized
+    in worker processes if workers is above 1.
+
     This function does the following:
 
     - Reads yaml files with column name replacements
@@ -21,6 +29,9 @@ def organize_det(project_or_energy: str):
     - Tests again column names are correct
     - Writes transposed data entry templates to data/organized
 
+    Args:
+        project_or_energy (Iterable[str]): tabs to organize, project and energy by default
+        workers (int): Number of worker processes organizing data entry templates
     """
     current_file_path = Path(__file__)
     main_directory = current_file_path.parents[2]
@@ -29,7 +40,7 @@ def organize_det(project_or_energy: str):
     # instantiate logger
     setup_logger(
         log_file_path=main_directory.joinpath(
-            f'data/logs/metadata/{project_or_energy}_organize.log'
+            'data/logs/metadata/organize.log'
         ),
         level='info'
     )
@@ -43,8 +54,11 @@ def organize_det(project_or_energy: str):
     config_dict = config.get(current_file_path.stem)
     assert config_dict is not None, 'The config dictionary could not be set'
 
-    project_or_energy_flag = config_dict.get(project_or_energy)
-    assert project_or_energy_flag is not None, 'The config could not set project or energy variable'
+    sheet_configs = {}
+    for sheet in project_or_energy:
+        sheet_configs[sheet] = config_dict.get(sheet)
+        assert sheet_configs[sheet] is not None, \
+            'The config could not set project or energy variable'
 
     # set module level local variables from config
     read_data_directory = config_dict.get('read_data_directory')
@@ -52,13 +66,7 @@ def organize_det(project_or_energy: str):
     write_data_dictectory = config_dict.get('write_data_directory')
     module_description = config_dict.get('module_description')
     col_name_replacements_yaml = config_dict.get('col_name_replacements')
-
-    # set project or energy level local variables from config
-    sheet_name = project_or_energy_flag.get('sheet_name')
-    original_column_list = project_or_energy_flag.get('original_column_list')
-    replacement_list = project_or_energy_flag.get('replacement_list')
-    column_list_to_remove = project_or_energy_flag.get('column_list_to_remove')
-    organized_file_suffix = project_or_energy_flag.get('organized_file_suffix')
+    engine = excel_engine(config_dict.get('excel_engine'))
 
     # set paths
     read_data_directory_path = main_directory.joinpath(
@@ -69,60 +77,32 @@ def organize_det(project_or_energy: str):
 
     # read yamls
     replacements = utils.read_yaml(col_name_replacements_path)
-    original_column_list = replacements.get(original_column_list)
-    assert original_column_list is not None, 'The function was not able to read\
-the original column list'
     main_organize_logger.info('End configuration.')
 
-    df_list = []
-    # loop over each raw data entry template
-    for file in read_data_directory_path:
-        main_organize_logger.info('Begin organizing data entry template %s', file.stem)
-        # read excel tab
-        df = o_utils.read_excel(
-            file,
-            sheet_name,
-        )
-
-        # test column names
-        o_utils.column_name_test(
-            df,
-            original_column_list
-        )
-
-        # replace column names
-        df = o_utils.replace_columns(
-            df,
-            replacements,
-            replacement_list
-        )
-
-        # transpose excel sheet
-        df1 = o_utils.transpose_data(
-            df,
-            column_list_to_remove
-        )
-
-        # recheck column names
-        o_utils.column_name_after_transpose_test(
-            df1,
-            original_column_list
-        )
-
-        df_list.append(df1)
-        main_organize_logger.info('End organizing data entry template %s', file.stem)
+    # read each raw data entry template once and organize all of its tabs
+    organized_dets = map_files(
+        o_utils.organize_workbook,
+        read_data_directory_path,
+        workers,
+        sheet_configs=sheet_configs,
+        replacements_yaml=replacements,
+        engine=engine
+    )
 
     # loop over each sheet that was read
-    for det_df in df_list:
-        # write to csv
-        utils.write_to_csv(
-            det_df,
-            write_data_directory_path,
-            organized_file_suffix,
-            module_description
-        )
+    for sheet, sheet_config in sheet_configs.items():
+        for organized_det in organized_dets:
+            # write to csv
+            utils.write_to_csv(
+                organized_det[sheet],
+                write_data_directory_path,
+                sheet_config.get('organized_file_suffix'),
+                module_description
+            )
 
 
 if __name__ == "__main__":
-    organize_det('project')
-    organize_det('energy')
+    organize_workers = parse_workers(__doc__)
+    report = RunReport.for_script(Path(__file__).parents[2], 'metadata/1_organize')
+    with report.measure('organize'):
+        organize_det(workers=organize_workers)
@@ -4,6 +4,7 @@ from pathlib import Path
 import warnings
 from logging import getLogger
 import pandera as pa
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
 import wblca_benchmark_v2_data_prep.metadata.general as utils
 from wblca_benchmark_v2_data_prep.metadata.det_schema import get_project_det_schema, \
@@ -77,5 +78,8 @@ def test_det(project_or_energy: str):
 
 
 if __name__ == '__main__':
-    test_det('energy')
-    test_det('project')
+    report = RunReport.for_script(Path(__file__).parents[2], 'metadata/2_test')
+    with report.measure('test_energy'):
+        test_det('energy')
+    with report.measure('test_project'):
+        test_det('project')
@@ -2,6 +2,7 @@
 """Clean project and energy data entry templates."""
 from pathlib import Path
 from logging import getLogger
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
 import wblca_benchmark_v2_data_prep.metadata.clean as cl_utils
 import wblca_benchmark_v2_data_prep.metadata.general as utils
@@ -124,5 +125,8 @@ def clean_det(project_or_energy: str):
 
 
 if __name__ == '__main__':
-    clean_det('project')
-    clean_det('energy')
+    report = RunReport.for_script(Path(__file__).parents[2], 'metadata/3_clean')
+    with report.measure('clean_project'):
+        clean_det('project')
+    with report.measure('clean_energy'):
+        clean_det('energy')
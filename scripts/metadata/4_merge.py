@@ -2,23 +2,29 @@
 """Merge project and energy data entry templates."""
 from pathlib import Path
 from logging import getLogger
-import pandas as pd
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
+from wblca_benchmark_v2_data_prep.utils.parallel import map_files, parse_workers
 import wblca_benchmark_v2_data_prep.metadata.merge as m_utils
 import wblca_benchmark_v2_data_prep.metadata.general as utils
-# pylint: disable=W0703, W0719
 
 
-def merge_det():
+def merge_det(workers: int = 1):
     """
     Merge project and energy tabs from data entry templates.
 
+    Project and energy tabs are paired by their file names before any of them is read, and
+    firms are merged in worker processes if workers is above 1.
+
     This function does the following:
 
+    - Pairs the project and energy dets of each firm
     - Reads the project and energy dets
-    - Finds the project and energy dets of the same project
     - Merges them together
     - Writes merged files to merged directory
+
+    Args:
+        workers (int): Number of worker processes merging data entry templates
     """
     current_file_path = Path(__file__)
     main_directory = current_file_path.parents[2]
@@ -32,7 +38,7 @@ def merge_det():
         level='info'
     )
 
-    main_merge_logger = getLogger('1_organize_script')
+    main_merge_logger = getLogger('4_merge_script')
     main_merge_logger.info('Logger has been set up.')
 
     main_merge_logger.info('Begin configuration.')
@@ -43,6 +49,10 @@ def merge_det():
         .get(current_file_path.stem).get('read_data_directory')
     read_data_filter = config\
         .get(current_file_path.stem).get('read_data_filter')
+    project_file_suffix = config\
+        .get(current_file_path.stem).get('project_file_suffix')
+    energy_file_suffix = config\
+        .get(current_file_path.stem).get('energy_file_suffix')
     write_data_directory = config.\
         get(current_file_path.stem).get('write_data_directory')
     module_description = config.\
@@ -54,53 +64,30 @@ def merge_det():
     read_data_directory_path = main_directory.joinpath(
         read_data_directory
     ).glob(read_data_filter)
-    read_data_directory_for_filtering = main_directory.joinpath(
-        read_data_directory
-    )
     write_data_directory_path = main_directory.joinpath(write_data_directory)
     main_merge_logger.info('End configuration.')
 
-    firm_list = []
-    main_merge_logger.info('Collecting firm names.')
-    for file in read_data_directory_path:
-        df = utils.read_csv(
-            file
-        )
-        firm_list.append(df.attrs.get('name'))
-    main_merge_logger.info('Collected firm names.')
-    firm_names = pd.Series(firm_list).unique().tolist()
-
-    for firm in firm_names:
-        main_merge_logger.info('Merging for firm %s', firm)
-        energy_det = list(read_data_directory_for_filtering.glob(f'*{firm}_energy*'))[0]
-        project_det = list(read_data_directory_for_filtering.glob(f'*{firm}_project*'))[0]
-
-        e_det_df = m_utils.read_energy_csv(
-            energy_det
-        )
-
-        p_det_df = utils.read_csv(
-            project_det
-        )
+    main_merge_logger.info('Pairing project and energy data entry templates.')
+    det_index = m_utils.index_dets(
+        read_data_directory_path,
+        project_file_suffix,
+        energy_file_suffix
+    )
 
-        try:
-            merged_det = p_det_df.join(e_det_df)
-            merged_det.attrs = {
-                'name': firm
-            }
-        except Exception as e:
-            main_merge_logger.exception('Issue during joining')
-            raise Exception("Issue during joining") from e
+    merged_dets = map_files(m_utils.merge_dets, det_index.values(), workers)
 
-        main_merge_logger.info('Merged project and energy data entry templates.')
+    for merged_det in merged_dets:
         utils.write_to_csv(
             merged_det,
             write_data_directory_path,
             merged_file_suffix,
             module_description
         )
-        main_merge_logger.info('Finished merging for firm %s', firm)
+        main_merge_logger.info('Finished merging for firm %s', merged_det.attrs.get('name'))
 
 
 if __name__ == '__main__':
-    merge_det()
+    merge_workers = parse_workers(__doc__)
+    report = RunReport.for_script(Path(__file__).parents[2], 'metadata/4_merge')
+    with report.measure('merge'):
+        merge_det(workers=merge_workers)
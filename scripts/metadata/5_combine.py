@@ -5,6 +5,7 @@ import warnings
 from logging import getLogger
 import pandas as pd
 import pandera as pa
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
 from wblca_benchmark_v2_data_prep.metadata.det_schema import get_project_det_schema, \
     get_energy_det_schema
@@ -117,4 +118,6 @@ def combine_det():
 
 
 if __name__ == '__main__':
-    combine_det()
+    report = RunReport.for_script(Path(__file__).parents[2], 'metadata/5_combine')
+    with report.measure('combine'):
+        combine_det()
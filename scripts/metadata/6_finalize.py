@@ -2,6 +2,7 @@
 """Finalize the combined data entry template."""
 from pathlib import Path
 from logging import getLogger
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport
 from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
 import wblca_benchmark_v2_data_prep.metadata.general as utils
 import wblca_benchmark_v2_data_prep.metadata.finalize as fi_utils
@@ -117,4 +118,6 @@ the column removal list'
 
 
 if __name__ == "__main__":
-    finalize_det()
+    report = RunReport.for_script(Path(__file__).parents[2], 'metadata/6_finalize')
+    with report.measure('finalize'):
+        finalize_det()
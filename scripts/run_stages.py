@@ -0,0 +1,184 @@
+# pylint: disable=C0103
+"""Run the metadata, lca results and data record scripts as one graph of stages.
+
+The metadata and lca results pipelines run at the same time in one process, and the data
+record scripts start as soon as both have written their inputs. Stages whose stamp in
+data/logs/stages is newer than their inputs and code are skipped. Give stage names or
+prefixes, e.g. metadata or lca_results/7_harmonize, to run only those stages and the
+stages they read from, or only those stages with --no-upstream.
+"""
+from pathlib import Path
+from logging import getLogger
+from typing import List
+from wblca_benchmark_v2_data_prep.utils.loggers import setup_logger
+from wblca_benchmark_v2_data_prep.utils.orchestrator import Stage, StageGraph, run_stages
+from wblca_benchmark_v2_data_prep.utils.parallel import workers_parser
+
+
+def script_stage(pipeline: str, script: str, inputs: List[str],
+                 outputs: List[str]) -> Stage:
+    """Declare the stage of a script, with its code as inputs.
+
+    Args:
+        pipeline (str): Directory of the script in scripts, e.g. metadata
+        script (str): Name of the script without extension
+        inputs (List[str]): Data and reference files and directories read by the script
+        outputs (List[str]): Files and directories written by the script
+
+    Returns:
+        Stage: stage running the script
+    """
+    return Stage(
+        name=f'{pipeline}/{script}',
+        module=f'scripts.{pipeline}.{script}',
+        inputs=[
+            f'scripts/{pipeline}/{script}.py',
+            f'wblca_benchmark_v2_data_prep/{pipeline}',
+            'wblca_benchmark_v2_data_prep/utils',
+            *inputs
+        ],
+        outputs=outputs
+    )
+
+
+PIPELINE_STAGES = [
+    script_stage(
+        'metadata', '1_organize',
+        ['data/metadata/raw', 'references/config_metadata.yml',
+         'references/col_name_replacements.yml'],
+        ['data/metadata/organized']
+    ),
+    script_stage(
+        'metadata', '2_test',
+        ['data/metadata/organized', 'references/config_metadata.yml',
+         'references/dropdowns.yml'],
+        []
+    ),
+    script_stage(
+        'metadata', '3_clean',
+        ['data/metadata/organized', 'references/config_metadata.yml',
+         'references/dropdown_cols.yml', 'references/dropdown_replacements.yml',
+         'references/col_dtypes.yml'],
+        ['data/metadata/cleaned']
+    ),
+    script_stage(
+        'metadata', '4_merge',
+        ['data/metadata/cleaned', 'references/config_metadata.yml'],
+        ['data/metadata/merged']
+    ),
+    script_stage(
+        'metadata', '5_combine',
+        ['data/metadata/merged', 'references/config_metadata.yml', 'references/col_dtypes.yml',
+         'references/dropdowns.yml'],
+        ['data/metadata/combined']
+    ),
+    script_stage(
+        'metadata', '6_finalize',
+        ['data/metadata/combined', 'references/config_metadata.yml',
+         'references/col_finalize.yml'],
+        ['data/metadata/finalized', 'data/data_record/raw/Project_Data_Finalized.csv']
+    ),
+    script_stage(
+        'lca_results', '1_clean',
+        ['data/lca_results/raw', 'references/config_storage.yml',
+         'references/config_harmonize.yml'],
+        ['data/lca_results/cleaned']
+    ),
+    script_stage(
+        'lca_results', '2_add_stored_carbon',
+        ['data/lca_results/cleaned/tally', 'references/stored_carbon_database.xlsx',
+         'references/config_storage.yml', 'references/config_harmonize.yml'],
+        ['data/lca_results/csc']
+    ),
+    script_stage(
+        'lca_results', '3_map_elements',
+        ['data/lca_results/csc', 'data/lca_results/cleaned/oneclick',
+         'references/config_storage.yml', 'references/config_harmonize.yml'],
+        ['data/lca_results/element_mapped']
+    ),
+    script_stage(
+        'lca_results', '4_map_materials',
+        ['data/lca_results/element_mapped', 'references/config_storage.yml',
+         'references/config_harmonize.yml'],
+        ['data/lca_results/material_mapped']
+    ),
+    script_stage(
+        'lca_results', '5_map_elements_refined',
+        ['data/lca_results/material_mapped', 'references/config_storage.yml',
+         'references/config_harmonize.yml'],
+        ['data/lca_results/ref_ele_mapped']
+    ),
+    script_stage(
+        'lca_results', '6_combine',
+        ['data/lca_results/ref_ele_mapped', 'references/config_storage.yml',
+         'references/config_harmonize.yml'],
+        ['data/lca_results/combined']
+    ),
+    script_stage(
+        'lca_results', '7_harmonize',
+        ['data/lca_results/combined', 'references/config_storage.yml',
+         'references/config_harmonize.yml'],
+        ['data/lca_results/harmonized', 'data/data_record/raw/combined_harmonized.csv']
+    ),
+    script_stage(
+        'data_record', '1_internal_data',
+        ['data/data_record/raw/Project_Data_Finalized.csv',
+         'references/config_data_record.yml'],
+        ['data/data_record/internal']
+    ),
+    script_stage(
+        'data_record', '2_buildings_metadata',
+        ['data/data_record/raw/combined_harmonized.csv',
+         'data/data_record/internal/internal_data.xlsx', 'references/config_data_record.yml'],
+        ['data/data_record/public']
+    ),
+    script_stage(
+        'data_record', '3_lca_full_results',
+        ['data/data_record/raw/combined_harmonized.csv',
+         'data/data_record/internal/internal_data.xlsx', 'references/config_data_record.yml'],
+        ['data/data_record/public']
+    ),
+]
+
+
+if __name__ == '__main__':
+    parser = workers_parser(__doc__)
+    parser.add_argument(
+        'targets',
+        nargs='*',
+        help='names or prefixes of the stages to run (default: every stage)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='run the stages even if they are up to date'
+    )
+    parser.add_argument(
+        '--no-upstream',
+        action='store_true',
+        help='run the targets only, not the stages they read from'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=4,
+        help='number of stages run at the same time (default: 4)'
+    )
+    arguments = parser.parse_args()
+
+    main_directory = Path(__file__).parents[1]
+    setup_logger(
+        log_file_path=main_directory.joinpath('data/logs/run_stages.log'),
+        level='info'
+    )
+    main_stages_logger = getLogger('run_stages_script')
+    main_stages_logger.info('Logger has been set up.')
+
+    ran_stages = run_stages(
+        StageGraph(main_directory, PIPELINE_STAGES, jobs=arguments.jobs),
+        arguments.targets or None,
+        arguments.force,
+        ['--workers', str(arguments.workers)],
+        not arguments.no_upstream
+    )
+    main_stages_logger.info('Ran %s stages: %s', len(ran_stages), ', '.join(ran_stages))
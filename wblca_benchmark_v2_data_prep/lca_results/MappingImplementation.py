@@ -4,8 +4,16 @@ from abc import abstractmethod
 from pathlib import Path
 from dataclasses import dataclass, field
 from logging import getLogger
+from time import perf_counter
+from typing import Iterable, List
+import numpy as np
 import pandas as pd
 from wblca_benchmark_v2_data_prep.lca_results.abstract_filters import AbstractFilter
+from wblca_benchmark_v2_data_prep.lca_results.enum_codes import encode_enum_columns
+from wblca_benchmark_v2_data_prep.lca_results.predicates import LazyFilterDict, PredicateStore
+from wblca_benchmark_v2_data_prep.lca_results.profiling import FilterProfile
+from wblca_benchmark_v2_data_prep.lca_results.rule_engine import RuleTable
+from wblca_benchmark_v2_data_prep.lca_results.signatures import SignatureTable
 import wblca_benchmark_v2_data_prep.lca_results.all_ele_filters as ele
 import wblca_benchmark_v2_data_prep.lca_results.all_mat_filters as mat
 import wblca_benchmark_v2_data_prep.lca_results.refined_mat_filters as ref
@@ -15,18 +23,40 @@ import wblca_benchmark_v2_data_prep.lca_results.refined_mat_filters as ref
 class Mapper():
     """Interface of mapping.
 
+    The columns written by the filter classes are held as categoricals backed by their
+    enums while mapping, see enum_codes.
+
     Attributes:
         df (pd.DataFrame): DataFrame of raw WBLCA entries
         _filter_type(AbstractFilter): Filter class
-        _all_info (dict): Dictionary of all possible filters for raw WBLCA entries
+        _all_info (dict): Dictionary of all possible filters for raw WBLCA entries, evaluated
+            when a filter class requests them
+        predicate_store (PredicateStore): Cache of filters shared by the mappers of a model
+        deduplicate (bool): Filter the distinct values of the columns the filter classes read
+            and write instead of every row, then broadcast the results back to the rows.
+            df must not be changed outside of the mapper between filterings.
+        rule_usage (List[pd.DataFrame]): Usage of the rules of each apply_filters call, see
+            RuleTable.usage, appended to when not None
+        profile (FilterProfile): Records the time and rows of every filter class, rule and
+            filter when not None, see profiling
     """
     df: pd.DataFrame = field(repr=False)
     _filter_type: AbstractFilter = None
     _all_info: dict = field(default_factory=dict, repr=False)
+    predicate_store: PredicateStore = field(default=None, repr=False)
+    deduplicate: bool = False
+    rule_usage: List[pd.DataFrame] = field(default=None, repr=False)
+    profile: FilterProfile = field(default=None, repr=False)
+    _signatures: SignatureTable = field(default=None, init=False, repr=False)
+    _stage_columns: List[str] = field(default_factory=list, init=False, repr=False)
 
     @abstractmethod
     def __post_init__(self):
         self.logger = getLogger(self.__class__.__name__)
+        encode_enum_columns(self.df)
+        if self.predicate_store is None:
+            self.predicate_store = PredicateStore(self.df)
+        self.predicate_store.bind(self.df)
 
     def change_filter_type(self, filter_type: AbstractFilter) -> None:
         """Set filter class.
@@ -37,11 +67,190 @@ class Mapper():
         self._filter_type = filter_type
 
     def do_filtering(self) -> None:
-        """Update DataFrame using filtering method in filter class"""
+        """Update DataFrame using filtering method in filter class
+
+        Filters of the updated column keep its values from before the first filter class of
+        the stage, like a new mapper would. Call end_stage before the filter classes of the
+        next stage so they see the updated values.
+        """
         self.logger.info(
             'Filtering using the following class: %s', self._filter_type.__class__.__name__
         )
-        self.df = self._filter_type.filtering(self.df, self._all_info)
+        target = self._filtering_target([self._filter_type])
+        if self.profile is None:
+            self._freeze_filters([self._filter_type])
+            target = self._filter_type.filtering(target, self._all_info)
+        else:
+            start = perf_counter()
+            self.profile.start(self.__class__.__name__, self._row_counts())
+            self._freeze_filters([self._filter_type])
+            self._filter_type.profile_rules(self.profile)
+            try:
+                target = self._filter_type.filtering(target, self._all_info)
+            finally:
+                self._filter_type.profile_rules(None)
+            self.profile.record_filter(
+                self._filter_type.__class__.__name__, perf_counter() - start
+            )
+            self._record_masks()
+        self.predicate_store.mark_changed(self._filter_type.column_name_to_change)
+        self._stage_columns.append(self._filter_type.column_name_to_change)
+        self._update_df(target, [self._filter_type])
+
+    def end_stage(self) -> None:
+        """Drop the filters of the columns do_filtering updated since the last stage.
+
+        The filter classes of the next stage then see the updated values, so the same mapper
+        can be used for consecutive stages. apply_filters ends its stage itself.
+        """
+        self._invalidate_filters(self._stage_columns)
+        self._stage_columns = []
+
+    def apply_filters(self, filters: List[AbstractFilter]) -> None:
+        """Update DataFrame using a list of filter classes compiled into one rule table.
+
+        Gives the same result as calling do_filtering for each filter class in order, then
+        end_stage. Filters of the updated columns are invalidated afterwards, so the next
+        call sees the updated values and the same mapper can be used for consecutive stages.
+
+        Args:
+            filters (List[AbstractFilter]): Filter classes in the order they are applied
+        """
+        self.end_stage()
+        target = self._filtering_target(filters)
+        if self.profile is not None:
+            self.profile.start(self.__class__.__name__, self._row_counts())
+        rule_table = RuleTable.compile(filters, target, self._all_info)
+        if self.rule_usage is not None or self.profile is not None:
+            usage = rule_table.usage(target, self._row_counts())
+            if self.rule_usage is not None:
+                self.rule_usage.append(usage)
+        start = perf_counter()
+        target = rule_table.apply(target)
+        if self.profile is not None:
+            self.profile.record_rule_table(rule_table, usage, perf_counter() - start)
+            self._record_masks()
+        self._invalidate_filters(fil.column_name_to_change for fil in filters)
+        self._update_df(target, filters)
+
+    def _filtering_target(self, filters: List[AbstractFilter]) -> pd.DataFrame:
+        """DataFrame the filter classes are applied to.
+
+        With deduplicate, the signatures of the model are built on first use, and rebuilt
+        when the filter classes write a column they do not hold. The store is bound to the
+        signatures so the filters are evaluated once per signature.
+
+        Args:
+            filters (List[AbstractFilter]): Filter classes about to update the DataFrame
+
+        Returns:
+            pd.DataFrame: signatures with deduplicate, otherwise df
+        """
+        if not self._filters_signatures():
+            return self.df
+        written = [fil.column_name_to_change for fil in filters]
+        if self._signatures is None or not self._signatures.covers(written):
+            self._signatures = SignatureTable.from_frame(self.df, self.signature_columns(filters))
+            self.logger.info(
+                'Filtering %s signatures instead of %s rows.',
+                len(self._signatures.df), len(self.df)
+            )
+            self.predicate_store.bind(self._signatures.df)
+            self._all_info = LazyFilterDict(self._all_info.predicates, self.predicate_store)
+        return self._signatures.df
+
+    def signature_columns(self, filters: List[AbstractFilter]) -> List[str]:
+        """Columns that decide the result of filter classes for a row.
+
+        Args:
+            filters (List[AbstractFilter]): Filter classes applied to the DataFrame
+
+        Returns:
+            List[str]: columns read by the filters of the mapper and written by the classes
+        """
+        columns = self._all_info.columns() if isinstance(self._all_info, LazyFilterDict) \
+            else list(self.df.columns)
+        return list(dict.fromkeys(columns + [fil.column_name_to_change for fil in filters]))
+
+    def _update_df(self, target: pd.DataFrame, filters: List[AbstractFilter]) -> None:
+        """Set df from the DataFrame the filter classes were applied to.
+
+        Args:
+            target (pd.DataFrame): DataFrame returned by the filter classes
+            filters (List[AbstractFilter]): Filter classes that updated the DataFrame
+        """
+        if not self._filters_signatures():
+            self.df = target
+            return
+        if target is not self._signatures.df:
+            self._signatures.df = target
+            self.predicate_store.bind(target)
+        for column in dict.fromkeys(fil.column_name_to_change for fil in filters):
+            self.df[column] = self._signatures.broadcast(column)
+
+    def _row_counts(self) -> np.ndarray:
+        """Number of rows of df of each row the filter classes are applied to.
+
+        Returns:
+            np.ndarray: rows of each signature with deduplicate, None if every row of df is
+                filtered
+        """
+        if not self._filters_signatures() or self._signatures is None:
+            return None
+        return np.bincount(self._signatures.codes, minlength=len(self._signatures.df))
+
+    def _record_masks(self) -> None:
+        """Add the time spent evaluating filters since the last call to the profile."""
+        keys = self._all_info.predicates if isinstance(self._all_info, LazyFilterDict) else {}
+        self.profile.record_masks(self.predicate_store.pop_timings(), keys)
+
+    def _filters_signatures(self) -> bool:
+        """Check if the filter classes are applied to the signatures instead of df.
+
+        Returns:
+            bool: True with deduplicate and a dictionary of lazy filters
+        """
+        return self.deduplicate and isinstance(self._all_info, LazyFilterDict)
+
+    def _freeze_filters(self, filters: List[AbstractFilter]) -> None:
+        """Evaluate pending filters of the columns the filter classes update.
+
+        Args:
+            filters (List[AbstractFilter]): Filter classes about to update the DataFrame
+        """
+        if isinstance(self._all_info, LazyFilterDict):
+            for column in dict.fromkeys(fil.column_name_to_change for fil in filters):
+                self._all_info.freeze(column)
+
+    def _invalidate_filters(self, columns: Iterable[str]) -> None:
+        """Drop the filters of updated columns.
+
+        Args:
+            columns (Iterable[str]): Columns updated by filter classes
+        """
+        for column in dict.fromkeys(columns):
+            if isinstance(self._all_info, LazyFilterDict):
+                self._all_info.invalidate(column)
+            else:
+                self.predicate_store.mark_changed(column)
+
+    def unused_filters(self) -> List[str]:
+        """Log and return the filters no filter class has requested.
+
+        Mappers sharing a predicate store share the requested filters, so the last mapper
+        of a model reports the filters unused by all of them.
+
+        Returns:
+            List[str]: keys of unused filters
+        """
+        if not isinstance(self._all_info, LazyFilterDict):
+            return []
+        unused = self._all_info.unused_keys()
+        self.logger.info(
+            '%s of %s filters were never requested.', len(unused), len(self._all_info)
+        )
+        self.logger.debug('Unused filters: %s', unused)
+        return unused
 
     def write_csv(self, write_csv_path: Path):
         """Write csv of DataFrame of raw WBLCA entries.
@@ -73,7 +282,7 @@ class TallyElementMapper(Mapper):
     """Tally specific element mapper loaded with tally filters"""
     def __post_init__(self):
         super().__post_init__()
-        self._all_info = ele.create_all_tally_filters(self.df)
+        self._all_info = LazyFilterDict(ele.create_all_tally_predicates(), self.predicate_store)
         self.logger.info('%s class created for mapping.', self.__class__.__name__)
 
 
@@ -81,7 +290,7 @@ class OneClickElementMapper(Mapper):
     """One Click specific element mapper loaded with one click filters"""
     def __post_init__(self):
         super().__post_init__()
-        self._all_info = ele.create_all_oneclick_filters(self.df)
+        self._all_info = LazyFilterDict(ele.create_all_oneclick_predicates(), self.predicate_store)
         self.logger.info('%s class created for mapping.', self.__class__.__name__)
 
 
@@ -89,7 +298,7 @@ class TallyMaterialQuantityMapper(Mapper):
     """Tally specific element mapper loaded with tally filters"""
     def __post_init__(self):
         super().__post_init__()
-        self._all_info = mat.create_all_tally_filters(self.df)
+        self._all_info = LazyFilterDict(mat.create_all_tally_predicates(), self.predicate_store)
         self.logger.info('%s class created for mapping.', self.__class__.__name__)
 
 
@@ -97,7 +306,7 @@ class OneClickMaterialQuantityMapper(Mapper):
     """One Click specific element mapper loaded with one click filters"""
     def __post_init__(self):
         super().__post_init__()
-        self._all_info = mat.create_all_oneclick_filters(self.df)
+        self._all_info = LazyFilterDict(mat.create_all_oneclick_predicates(), self.predicate_store)
         self.logger.info('%s class created for mapping.', self.__class__.__name__)
 
 
@@ -105,7 +314,7 @@ class TallyRefinedElementMapper(Mapper):
     """Tally specific element mapper loaded with refined element filters"""
     def __post_init__(self):
         super().__post_init__()
-        self._all_info = ref.create_all_refined_filters(self.df)
+        self._all_info = LazyFilterDict(ref.create_all_refined_predicates(), self.predicate_store)
         self.logger.info('%s class created for mapping.', self.__class__.__name__)
 
 
@@ -113,5 +322,5 @@ class OneClickRefinedElementMapper(Mapper):
     """One Click specific element mapper loaded with refined element filters"""
     def __post_init__(self):
         super().__post_init__()
-        self._all_info = ref.create_all_refined_filters(self.df)
+        self._all_info = LazyFilterDict(ref.create_all_refined_predicates(), self.predicate_store)
         self.logger.info('%s class created for mapping.', self.__class__.__name__)
@@ -1,7 +1,9 @@
+import inspect
 from abc import ABC, abstractmethod
 from typing import Dict, List
-from functools import reduce
+import numpy as np
 import pandas as pd
+from wblca_benchmark_v2_data_prep.lca_results.masks import all_of, any_of, matches
 
 
 class AbstractFilter(ABC):
@@ -9,6 +11,8 @@ class AbstractFilter(ABC):
 
     def __init__(self, column_name_to_change: str):
         self._column_name_to_change = column_name_to_change
+        self._rule_table = None
+        self._profile = None
 
     @property
     def column_name_to_change(self):
@@ -17,21 +21,53 @@ class AbstractFilter(ABC):
 
     @abstractmethod
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> None:
+                  all_filters: Dict[str, np.ndarray]) -> None:
         """abstract method to add values to CLF Omni based on provided all_filters
 
         Args:
             df (pd.DataFrame): DataFrame of One Click entries
-            all_filters (Dict[str, pd.Series]): All filters for One Click entries
+            all_filters (Dict[str, np.ndarray]): All filters for One Click entries
         """
 
-    def and_loc(self, df: pd.DataFrame, result: str, and_filters: List[pd.Series]) -> None:
+    def record_rules(self, rule_table) -> None:
+        """Record loc calls into a rule table instead of writing them to the DataFrame.
+
+        Args:
+            rule_table (RuleTable): rule table collecting the rules, None to write directly
+        """
+        self._rule_table = rule_table
+
+    def profile_rules(self, profile) -> None:
+        """Record the rows and time of each loc call written to the DataFrame.
+
+        Args:
+            profile (FilterProfile): profile of the model, None to stop recording
+        """
+        self._profile = profile
+
+    def loc(self, df: pd.DataFrame, result: str, loc_filter: np.ndarray) -> None:
+        """Wrapper for pandas loc function with a single criteria
+
+        Args:
+            df (pd.DataFrame): DataFrame of One Click entries
+            result (str): Value to be applied to CLF Omni column
+            loc_filter (np.ndarray): Filter applied for loc function
+
+        Raises:
+            KeyError: Review the loc_filter value
+        """
+        if loc_filter is None:
+            raise KeyError('The loc_filter was not entered correctly')
+
+        self._write(df, result, loc_filter, call='loc')
+
+    def and_loc(self, df: pd.DataFrame, result: str, and_filters: List[np.ndarray]) -> None:
         """Wrapper for pandas loc function to include multiple criteria combined with & operator
 
         Args:
             df (pd.DataFrame): DataFrame of One Click entries
             result (str): Value to be applied to CLF Omni column
-            and_filters (List[pd.Series]): Filters applied for loc function
+            and_filters (List[np.ndarray]): Filters applied for loc function
 
         Raises:
             ValueError: Review one of the and_filter values
@@ -40,20 +76,16 @@ class AbstractFilter(ABC):
             if fil is None:
                 raise KeyError('One of the and_filters was not entered correctly')
 
-        and_filters_reduced = reduce(
-            lambda series_one, series_two: series_one & series_two, and_filters)
         # change columns to object if the column type is float
-        if df[self.column_name_to_change].dtype == 'float64':
-            df[self.column_name_to_change] = df[self.column_name_to_change].astype(object)
-        df.loc[and_filters_reduced, self.column_name_to_change] = result
+        self._write(df, result, all_of(and_filters), cast_float_to_object=True, call='and_loc')
 
-    def or_loc(self, df: pd.DataFrame, result: str, or_filters: List[pd.Series]) -> None:
+    def or_loc(self, df: pd.DataFrame, result: str, or_filters: List[np.ndarray]) -> None:
         """Wrapper for pandas loc function to include multiple criteria combined with | operator
 
         Args:
             df (pd.DataFrame): DataFrame of One Click entries
             result (str): Value to be applied to CLF Omni column
-            or_filters (List[pd.Series]): Filters applied for loc function
+            or_filters (List[np.ndarray]): Filters applied for loc function
 
         Raises:
             KeyError: Review one of the or_filter values
@@ -62,13 +94,10 @@ class AbstractFilter(ABC):
             if fil is None:
                 raise KeyError('One of the or_filters was not entered correctly')
 
-        or_filters_reduced = reduce(
-            lambda series_one, series_two: series_one | series_two, or_filters)
+        self._write(df, result, any_of(or_filters), call='or_loc')
 
-        df.loc[or_filters_reduced, self.column_name_to_change] = result
-
-    def and_or_loc(self, df: pd.DataFrame, result: str, and_filters: List[pd.Series],
-                   or_filters: List[pd.Series]) -> None:
+    def and_or_loc(self, df: pd.DataFrame, result: str, and_filters: List[np.ndarray],
+                   or_filters: List[np.ndarray]) -> None:
         """Wrapper for pandas loc function to include multiple criteria.
 
         Takes filters combined with & operator and filters combined with | operator and
@@ -77,8 +106,8 @@ class AbstractFilter(ABC):
         Args:
             df (pd.DataFrame): DataFrame of One Click entries
             result (str): Value to be applied to CLF Omni column
-            and_filters (List[pd.Series]): Filters to be combined with & operator
-            or_filters (List[pd.Series]): Filters to be combined with | operator
+            and_filters (List[np.ndarray]): Filters to be combined with & operator
+            or_filters (List[np.ndarray]): Filters to be combined with | operator
 
         Raises:
             KeyError: Review one of the and_filter or or_filter values
@@ -91,12 +120,59 @@ class AbstractFilter(ABC):
             if fil is None:
                 raise KeyError('One of the or_filters was not entered correctly')
 
-        and_filters_reduced = reduce(
-            lambda series_one, series_two: series_one & series_two, and_filters)
+        and_or_filters = all_of(and_filters)
+        np.logical_and(and_or_filters, any_of(or_filters), out=and_or_filters)
+
+        self._write(df, result, and_or_filters, call='and_or_loc')
+
+    def _write(self, df: pd.DataFrame, result: str, loc_filter: np.ndarray,
+               cast_float_to_object: bool = False, call: str = 'loc') -> None:
+        """Write result to the column to change, or record it when a rule table is set.
+
+        Args:
+            df (pd.DataFrame): DataFrame of One Click entries
+            result (str): Value to be applied to CLF Omni column
+            loc_filter (np.ndarray): Reduced filter applied for loc function
+            cast_float_to_object (bool): Cast a float column to object before writing
+            call (str): Method of the filter class writing the result
+        """
+        if self._rule_table is not None:
+            self._rule_table.add_rule(
+                filter_name=self.__class__.__name__,
+                column=self.column_name_to_change,
+                result=result,
+                loc_filter=loc_filter,
+                cast_float_to_object=cast_float_to_object,
+                call=call,
+                source=_call_source()
+            )
+            return
+
+        if self._profile is not None:
+            self._profile.record_write(
+                filter_name=self.__class__.__name__,
+                call=call,
+                source=_call_source(),
+                column=self.column_name_to_change,
+                result=result,
+                mask=matches(loc_filter),
+                values=df[self.column_name_to_change].to_numpy(dtype=object)
+            )
+
+        if cast_float_to_object and df[self.column_name_to_change].dtype == 'float64':
+            df[self.column_name_to_change] = df[self.column_name_to_change].astype(object)
+        df.loc[matches(loc_filter), self.column_name_to_change] = result
 
-        or_filters_reduced = reduce(
-            lambda series_one, series_two: series_one | series_two, or_filters)
 
-        and_or_filters = and_filters_reduced & or_filters_reduced
+def _call_source() -> str:
+    """Module and line of the filter class code calling one of the loc methods.
 
-        df.loc[and_or_filters, self.column_name_to_change] = result
+    Returns:
+        str: module name and line number of the call, e.g. tally_mat_filters:120
+    """
+    frame = inspect.currentframe()
+    while frame is not None and frame.f_globals.get('__name__') == __name__:
+        frame = frame.f_back
+    if frame is None:
+        return None
+    return f"{frame.f_globals.get('__name__', '').rsplit('.', 1)[-1]}:{frame.f_lineno}"
@@ -1,19 +1,20 @@
 """Creates dictionaries of filters for element mapping."""
 from typing import Dict
+import numpy as np
 import pandas as pd
+from wblca_benchmark_v2_data_prep.lca_results.predicates import \
+    Predicate, PredicateFrame, PredicateStore, evaluate_predicates
 
 
-def create_all_oneclick_filters(df: pd.DataFrame) -> Dict[str, pd.Series]:
-    """Creates a dictionary of One Click filters to be implemented.
-
-    Args:
-        df (pd.DataFrame): DataFrame of One Click entries
+def create_all_oneclick_predicates() -> Dict[str, Predicate]:
+    """Creates a dictionary of One Click predicates to be implemented.
 
     Returns:
-        Dict[str, pd.Series]: dictionary of One Click filters
+        Dict[str, Predicate]: dictionary of One Click predicates
     """
+    df = PredicateFrame()
     filters = {
-        'oc_clf_omni_na': pd.isna(df['CLF Omni']),
+        'oc_clf_omni_na': df['CLF Omni'].isna(),
         'oc_omni_sub': df['Omniclass'].str.match('21-01'),
         'oc_omni_shell_super': df['Omniclass'].str.match('21-02 1'),
         'oc_omni_shell_enc': df['Omniclass'].str.match(
@@ -90,18 +91,30 @@ def create_all_oneclick_filters(df: pd.DataFrame) -> Dict[str, pd.Series]:
     return filters
 
 
-def create_all_tally_filters(df: pd.DataFrame) -> Dict[str, pd.Series]:
-    """Creates a dictionary of Tally filters to be implemented.
+def create_all_oneclick_filters(df: pd.DataFrame,
+                                store: PredicateStore = None) -> Dict[str, np.ndarray]:
+    """Creates a dictionary of One Click filters to be implemented.
 
     Args:
-        df (pd.DataFrame): DataFrame of Tally entries
+        df (pd.DataFrame): DataFrame of One Click entries
+        store (PredicateStore): store shared with other mappers, a new store if None
+
+    Returns:
+        Dict[str, np.ndarray]: dictionary of One Click filters
+    """
+    return evaluate_predicates(df, create_all_oneclick_predicates(), store)
+
+
+def create_all_tally_predicates() -> Dict[str, Predicate]:
+    """Creates a dictionary of Tally predicates to be implemented.
 
     Returns:
-        Dict[str, pd.Series]: dictionary of Tally filters
+        Dict[str, Predicate]: dictionary of Tally predicates
     """
+    df = PredicateFrame()
     filters = {
 
-        'ty_clf_omni_na': pd.isna(df['CLF Omni']),
+        'ty_clf_omni_na': df['CLF Omni'].isna(),
         'rt_c_ceilings': df['Revit category'].str.fullmatch('Ceilings'),
         'rt_c_cw_panels': df['Revit category'].str.fullmatch(
             'Curtain Panels|Curtainwall Panels'
@@ -243,3 +256,17 @@ def create_all_tally_filters(df: pd.DataFrame) -> Dict[str, pd.Series]:
         )
     }
     return filters
+
+
+def create_all_tally_filters(df: pd.DataFrame,
+                             store: PredicateStore = None) -> Dict[str, np.ndarray]:
+    """Creates a dictionary of Tally filters to be implemented.
+
+    Args:
+        df (pd.DataFrame): DataFrame of Tally entries
+        store (PredicateStore): store shared with other mappers, a new store if None
+
+    Returns:
+        Dict[str, np.ndarray]: dictionary of Tally filters
+    """
+    return evaluate_predicates(df, create_all_tally_predicates(), store)
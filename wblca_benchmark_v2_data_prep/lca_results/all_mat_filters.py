@@ -1,19 +1,20 @@
 """Creates dictionaries of filters for material quantity mapping."""
 from typing import Dict
+import numpy as np
 import pandas as pd
 from wblca_benchmark_v2_data_prep.lca_results.enums import \
     MaterialQuantityOne, MaterialQuantityTwo
+from wblca_benchmark_v2_data_prep.lca_results.predicates import \
+    Predicate, PredicateFrame, PredicateStore, evaluate_predicates
 
 
-def create_all_oneclick_filters(df: pd.DataFrame) -> Dict[str, pd.Series]:
-    """Creates a dictionary of One Click filters to be implemented.
-
-    Args:
-        df (pd.DataFrame): DataFrame of One Click entries
+def create_all_oneclick_predicates() -> Dict[str, Predicate]:
+    """Creates a dictionary of One Click predicates to be implemented.
 
     Returns:
-        Dict[str, pd.Series]: dictionary of One Click filters
+        Dict[str, Predicate]: dictionary of One Click predicates
     """
+    df = PredicateFrame()
     filters = {
         # concrete filters
         'conc_mq_one': df['MQ_1'].str.fullmatch(MaterialQuantityOne.CONCRETE.value),
@@ -577,15 +578,27 @@ def create_all_oneclick_filters(df: pd.DataFrame) -> Dict[str, pd.Series]:
     return filters
 
 
-def create_all_tally_filters(df: pd.DataFrame) -> Dict[str, pd.Series]:
-    """Creates a dictionary of Tally filters to be implemented.
+def create_all_oneclick_filters(df: pd.DataFrame,
+                                store: PredicateStore = None) -> Dict[str, np.ndarray]:
+    """Creates a dictionary of One Click filters to be implemented.
 
     Args:
-        df (pd.DataFrame): DataFrame of Tally entries
+        df (pd.DataFrame): DataFrame of One Click entries
+        store (PredicateStore): store shared with other mappers, a new store if None
+
+    Returns:
+        Dict[str, np.ndarray]: dictionary of One Click filters
+    """
+    return evaluate_predicates(df, create_all_oneclick_predicates(), store)
+
+
+def create_all_tally_predicates() -> Dict[str, Predicate]:
+    """Creates a dictionary of Tally predicates to be implemented.
 
     Returns:
-        Dict[str, pd.Series]: dictionary of Tally filters
+        Dict[str, Predicate]: dictionary of Tally predicates
     """
+    df = PredicateFrame()
     filters = {
         # concrete filters
         'conc_mq_one': df['MQ_1'].str.fullmatch(MaterialQuantityOne.CONCRETE.value),
@@ -1184,3 +1197,17 @@ def create_all_tally_filters(df: pd.DataFrame) -> Dict[str, pd.Series]:
         'other_mq_two': df['MQ_2'].str.fullmatch(MaterialQuantityTwo.OTHER.value),
     }
     return filters
+
+
+def create_all_tally_filters(df: pd.DataFrame,
+                             store: PredicateStore = None) -> Dict[str, np.ndarray]:
+    """Creates a dictionary of Tally filters to be implemented.
+
+    Args:
+        df (pd.DataFrame): DataFrame of Tally entries
+        store (PredicateStore): store shared with other mappers, a new store if None
+
+    Returns:
+        Dict[str, np.ndarray]: dictionary of Tally filters
+    """
+    return evaluate_predicates(df, create_all_tally_predicates(), store)
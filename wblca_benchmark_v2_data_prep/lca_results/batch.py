@@ -0,0 +1,197 @@
+"""Maps the models of a tool together, filtering each distinct signature once."""
+import hashlib
+import json
+from logging import getLogger
+from typing import Dict, List, Tuple, Type
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import ExtensionArray
+from wblca_benchmark_v2_data_prep.lca_results.abstract_filters import AbstractFilter
+from wblca_benchmark_v2_data_prep.lca_results.classification_cache import ClassificationCache
+from wblca_benchmark_v2_data_prep.lca_results.signatures import SignatureTable, json_value
+
+batch_logger = getLogger('lca_results.batch')
+
+
+def _signature_groups(dfs: List[pd.DataFrame],
+                      columns: List[str]) -> Dict[Tuple[Tuple[str, str], ...], List[int]]:
+    """Group the models whose signature columns have the same names and dtypes.
+
+    Filters can behave differently on a column of another dtype or on a missing column,
+    so only models of a group are concatenated.
+
+    Args:
+        dfs (List[pd.DataFrame]): DataFrames of the models
+        columns (List[str]): Columns read or written by the filter classes
+
+    Returns:
+        Dict[Tuple[Tuple[str, str], ...], List[int]]: Positions of the models by the names
+            and dtypes of their signature columns
+    """
+    groups = {}
+    for position, df in enumerate(dfs):
+        key = tuple((col, str(df[col].dtype)) for col in columns if col in df.columns)
+        groups.setdefault(key, []).append(position)
+    return groups
+
+
+def _cache_stage(stage: str, group: Tuple[Tuple[str, str], ...]) -> str:
+    """Name of a mapping stage in the cache for the models of a signature group.
+
+    Signatures only give the values of the columns, so the names and dtypes of the columns
+    are part of the name. Results of models missing other columns or holding them as other
+    dtypes are then never mixed up.
+
+    Args:
+        stage (str): Name of the mapping stage
+        group (Tuple[Tuple[str, str], ...]): Names and dtypes of the signature columns, see
+            _signature_groups
+
+    Returns:
+        str: stage followed by a hash of the signature columns
+    """
+    group_hash = hashlib.sha256(json.dumps(group).encode()).hexdigest()[:16]
+    return f'{stage}:{group_hash}'
+
+
+def _map_signatures(signatures_df: pd.DataFrame, mapper_class: Type,
+                    filter_stages: List[List[AbstractFilter]],
+                    written: List[str]) -> Dict[str, ExtensionArray]:
+    """Apply each list of filter classes in order to signatures.
+
+    Args:
+        signatures_df (pd.DataFrame): Signatures to map
+        mapper_class (Type): Mapper class of the stage
+        filter_stages (List[List[AbstractFilter]]): Filter classes of each step of the stage
+        written (List[str]): Columns written by the filter classes
+
+    Returns:
+        Dict[str, ExtensionArray]: Values of each written column by signature
+    """
+    mapper = mapper_class(signatures_df)
+    for filter_stage in filter_stages:
+        mapper.apply_filters(filter_stage)
+    mapper.unused_filters()
+    return {column: mapper.df[column].array for column in written}
+
+
+def _cached_signatures(signatures: SignatureTable, mapper_class: Type,
+                       filter_stages: List[List[AbstractFilter]], written: List[str],
+                       stage: str, cache: ClassificationCache) -> Dict[str, np.ndarray]:
+    """Look up signatures in the cache, mapping and storing the missing ones.
+
+    Args:
+        signatures (SignatureTable): Signatures to map
+        mapper_class (Type): Mapper class of the stage
+        filter_stages (List[List[AbstractFilter]]): Filter classes of each step of the stage
+        written (List[str]): Columns written by the filter classes
+        stage (str): Name of the mapping stage in the cache
+        cache (ClassificationCache): Cache of the results
+
+    Returns:
+        Dict[str, np.ndarray]: Values of each written column by signature
+    """
+    keys = signatures.keys()
+    results = cache.lookup(stage, keys)
+    missing = [i for i, key in enumerate(keys) if key not in results]
+    batch_logger.info(
+        '%s: %s of %s signatures found in the cache.',
+        stage, len(keys) - len(missing), len(keys)
+    )
+
+    if missing:
+        mapped_columns = _map_signatures(
+            signatures.df.iloc[missing].reset_index(drop=True), mapper_class, filter_stages,
+            written
+        )
+        mapped = {
+            keys[i]: [json_value(mapped_columns[column][row]) for column in written]
+            for row, i in enumerate(missing)
+        }
+        cache.store(stage, mapped)
+        results.update(mapped)
+
+    signature_values = {}
+    for position, column in enumerate(written):
+        values = np.empty(len(keys), dtype=object)
+        values[:] = [results[key][position] for key in keys]
+        values = np.where(pd.isna(values), np.nan, values)
+        if signatures.df[column].dtype == 'float64' and pd.isna(values).all():
+            values = values.astype('float64')
+        signature_values[column] = values
+    return signature_values
+
+
+def map_models(dfs: List[pd.DataFrame], mapper_class: Type,
+               filter_stages: List[List[AbstractFilter]], stage: str,
+               cache: ClassificationCache = None) -> List[pd.DataFrame]:
+    """Map several models with one pass of the filter classes.
+
+    The signatures of the models are concatenated and deduplicated, so a signature shared
+    by several models is filtered once, then the written columns are broadcast back to the
+    rows of each model. Filters are row local, so every model is mapped as if alone.
+
+    Args:
+        dfs (List[pd.DataFrame]): DataFrames of the models, updated in place
+        mapper_class (Type): Mapper class of the stage
+        filter_stages (List[List[AbstractFilter]]): Filter classes of each step of the stage
+        stage (str): Name of the mapping stage in the cache
+        cache (ClassificationCache): Results of known signatures, None to map every signature
+
+    Returns:
+        List[pd.DataFrame]: Mapped DataFrames in the order of dfs
+    """
+    if not dfs:
+        return dfs
+    filters = [fil for filter_stage in filter_stages for fil in filter_stage]
+    written = list(dict.fromkeys(fil.column_name_to_change for fil in filters))
+    columns = mapper_class(dfs[0].iloc[:0].copy()).signature_columns(filters)
+
+    for group, positions in _signature_groups(dfs, columns).items():
+        tables = [SignatureTable.from_frame(dfs[position], columns) for position in positions]
+        signatures = SignatureTable.from_frame(
+            pd.concat([table.df for table in tables], ignore_index=True), columns
+        )
+        batch_logger.info(
+            '%s: filtering %s signatures of %s models with %s rows.',
+            stage, len(signatures.df), len(positions),
+            sum(len(dfs[position]) for position in positions)
+        )
+        if cache is None:
+            signature_values = _map_signatures(
+                signatures.df, mapper_class, filter_stages, written
+            )
+        else:
+            signature_values = _cached_signatures(
+                signatures, mapper_class, filter_stages, written, _cache_stage(stage, group),
+                cache
+            )
+
+        offset = 0
+        for position, table in zip(positions, tables):
+            codes = signatures.codes[offset + table.codes]
+            offset += len(table.df)
+            for column in written:
+                dfs[position][column] = signature_values[column].take(codes)
+    return dfs
+
+
+def map_with_cache(df: pd.DataFrame, mapper_class: Type,
+                   filter_stages: List[List[AbstractFilter]], stage: str,
+                   cache: ClassificationCache) -> pd.DataFrame:
+    """Map a model, looking up the results of known signatures in the cache.
+
+    Only the signatures missing from the cache are mapped, by a mapper of the given class
+    applying each list of filter classes in order. Their results are added to the cache.
+
+    Args:
+        df (pd.DataFrame): DataFrame of a model
+        mapper_class (Type): Mapper class of the stage
+        filter_stages (List[List[AbstractFilter]]): Filter classes of each step of the stage
+        stage (str): Name of the mapping stage in the cache
+        cache (ClassificationCache): Cache of the results
+
+    Returns:
+        pd.DataFrame: Mapped DataFrame
+    """
+    return map_models([df], mapper_class, filter_stages, stage, cache)[0]
@@ -0,0 +1,102 @@
+"""Keeps the results of mapping stages per signature across runs in a sqlite file."""
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+# sqlite limits the number of variables of a statement
+_BATCH_SIZE = 500
+
+
+@dataclass
+class ClassificationCache():
+    """Results of mapping stages by signature, stored in a sqlite file.
+
+    Entries are keyed by the stage, the rules hash and the signature of a row, so changing
+    the filters, predicates or enums gives a new rules hash and the old entries are no
+    longer found. Entries of other rules hashes are deleted when the cache is created. A
+    connection is opened per call, so the cache can be sent to worker processes and shared
+    by them.
+
+    Attributes:
+        cache_path (Path): File path of the sqlite file
+        rules (str): Hash of the code of the workflow
+    """
+    cache_path: Path
+    rules: str
+
+    def __post_init__(self):
+        if self.cache_path.exists():
+            self.prune()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.cache_path, timeout=60)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS classifications ('
+            'stage TEXT, rules TEXT, signature TEXT, results TEXT, '
+            'PRIMARY KEY (stage, rules, signature))'
+        )
+        return connection
+
+    def prune(self) -> int:
+        """Delete the entries of other rules hashes, which are never found again.
+
+        Returns:
+            int: Number of entries deleted
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                deleted = connection.execute(
+                    'DELETE FROM classifications WHERE rules != ?', [self.rules]
+                ).rowcount
+        finally:
+            connection.close()
+        return deleted
+
+    def lookup(self, stage: str, keys: List[str]) -> Dict[str, list]:
+        """Find the cached results of signatures.
+
+        Args:
+            stage (str): Name of the mapping stage
+            keys (List[str]): Keys of the signatures
+
+        Returns:
+            Dict[str, list]: Results of the written columns by key, for cached keys only
+        """
+        found = {}
+        connection = self._connect()
+        try:
+            for start in range(0, len(keys), _BATCH_SIZE):
+                batch = keys[start:start + _BATCH_SIZE]
+                rows = connection.execute(
+                    'SELECT signature, results FROM classifications '
+                    'WHERE stage = ? AND rules = ? AND signature IN '
+                    f'({",".join("?" * len(batch))})',
+                    [stage, self.rules, *batch]
+                )
+                found.update((key, json.loads(results)) for key, results in rows)
+        finally:
+            connection.close()
+        return found
+
+    def store(self, stage: str, results: Dict[str, list]) -> None:
+        """Add the results of signatures to the cache.
+
+        Args:
+            stage (str): Name of the mapping stage
+            results (Dict[str, list]): Results of the written columns by key
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO classifications VALUES (?, ?, ?, ?)',
+                    [
+                        (stage, self.rules, key, json.dumps(values, ensure_ascii=False))
+                        for key, values in results.items()
+                    ]
+                )
+        finally:
+            connection.close()
@@ -2,7 +2,11 @@
 from pathlib import Path
 from logging import getLogger
 import pandas as pd
+from wblca_benchmark_v2_data_prep.lca_results.column_types import ONECLICK_IMPACTS
 from wblca_benchmark_v2_data_prep.lca_results.enums import RevitBuildingCategory
+from wblca_benchmark_v2_data_prep.lca_results.masks import all_of
+from wblca_benchmark_v2_data_prep.lca_results.predicates import PredicateFrame, PredicateStore
+from wblca_benchmark_v2_data_prep.utils.excel_cache import read_excel_sheet
 # pylint: disable=E1130, W0718, C0103, W0719
 
 clean_logger = getLogger('lca_results.clean')
@@ -61,23 +65,12 @@ def clean_oneclick_df(oneclick_df: pd.DataFrame, oneclick_file: Path) -> pd.Data
         pd.DataFrame: Cleaned One Click LCA dataframes
     """
     clean_logger.info('Begin cleaning oneclick dataframe.')
-    mass_and_env_impacts = [
-        "Acidification kg SO₂e",
-        "Eutrophication kg Ne",
-        "Ozone Depletion kg CFC11e",
-        "Formation of tropospheric ozone kg O3e",
-        "Depletion of nonrenewable energy MJ",
-        "Global warming kg CO₂e",
-        "Biogenic carbon storage kg CO₂e bio",
-        "Mass of raw materials kg"
-    ]
-
     oneclick_df['CLF Model ID'] = oneclick_file.stem
     oneclick_df['Tool'] = 'One Click LCA'
     oneclick_df = oneclick_df.set_index('CLF Model ID')
     clean_logger.info('Clean rows that are not itemized material impacts.')
     oneclick_df = oneclick_df[~pd.isna(oneclick_df['Section'])]
-    oneclick_df[mass_and_env_impacts] = oneclick_df[mass_and_env_impacts].replace("-", 0)
+    oneclick_df[ONECLICK_IMPACTS] = oneclick_df[ONECLICK_IMPACTS].replace("-", 0)
 
     clean_logger.info('Create CLF Omni column')
     if 'CLF Omni' in oneclick_df.columns:
@@ -131,32 +124,36 @@ def adjust_tally_walls(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame with updated revit building element values
     """
     clean_logger.info('Begin adjusting tally wall revit building element values.')
-    rt_c_wall = df['Revit category'].str.fullmatch('Walls')
-
-    rt_fn_int = df['Revit family name'].str.contains('int|Int|INT|interior|Interior|INTERIOR')
-    rt_fn_ext = df['Revit family name'].str.contains('ext|Ext|EXT|exterior|Exterior|EXTERIOR')
-    rt_fn_rainscreen = df['Revit family name'].str.contains('rainscreen|Rainscreen|RAINSCREEN')
-    rt_fn_parapet = df['Revit family name'].str.contains('parapet|Parapet|PARAPET')
-    rt_fn_soffit = df['Revit family name'].str.contains('soffit|Soffit|SOFFIT')
-    rt_fn_partition = df['Revit family name'].str.contains('partition|Partition|PARTITION')
-    rt_fn_enc = df['Revit family name'].str.contains(
+    # text filters are evaluated once per unique value of a column
+    text_df = PredicateFrame(PredicateStore(df))
+    rt_c_wall = text_df['Revit category'].str.fullmatch('Walls')
+
+    rt_fn_int = text_df['Revit family name'].str.contains('int|Int|INT|interior|Interior|INTERIOR')
+    rt_fn_ext = text_df['Revit family name'].str.contains('ext|Ext|EXT|exterior|Exterior|EXTERIOR')
+    rt_fn_rainscreen = text_df['Revit family name'].str.contains(
+        'rainscreen|Rainscreen|RAINSCREEN'
+    )
+    rt_fn_parapet = text_df['Revit family name'].str.contains('parapet|Parapet|PARAPET')
+    rt_fn_soffit = text_df['Revit family name'].str.contains('soffit|Soffit|SOFFIT')
+    rt_fn_partition = text_df['Revit family name'].str.contains('partition|Partition|PARTITION')
+    rt_fn_enc = text_df['Revit family name'].str.contains(
         'enc|Enc|ENC|enclosure|Enclosure|ENCLOSURE'
     )
 
     try:
-        df.loc[(rt_c_wall) & (rt_fn_ext), 'Revit building element'] = \
+        df.loc[all_of([rt_c_wall, rt_fn_ext]), 'Revit building element'] = \
             RevitBuildingCategory.ENCLOSURE.value
-        df.loc[(rt_c_wall) & (rt_fn_rainscreen), 'Revit building element'] = \
+        df.loc[all_of([rt_c_wall, rt_fn_rainscreen]), 'Revit building element'] = \
             RevitBuildingCategory.ENCLOSURE.value
-        df.loc[(rt_c_wall) & (rt_fn_parapet), 'Revit building element'] = \
+        df.loc[all_of([rt_c_wall, rt_fn_parapet]), 'Revit building element'] = \
             RevitBuildingCategory.ENCLOSURE.value
-        df.loc[(rt_c_wall) & (rt_fn_soffit), 'Revit building element'] = \
+        df.loc[all_of([rt_c_wall, rt_fn_soffit]), 'Revit building element'] = \
             RevitBuildingCategory.ENCLOSURE.value
-        df.loc[(rt_c_wall) & (rt_fn_enc), 'Revit building element'] = \
+        df.loc[all_of([rt_c_wall, rt_fn_enc]), 'Revit building element'] = \
             RevitBuildingCategory.ENCLOSURE.value
-        df.loc[(rt_c_wall) & (rt_fn_int), 'Revit building element'] = \
+        df.loc[all_of([rt_c_wall, rt_fn_int]), 'Revit building element'] = \
             RevitBuildingCategory.INTERIORS.value
-        df.loc[(rt_c_wall) & (rt_fn_partition), 'Revit building element'] = \
+        df.loc[all_of([rt_c_wall, rt_fn_partition]), 'Revit building element'] = \
             RevitBuildingCategory.INTERIORS.value
     except KeyError as key:
         clean_logger.exception('In the process of adjusting wall objects, a key error occured')
@@ -187,32 +184,35 @@ def adjust_oneclick_csi_division(df: pd.DataFrame) -> pd.DataFrame:
     oc_csi_ten = df['csiMasterformat'] == 10
     oc_csi_thirty_one = df['csiMasterformat'] == 31
 
-    nat_stone_cat_mat_two = df['Resource type'].str.contains(
+    # text filters are evaluated once per unique value of a column
+    text_df = PredicateFrame(PredicateStore(df))
+
+    nat_stone_cat_mat_two = text_df['Resource type'].str.contains(
         'natural stone|Natural stone|Natural Stone'
     )
-    bcr_cat_mat_three = df['Name'].str.contains('BCR')
-    door_cat_mat_three = df['Name'].str.contains('door|Door|DOOR')
-    lock_cat_mat_three = df['Name'].str.contains('lock|Lock|LOCK')
-    sanitary_cat_mat_three = df['Name'].str.contains('sanitary|Sanitary|SANITARY')
-    window_frame_cat_mat_three = df['Name'].str.contains(
+    bcr_cat_mat_three = text_df['Name'].str.contains('BCR')
+    door_cat_mat_three = text_df['Name'].str.contains('door|Door|DOOR')
+    lock_cat_mat_three = text_df['Name'].str.contains('lock|Lock|LOCK')
+    sanitary_cat_mat_three = text_df['Name'].str.contains('sanitary|Sanitary|SANITARY')
+    window_frame_cat_mat_three = text_df['Name'].str.contains(
         'window frame|Window frame|Window Frame'
     )
-    aggregate_cat_mat_three = df['Name'].str.contains('aggregate|Aggregate|AGGREGATE')
-    sand_cat_mat_three = df['Name'].str.contains('sand|Sand|SAND')
-    tel_dock_lev_cat_mat_three = df['Name'].str.contains(
+    aggregate_cat_mat_three = text_df['Name'].str.contains('aggregate|Aggregate|AGGREGATE')
+    sand_cat_mat_three = text_df['Name'].str.contains('sand|Sand|SAND')
+    tel_dock_lev_cat_mat_three = text_df['Name'].str.contains(
         'telescopic dock leveler|Telescopic dock leveler|Telescopic Dock Leveler'
     )
 
     try:
-        df.loc[(oc_csi_thirty_one) & (nat_stone_cat_mat_two), 'csiMasterformat'] = 4
-        df.loc[(oc_csi_ten) & (bcr_cat_mat_three), 'csiMasterformat'] = 3
-        df.loc[(oc_csi_ten) & (door_cat_mat_three), 'csiMasterformat'] = 8
-        df.loc[(oc_csi_ten) & (lock_cat_mat_three), 'csiMasterformat'] = 8
-        df.loc[(oc_csi_ten) & (sanitary_cat_mat_three), 'csiMasterformat'] = 22
-        df.loc[(oc_csi_ten) & (window_frame_cat_mat_three), 'csiMasterformat'] = 8
-        df.loc[(oc_csi_thirty_one) & (aggregate_cat_mat_three), 'csiMasterformat'] = 3
-        df.loc[(oc_csi_thirty_one) & (sand_cat_mat_three), 'csiMasterformat'] = 3
-        df.loc[(oc_csi_eight) & (tel_dock_lev_cat_mat_three), 'csiMasterformat'] = 12
+        df.loc[all_of([oc_csi_thirty_one, nat_stone_cat_mat_two]), 'csiMasterformat'] = 4
+        df.loc[all_of([oc_csi_ten, bcr_cat_mat_three]), 'csiMasterformat'] = 3
+        df.loc[all_of([oc_csi_ten, door_cat_mat_three]), 'csiMasterformat'] = 8
+        df.loc[all_of([oc_csi_ten, lock_cat_mat_three]), 'csiMasterformat'] = 8
+        df.loc[all_of([oc_csi_ten, sanitary_cat_mat_three]), 'csiMasterformat'] = 22
+        df.loc[all_of([oc_csi_ten, window_frame_cat_mat_three]), 'csiMasterformat'] = 8
+        df.loc[all_of([oc_csi_thirty_one, aggregate_cat_mat_three]), 'csiMasterformat'] = 3
+        df.loc[all_of([oc_csi_thirty_one, sand_cat_mat_three]), 'csiMasterformat'] = 3
+        df.loc[all_of([oc_csi_eight, tel_dock_lev_cat_mat_three]), 'csiMasterformat'] = 12
 
     except KeyError as key:
         clean_logger.exception('In the process of adjusting csi division, a key error occured')
@@ -225,11 +225,12 @@ def adjust_oneclick_csi_division(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def read_excel(file_path: Path) -> pd.DataFrame:
-    """Read csv files for general use.
+def read_excel(file_path: Path, engine: str = None) -> pd.DataFrame:
+    """Read the first sheet of an excel file, from the excel cache if it did not change.
 
     Args:
-        file_path (Path): file path of csv to read
+        file_path (Path): file path of excel file to read
+        engine (str): engine parsing the file if it is not cached, see excel_cache
 
     Raises:
         PermissionError: Raised if function does not have permission to access file
@@ -237,13 +238,11 @@ def read_excel(file_path: Path) -> pd.DataFrame:
         Exception: General exception just in case
 
     Returns:
-        pd.DataFrame: DataFrame of read csv file
+        pd.DataFrame: DataFrame of read excel file
     """
     try:
         clean_logger.info('Reading %s', file_path.stem)
-        df = pd.read_excel(
-            file_path,
-        )
+        df = read_excel_sheet(file_path, engine=engine)
     except PermissionError as pe:
         clean_logger.exception('Permission Error probably caused by having file open')
         raise PermissionError('Try closing out the file you are trying to read') from pe
@@ -0,0 +1,49 @@
+"""Types of the known columns of the lca results, so csv files are read without guessing them."""
+from typing import Dict
+
+# impacts and mass of One Click models, "-" is replaced by 0 when they are cleaned
+ONECLICK_IMPACTS = [
+    "Acidification kg SO₂e",
+    "Eutrophication kg Ne",
+    "Ozone Depletion kg CFC11e",
+    "Formation of tropospheric ozone kg O3e",
+    "Depletion of nonrenewable energy MJ",
+    "Global warming kg CO₂e",
+    "Biogenic carbon storage kg CO₂e bio",
+    "Mass of raw materials kg"
+]
+
+
+def column_dtypes(harmonize_config: dict) -> Dict[str, str]:
+    """Dtypes of the impact and descriptor columns, by their raw and harmonized names.
+
+    Impacts are the One Click impacts and the Tally columns renamed to the same harmonized
+    names; they are floats. Other renamed columns are descriptors and are read as strings,
+    except those whose values are replaced by numbers, e.g. csiMasterformat and Service
+    Life, which keep the types of the file for the replacements to match.
+
+    Args:
+        harmonize_config (dict): config_harmonize.yml
+
+    Returns:
+        Dict[str, str]: float64 or str by column name
+    """
+    renames = {
+        **harmonize_config.get('column_rename_tally'),
+        **harmonize_config.get('column_rename_oneclick')
+    }
+    impacts = {renames.get(impact, impact) for impact in ONECLICK_IMPACTS}
+    numeric_replacements = {
+        column
+        for replacements in ('column_value_replace_tally', 'column_value_replace_oneclick')
+        for column, values in harmonize_config.get(replacements).items()
+        if not all(isinstance(value, str) for value in values)
+    }
+
+    dtypes = {impact: 'float64' for impact in ONECLICK_IMPACTS}
+    for raw_name, name in renames.items():
+        if name in impacts:
+            dtypes[raw_name] = dtypes[name] = 'float64'
+        elif not {raw_name, name} & numeric_replacements:
+            dtypes[raw_name] = dtypes[name] = 'str'
+    return dtypes
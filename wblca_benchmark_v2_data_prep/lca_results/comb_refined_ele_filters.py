@@ -1,6 +1,7 @@
 # pylint: disable=C0103, W0718
 """Defines One Click and Tally Filter classes to update values in CLF Omni Column"""
 from typing import Dict
+import numpy as np
 import pandas as pd
 from wblca_benchmark_v2_data_prep.lca_results.abstract_filters \
     import AbstractFilter
@@ -10,31 +11,37 @@ from wblca_benchmark_v2_data_prep.lca_results.enums import OmniClassLevelOne
 class RefinedElementFilter(AbstractFilter):
     """Methods to update CLF Omni column for refined element mapping."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('acous_ceilings_mq_one'),
-            self.column_name_to_change
-        ] = OmniClassLevelOne.INTERIOR_FINISHES.value
-        df.loc[
-            all_filters.get('vapor_barrier_mq_one'),
-            self.column_name_to_change
-        ] = OmniClassLevelOne.ENCLOSURE.value
-        df.loc[
-            all_filters.get('cladding_mq_one'),
-            self.column_name_to_change
-        ] = OmniClassLevelOne.ENCLOSURE.value
-        df.loc[
-            all_filters.get('floor_tile_mq_one'),
-            self.column_name_to_change
-        ] = OmniClassLevelOne.INTERIOR_FINISHES.value
-        df.loc[
-            all_filters.get('raised_access_mq_two'),
-            self.column_name_to_change
-        ] = OmniClassLevelOne.INTERIOR_CONSTRUCTION.value
-        df.loc[
-            all_filters.get('insulation_mq_one'),
-            self.column_name_to_change
-        ] = OmniClassLevelOne.ENCLOSURE.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=OmniClassLevelOne.INTERIOR_FINISHES.value,
+            loc_filter=all_filters.get('acous_ceilings_mq_one')
+        )
+        self.loc(
+            df=df,
+            result=OmniClassLevelOne.ENCLOSURE.value,
+            loc_filter=all_filters.get('vapor_barrier_mq_one')
+        )
+        self.loc(
+            df=df,
+            result=OmniClassLevelOne.ENCLOSURE.value,
+            loc_filter=all_filters.get('cladding_mq_one')
+        )
+        self.loc(
+            df=df,
+            result=OmniClassLevelOne.INTERIOR_FINISHES.value,
+            loc_filter=all_filters.get('floor_tile_mq_one')
+        )
+        self.loc(
+            df=df,
+            result=OmniClassLevelOne.INTERIOR_CONSTRUCTION.value,
+            loc_filter=all_filters.get('raised_access_mq_two')
+        )
+        self.loc(
+            df=df,
+            result=OmniClassLevelOne.ENCLOSURE.value,
+            loc_filter=all_filters.get('insulation_mq_one')
+        )
         self.or_loc(
             df=df,
             result=OmniClassLevelOne.SUPERSTRUCTURE.value,
@@ -55,10 +62,11 @@ class RefinedElementFilter(AbstractFilter):
                 all_filters.get('heavy_timber_mq_two'),
             ]
         )
-        df.loc[
-            all_filters.get('ready_mix_lw_mq_two'),
-            self.column_name_to_change
-        ] = OmniClassLevelOne.SUPERSTRUCTURE.value
+        self.loc(
+            df=df,
+            result=OmniClassLevelOne.SUPERSTRUCTURE.value,
+            loc_filter=all_filters.get('ready_mix_lw_mq_two')
+        )
         self.and_or_loc(
             df=df,
             result=OmniClassLevelOne.SUPERSTRUCTURE.value,
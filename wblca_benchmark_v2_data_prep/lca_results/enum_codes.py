@@ -0,0 +1,66 @@
+"""Holds the columns written by the mappers as categoricals backed by their enums."""
+from enum import Enum
+from typing import Dict, List, Type
+import pandas as pd
+from wblca_benchmark_v2_data_prep.lca_results.enums import OmniClassLevelOne, \
+    MaterialQuantityOne, MaterialQuantityTwo
+
+# columns written by the mapping stages and the enums of their values
+ENUM_COLUMNS: Dict[str, Type[Enum]] = {
+    'CLF Omni': OmniClassLevelOne,
+    'MQ_1': MaterialQuantityOne,
+    'MQ_2': MaterialQuantityTwo,
+}
+
+
+def enum_categories(enum: Type[Enum], series: pd.Series) -> List:
+    """Categories of an enum column.
+
+    Args:
+        enum (Type[Enum]): Enum of the values written to the column
+        series (pd.Series): Column of a model
+
+    Returns:
+        List: values of the enum, then the other values of the column in order of first
+            appearance, so the codes of the enum values are the same for every model
+    """
+    categories = [member.value for member in enum]
+    values = series.dropna()
+    others = pd.unique(values[~values.isin(categories)])
+    return categories + list(others)
+
+
+def encode_enum_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the enum columns of a model to categoricals in place.
+
+    Filters then compare the codes of the rows, string predicates are evaluated on the
+    categories only, and writing a result stores a code instead of a string per row.
+    Writing the model to a csv gives the same file.
+
+    Args:
+        df (pd.DataFrame): DataFrame of a model
+
+    Returns:
+        pd.DataFrame: the same DataFrame with categorical enum columns
+    """
+    for column, enum in ENUM_COLUMNS.items():
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = pd.Categorical(
+                df[column], categories=enum_categories(enum, df[column])
+            )
+    return df
+
+
+def decode_enum_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert categorical enum columns back to the object columns of their labels in place.
+
+    Args:
+        df (pd.DataFrame): DataFrame of a model
+
+    Returns:
+        pd.DataFrame: the same DataFrame with object enum columns
+    """
+    for column in ENUM_COLUMNS:
+        if column in df.columns and isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(object)
+    return df
@@ -0,0 +1,89 @@
+"""Matches many literal patterns against the values of a column in a single scan."""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+
+# alternative made of plain characters and escaped punctuation only
+_LITERAL_ALTERNATIVE = re.compile(r'(?:[^.^$*+?{}\[\]()|\\\x00]|\\[^A-Za-z0-9\x00])+')
+# separator of the values in the scanned text, never part of a literal
+_SEPARATOR = '\x00'
+
+
+def literal_alternatives(pattern: str) -> Tuple[str, ...]:
+    """Split a regex made of alternated literals, such as 'deck|Deck|DECK', into its literals.
+
+    Args:
+        pattern (str): regex pattern
+
+    Returns:
+        Tuple[str, ...]: literals of the pattern, None if the pattern is not only literals
+    """
+    alternatives = pattern.split('|')
+    if not all(_LITERAL_ALTERNATIVE.fullmatch(alt) for alt in alternatives):
+        return None
+    return tuple(re.sub(r'\\(.)', r'\1', alt) for alt in alternatives)
+
+
+@dataclass
+class LiteralScanner():
+    """Multi-pattern matcher for literal contains, match and fullmatch patterns.
+
+    All literals are combined into one regex that finds the longest literal starting at each
+    position of the values joined together. Every shorter literal found at the same position
+    is a prefix of the longest one, so one scan gives every literal hit of every value.
+
+    Attributes:
+        patterns (Sequence[Tuple[str, Tuple[str, ...]]]): operation and literals per pattern
+    """
+    patterns: Sequence[Tuple[str, Tuple[str, ...]]]
+    _regex: re.Pattern = field(init=False, repr=False)
+    _owners: Dict[str, List[Tuple[int, str, int]]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        literals = sorted(
+            {literal for _, alternatives in self.patterns for literal in alternatives},
+            key=len, reverse=True
+        )
+        # alternation takes the first literal that matches, so longer literals go first
+        self._regex = re.compile(
+            '(?=(' + '|'.join(re.escape(literal) for literal in literals) + '))'
+        )
+        self._owners = {
+            longest: [
+                (i, operation, len(literal))
+                for i, (operation, alternatives) in enumerate(self.patterns)
+                for literal in alternatives if longest.startswith(literal)
+            ]
+            for longest in literals
+        }
+
+    def scan(self, values: np.ndarray) -> np.ndarray:
+        """Find the patterns matching each value.
+
+        Args:
+            values (np.ndarray): string values, such as the unique values of a column
+
+        Returns:
+            np.ndarray: boolean array of values by patterns, None if a value contains the
+                separator of the scanned text
+        """
+        hits = np.zeros((len(values), len(self.patterns)), dtype=bool)
+        if not len(values):
+            return hits
+        text = _SEPARATOR.join(values)
+        if text.count(_SEPARATOR) != len(values) - 1:
+            return None
+        lengths = np.fromiter(map(len, values), dtype=np.intp, count=len(values))
+        starts = np.concatenate([[0], np.cumsum(lengths + 1)[:-1]])
+        ends = starts + lengths
+        for found in self._regex.finditer(text):
+            position = found.start()
+            value = np.searchsorted(starts, position, side='right') - 1
+            for pattern, operation, length in self._owners[found.group(1)]:
+                if operation == 'contains':
+                    hits[value, pattern] = True
+                elif position == starts[value]:
+                    if operation == 'match' or position + length == ends[value]:
+                        hits[value, pattern] = True
+        return hits
@@ -0,0 +1,100 @@
+"""Filters of the mapping stages as numpy boolean arrays, combined in place."""
+from typing import List, Union
+import numpy as np
+import pandas as pd
+
+# np.ma.MaskedArray is a subclass of np.ndarray
+MaskLike = Union[np.ndarray, pd.Series]
+
+
+def to_mask(values: MaskLike) -> np.ndarray:
+    """Convert the result of a predicate to a filter.
+
+    String predicates give missing values for missing rows unless na is set. Those rows
+    do not match, but combining filters with | treats them differently than a False, so
+    they are kept as the masked rows of a masked array.
+
+    Args:
+        values (MaskLike): Result of a predicate, one value per row
+
+    Returns:
+        np.ndarray: Boolean array, or masked array if some values are missing. Missing
+            values are False in the data of the masked array.
+    """
+    if isinstance(values, np.ma.MaskedArray):
+        return values
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    values = np.asarray(values)
+    if values.dtype == bool:
+        return values
+    missing = pd.isna(values)
+    matched = np.where(missing, False, values).astype(bool)
+    if missing.any():
+        return np.ma.MaskedArray(matched, mask=missing)
+    return matched
+
+
+def matches(mask: MaskLike) -> np.ndarray:
+    """Rows matched by a filter.
+
+    Args:
+        mask (MaskLike): Filter
+
+    Returns:
+        np.ndarray: Boolean array where missing values do not match
+    """
+    return np.ma.getdata(to_mask(mask))
+
+
+def all_of(masks: List[MaskLike]) -> np.ndarray:
+    """Combine filters with &, like reducing pd.Series filters with the & operator.
+
+    Args:
+        masks (List[MaskLike]): Filters of the same rows
+
+    Returns:
+        np.ndarray: Boolean array of the rows matched by every filter
+    """
+    combined = matches(masks[0]).copy()
+    for mask in masks[1:]:
+        np.logical_and(combined, matches(mask), out=combined)
+    return combined
+
+
+def any_of(masks: List[MaskLike]) -> np.ndarray:
+    """Combine filters with |, like reducing pd.Series filters with the | operator.
+
+    pandas gives False for a row missing from the left operand of |, whatever the right
+    operand is, and the result of the first | has no missing values. Rows missing from the
+    first filter therefore only match through the third filter onwards.
+
+    Args:
+        masks (List[MaskLike]): Filters of the same rows
+
+    Returns:
+        np.ndarray: Boolean array of the rows matched by any filter
+    """
+    first = to_mask(masks[0])
+    combined = np.ma.getdata(first).copy()
+    if len(masks) > 1:
+        np.logical_or(combined, matches(masks[1]), out=combined)
+        combined[np.ma.getmaskarray(first)] = False
+    for mask in masks[2:]:
+        np.logical_or(combined, matches(mask), out=combined)
+    return combined
+
+
+def differs(values: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Rows whose values differ, missing values being equal to each other.
+
+    Args:
+        values (np.ndarray): Values of some rows
+        others (np.ndarray): Values of the same rows, or a single value
+
+    Returns:
+        np.ndarray: Boolean array of the rows whose values differ
+    """
+    missing = pd.isna(values)
+    other_missing = pd.isna(others)
+    return np.where(missing | other_missing, missing != other_missing, values != others)
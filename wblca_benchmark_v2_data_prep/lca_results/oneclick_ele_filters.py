@@ -1,6 +1,7 @@
 # pylint: disable=C0103, W0718
 """Defines One Click Filter classes to update values in CLF Omni Column"""
 from typing import Dict
+import numpy as np
 import pandas as pd
 from wblca_benchmark_v2_data_prep.lca_results.abstract_filters import \
     AbstractFilter
@@ -10,7 +11,7 @@ from wblca_benchmark_v2_data_prep.lca_results.enums import OmniClassLevelOne
 class CSIDivision(AbstractFilter):
     """Methods to update CLF Omni column for specific csi division classifications."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.FFE.value,
@@ -38,7 +39,7 @@ class CSIDivision(AbstractFilter):
 class OmniClassSubstructure(AbstractFilter):
     """Methods to update CLF Omni column for Substructure entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.UNKNOWN.value,
@@ -103,7 +104,7 @@ class OmniClassSubstructure(AbstractFilter):
 class OmniClassShellSuperstructure(AbstractFilter):
     """Methods to update CLF Omni column for Shell Superstructure entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.UNKNOWN.value,
@@ -253,7 +254,7 @@ class OmniClassShellSuperstructure(AbstractFilter):
 class OmniClassShellEnclosure(AbstractFilter):
     """Methods to update CLF Omni column for Shell Exterior Enclosure entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.UNKNOWN.value,
@@ -352,7 +353,7 @@ class OmniClassShellEnclosure(AbstractFilter):
 class OmniClassInteriorConstruction(AbstractFilter):
     """Methods to update CLF Omni column for Interior Construction entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.INTERIOR_CONSTRUCTION.value,
@@ -376,7 +377,7 @@ class OmniClassInteriorConstruction(AbstractFilter):
 class OmniClassInteriorFinishes(AbstractFilter):
     """Methods to update CLF Omni column for Interior Finishes entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.INTERIOR_FINISHES.value,
@@ -391,7 +392,7 @@ class OmniClassInteriorFinishes(AbstractFilter):
 class OmniClassMEP(AbstractFilter):
     """Methods to update CLF Omni column for MEP entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.MEP.value,
@@ -406,7 +407,7 @@ class OmniClassMEP(AbstractFilter):
 class OmniClassNotDefined(AbstractFilter):
     """Methods to update CLF Omni column for undefined OmniClass values"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.UNKNOWN.value,
@@ -1,6 +1,7 @@
 # pylint: disable=C0103, W0718
 """Defines One Click LCA Filter classes to update values in Material Quantity Columns"""
 from typing import Dict
+import numpy as np
 import pandas as pd
 from wblca_benchmark_v2_data_prep.lca_results.abstract_filters import AbstractFilter
 from wblca_benchmark_v2_data_prep.lca_results.enums import \
@@ -10,11 +11,12 @@ from wblca_benchmark_v2_data_prep.lca_results.enums import \
 class ConcreteMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Concrete entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('conc_cat_mat_one'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.CONCRETE.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.CONCRETE.value,
+            loc_filter=all_filters.get('conc_cat_mat_one')
+        )
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.OTHER.value,
@@ -71,11 +73,12 @@ class ConcreteMaterialQuantityOne(AbstractFilter):
 class SteelMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Steel entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('metals_cat_mat_one'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.STEEL.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.STEEL.value,
+            loc_filter=all_filters.get('metals_cat_mat_one')
+        )
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.OTHER.value,
@@ -111,11 +114,12 @@ class SteelMaterialQuantityOne(AbstractFilter):
 class MasonryMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Masonry entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('stone_cladding_cat_mat_three'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.MASONRY.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.MASONRY.value,
+            loc_filter=all_filters.get('stone_cladding_cat_mat_three')
+        )
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.MASONRY.value,
@@ -146,7 +150,7 @@ class MasonryMaterialQuantityOne(AbstractFilter):
 class AluminumMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Aluminum entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.or_loc(
             df=df,
             result=MaterialQuantityOne.ALUMINUM.value,
@@ -231,7 +235,7 @@ class AluminumMaterialQuantityOne(AbstractFilter):
 class WoodMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Wood entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.or_loc(
             df=df,
             result=MaterialQuantityOne.WOOD.value,
@@ -340,7 +344,7 @@ class WoodMaterialQuantityOne(AbstractFilter):
 class GlazingMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Glazing entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.GLAZING.value,
@@ -382,11 +386,12 @@ class GlazingMaterialQuantityOne(AbstractFilter):
 class GypsumMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Gypsum entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('gypsum_cat_mat_two'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.GYPSUM.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.GYPSUM.value,
+            loc_filter=all_filters.get('gypsum_cat_mat_two')
+        )
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.OTHER.value,
@@ -409,11 +414,12 @@ class GypsumMaterialQuantityOne(AbstractFilter):
 class InsulationMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Insulation entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('insulation_cat_mat_two'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.INSULATION.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.INSULATION.value,
+            loc_filter=all_filters.get('insulation_cat_mat_two')
+        )
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.OTHER.value,
@@ -428,7 +434,7 @@ class InsulationMaterialQuantityOne(AbstractFilter):
 class RoofMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Roofing entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.or_loc(
             df=df,
             result=MaterialQuantityOne.ROOF.value,
@@ -443,11 +449,12 @@ class RoofMaterialQuantityOne(AbstractFilter):
 class FireproofMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Fireproof entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('fireproof_cat_mat_two'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.FIREPROOF.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.FIREPROOF.value,
+            loc_filter=all_filters.get('fireproof_cat_mat_two')
+        )
         self.or_loc(
             df=df,
             result=MaterialQuantityOne.FIREPROOF.value,
@@ -465,7 +472,7 @@ class DoorFrameMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.DOOR_FRAME.value,
@@ -487,7 +494,7 @@ class WindowFrameMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.WINDOW_FRAME.value,
@@ -576,7 +583,7 @@ class AcousticCeilingsMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.ACOUSTIC_CEILINGS.value,
@@ -594,7 +601,7 @@ class SyntheticCompositesMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.SYNTH_COMP.value,
@@ -612,7 +619,7 @@ class CladdingMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.CLADDING.value,
@@ -680,7 +687,7 @@ class AdhesivesMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         return df
 
 
@@ -690,7 +697,7 @@ class AirVaporMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.AIR_VAPOR.value,
@@ -739,7 +746,7 @@ class CoatingsMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.COATINGS.value,
@@ -760,7 +767,7 @@ class FloorTileMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.FLOOR.value,
@@ -785,7 +792,7 @@ class OtherMetalsMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         return df
 
 
@@ -795,7 +802,7 @@ class WallCoveringsMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.CLADDING.value,
@@ -814,11 +821,12 @@ class WallCoveringsMaterialQuantityOneOther(AbstractFilter):
 class ConcreteMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Aluminum entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('conc_mq_one'),
-            self.column_name_to_change
-        ] = MaterialQuantityTwo.READY_MIX_OTHER.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityTwo.READY_MIX_OTHER.value,
+            loc_filter=all_filters.get('conc_mq_one')
+        )
         self.and_or_loc(
             df=df,
             result=MaterialQuantityTwo.OTHER.value,
@@ -850,7 +858,7 @@ class ConcreteMaterialQuantityTwo(AbstractFilter):
 class SteelMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Glazing entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.HOT_ROLLED.value,
@@ -958,7 +966,7 @@ class SteelMaterialQuantityTwo(AbstractFilter):
 class MasonryMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Gypsum entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityTwo.GROUT.value,
@@ -1020,7 +1028,7 @@ class MasonryMaterialQuantityTwo(AbstractFilter):
 class AluminumMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Insulation entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.EXTRUSION.value,
@@ -1043,7 +1051,7 @@ class AluminumMaterialQuantityTwo(AbstractFilter):
 class WoodMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Roofing entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityTwo.WOOD_FRAMING.value,
@@ -1145,7 +1153,7 @@ class WoodMaterialQuantityTwo(AbstractFilter):
 class GlazingMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Glazing entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.IGU.value,
@@ -1160,11 +1168,12 @@ class GlazingMaterialQuantityTwo(AbstractFilter):
 class GypsumMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Gypsum entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('gypsum_mq_one'),
-            self.column_name_to_change
-        ] = MaterialQuantityTwo.INT_GYPSUM.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityTwo.INT_GYPSUM.value,
+            loc_filter=all_filters.get('gypsum_mq_one')
+        )
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.GLASSMAT_SHEATHING.value,
@@ -1179,7 +1188,7 @@ class GypsumMaterialQuantityTwo(AbstractFilter):
 class InsulationMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Insulation entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.XPS.value,
@@ -1262,7 +1271,7 @@ class InsulationMaterialQuantityTwo(AbstractFilter):
 class RoofMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Roofing entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityTwo.BITUMEN.value,
@@ -1321,7 +1330,7 @@ class RoofMaterialQuantityTwo(AbstractFilter):
 class FireproofMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Fireproof entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityTwo.CEMENTITIOUS.value,
@@ -1350,7 +1359,7 @@ class DoorFrameMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.STEEL_DOOR.value,
@@ -1410,7 +1419,7 @@ class WindowFrameMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.ALUM_WINDOW.value,
@@ -1501,7 +1510,7 @@ class AcousticCeilingsMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityTwo.ACOUS_CEIL_FIBER.value,
@@ -1538,7 +1547,7 @@ class SyntheticCompositesMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         return df
 
 
@@ -1548,7 +1557,7 @@ class CladdingMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.STEEL_METAL_PANEL.value,
@@ -1638,7 +1647,7 @@ class AdhesivesMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         return df
 
 
@@ -1648,7 +1657,7 @@ class AirVaporMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         return df
 
 
@@ -1658,7 +1667,7 @@ class CoatingsMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.PAINT.value,
@@ -1676,7 +1685,7 @@ class FloorTileMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.RAISED_ACESS_FLOOR.value,
@@ -1737,7 +1746,7 @@ class OtherMetalsMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         return df
 
 
@@ -1749,7 +1758,7 @@ class ConcreteReadyMixMaterialQuantityTwo(AbstractFilter):
     the proper strengths for MQ_2 classification.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.READY_MIX_NW_2_5.value,
@@ -1839,7 +1848,7 @@ class FinalOtherMaterialQuantityTwoOther(AbstractFilter):
     based on the MQ_1 value
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.CONCRETE_OTHER.value,
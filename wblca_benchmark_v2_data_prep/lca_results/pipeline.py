@@ -0,0 +1,275 @@
+"""Runs the lca results workflow in memory, from raw models to harmonized files."""
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+from typing import Dict
+import pandas as pd
+import wblca_benchmark_v2_data_prep.lca_results.clean as clean_util
+from wblca_benchmark_v2_data_prep.lca_results.classification_cache import ClassificationCache
+import wblca_benchmark_v2_data_prep.lca_results.stages as stages
+import wblca_benchmark_v2_data_prep.utils.general as gen
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport, measure
+from wblca_benchmark_v2_data_prep.utils.parallel import map_files
+from wblca_benchmark_v2_data_prep.utils.storage import TableStorage, index_as_column
+
+pipeline_logger = getLogger('lca_results.pipeline')
+
+# directories of the stage outputs relative to the main directory, used for checkpoints
+CHECKPOINT_DIRECTORIES = {
+    'cleaned_tally': 'data/lca_results/cleaned/tally',
+    'cleaned_oneclick': 'data/lca_results/cleaned/oneclick',
+    'csc_tally': 'data/lca_results/csc',
+    'element_mapped_tally': 'data/lca_results/element_mapped/tally',
+    'element_mapped_oneclick': 'data/lca_results/element_mapped/oneclick',
+    'material_mapped_tally': 'data/lca_results/material_mapped/tally',
+    'material_mapped_oneclick': 'data/lca_results/material_mapped/oneclick',
+    'ref_ele_mapped_tally': 'data/lca_results/ref_ele_mapped/tally',
+    'ref_ele_mapped_oneclick': 'data/lca_results/ref_ele_mapped/oneclick',
+}
+
+
+def run_tally_model(tally_file: Path, stored_bio_data_short: pd.DataFrame,
+                    checkpoint_directories: Dict[str, Path] = None,
+                    storage: TableStorage = None, cache: ClassificationCache = None,
+                    report: RunReport = None) -> pd.DataFrame:
+    """Run every stage of a raw Tally model in memory.
+
+    Args:
+        tally_file (Path): File path of the raw Tally model
+        stored_bio_data_short (pd.DataFrame): Tally material names and stored carbon factors
+        checkpoint_directories (Dict[str, Path]): Directories to write the output of each
+            stage to, None to keep every stage in memory
+        storage (TableStorage): Format of the checkpoints, csv if not given
+        cache (ClassificationCache): Results of known signatures, None to map every signature
+        report (RunReport): Report of the run, None to not measure the stages
+
+    Returns:
+        pd.DataFrame: Refined element mapped Tally model
+    """
+    storage = storage or TableStorage()
+    pipeline_logger.info('Begin pipeline of %s', tally_file.name)
+    stem = tally_file.stem
+    model = tally_file.stem
+    with measure(report, 'clean_tally', model) as measurement:
+        tally_df = gen.read_csv(tally_file, dtype=storage.column_dtypes)
+        measurement.rows_in = len(tally_df)
+        tally_df = stages.clean_tally(tally_df, tally_file)
+        measurement.rows_out = len(tally_df)
+        if checkpoint_directories:
+            storage.write(tally_df, checkpoint_directories['cleaned_tally'], stem, index=True)
+
+    with measure(report, 'add_stored_carbon', model, len(tally_df)) as measurement:
+        tally_df = stages.add_stored_carbon(index_as_column(tally_df), stored_bio_data_short)
+        measurement.rows_out = len(tally_df)
+        stem = f'{stem}_csc'
+        if checkpoint_directories:
+            storage.write(tally_df, checkpoint_directories['csc_tally'], stem, index=True)
+
+    with measure(report, 'tally_elements', model, len(tally_df)) as measurement:
+        tally_df = stages.map_model(index_as_column(tally_df), 'tally_elements', cache)
+        measurement.rows_out = len(tally_df)
+        stem = f'{stem}_EleMapped'
+        if checkpoint_directories:
+            storage.write(tally_df, checkpoint_directories['element_mapped_tally'], stem)
+
+    with measure(report, 'tally_materials', model, len(tally_df)) as measurement:
+        tally_df = stages.map_model(tally_df, 'tally_materials', cache)
+        measurement.rows_out = len(tally_df)
+        stem = f'{stem}_MatMapped'
+        if checkpoint_directories:
+            storage.write(tally_df, checkpoint_directories['material_mapped_tally'], stem)
+
+    with measure(report, 'tally_elements_refined', model, len(tally_df)) as measurement:
+        tally_df = stages.map_model(tally_df, 'tally_elements_refined', cache)
+        measurement.rows_out = len(tally_df)
+        if checkpoint_directories:
+            storage.write(
+                tally_df, checkpoint_directories['ref_ele_mapped_tally'], f'{stem}_RefMapped'
+            )
+    pipeline_logger.info('End pipeline of %s', tally_file.name)
+    return tally_df
+
+
+def run_oneclick_model(oneclick_file: Path, checkpoint_directories: Dict[str, Path] = None,
+                       storage: TableStorage = None, cache: ClassificationCache = None,
+                       report: RunReport = None) -> pd.DataFrame:
+    """Run every stage of a raw One Click model in memory.
+
+    Args:
+        oneclick_file (Path): File path of the raw One Click model
+        checkpoint_directories (Dict[str, Path]): Directories to write the output of each
+            stage to, None to keep every stage in memory
+        storage (TableStorage): Format of the checkpoints, csv if not given
+        cache (ClassificationCache): Results of known signatures, None to map every signature
+        report (RunReport): Report of the run, None to not measure the stages
+
+    Returns:
+        pd.DataFrame: Refined element mapped One Click model
+    """
+    storage = storage or TableStorage()
+    pipeline_logger.info('Begin pipeline of %s', oneclick_file.name)
+    stem = oneclick_file.stem
+    model = oneclick_file.stem
+    with measure(report, 'clean_oneclick', model) as measurement:
+        oneclick_df = clean_util.read_excel(oneclick_file, storage.excel_engine)
+        measurement.rows_in = len(oneclick_df)
+        oneclick_df = stages.clean_oneclick(oneclick_df, oneclick_file)
+        measurement.rows_out = len(oneclick_df)
+        if checkpoint_directories:
+            storage.write(
+                oneclick_df, checkpoint_directories['cleaned_oneclick'], stem, index=True
+            )
+
+    with measure(report, 'oneclick_elements', model, len(oneclick_df)) as measurement:
+        oneclick_df = stages.map_model(index_as_column(oneclick_df), 'oneclick_elements', cache)
+        measurement.rows_out = len(oneclick_df)
+        stem = f'{stem}_EleMapped'
+        if checkpoint_directories:
+            storage.write(oneclick_df, checkpoint_directories['element_mapped_oneclick'], stem)
+
+    with measure(report, 'oneclick_materials', model, len(oneclick_df)) as measurement:
+        oneclick_df = stages.map_model(oneclick_df, 'oneclick_materials', cache)
+        measurement.rows_out = len(oneclick_df)
+        stem = f'{stem}_MatMapped'
+        if checkpoint_directories:
+            storage.write(
+                oneclick_df, checkpoint_directories['material_mapped_oneclick'], stem
+            )
+
+    with measure(report, 'oneclick_elements_refined', model, len(oneclick_df)) as measurement:
+        oneclick_df = stages.map_model(oneclick_df, 'oneclick_elements_refined', cache)
+        measurement.rows_out = len(oneclick_df)
+        if checkpoint_directories:
+            storage.write(
+                oneclick_df, checkpoint_directories['ref_ele_mapped_oneclick'],
+                f'{stem}_EleMapped'
+            )
+    pipeline_logger.info('End pipeline of %s', oneclick_file.name)
+    return oneclick_df
+
+
+@dataclass
+class LcaResultsPipeline():
+    """Runs the lca results workflow without writing the intermediate files.
+
+    Each model goes through cleaning, stored carbon, element, material and refined element
+    mapping in memory, then the models are combined and harmonized. The intermediate files
+    written by scripts 1 to 6 are only written when checkpoints is set.
+
+    Attributes:
+        main_directory (Path): Root directory of the repository
+        workers (int): Number of worker processes used to run the models
+        checkpoints (bool): Write the output of every stage like the stage scripts do
+        storage (TableStorage): Format of the checkpoints, read from config_storage.yml if
+            not given
+        cache (ClassificationCache): Results of known signatures, the cache of the mapping
+            scripts if not given
+        report (RunReport): Report of the time, rows and memory of every stage, None to not
+            measure the stages
+    """
+    main_directory: Path
+    workers: int = 1
+    checkpoints: bool = False
+    storage: TableStorage = None
+    cache: ClassificationCache = None
+    report: RunReport = None
+
+    def __post_init__(self):
+        self.logger = getLogger(self.__class__.__name__)
+        if self.storage is None:
+            self.storage = stages.table_storage(
+                self._directory('references/config_storage.yml'),
+                self._directory('references/config_harmonize.yml')
+            )
+        if self.cache is None:
+            self.cache = ClassificationCache(
+                self._directory('data/lca_results/classification_cache.sqlite'),
+                stages.stage_rules_hash()
+            )
+
+    def _directory(self, relative_path: str) -> Path:
+        return self.main_directory.joinpath(relative_path)
+
+    def checkpoint_directories(self) -> Dict[str, Path]:
+        """Directories checkpoints are written to.
+
+        Returns:
+            Dict[str, Path]: Directory of each stage output, None if checkpoints are off
+        """
+        if not self.checkpoints:
+            return None
+        return {
+            name: self._directory(relative_path)
+            for name, relative_path in CHECKPOINT_DIRECTORIES.items()
+        }
+
+    def run(self) -> pd.DataFrame:
+        """Run the workflow and write the harmonized files.
+
+        Returns:
+            pd.DataFrame: Harmonized Tally and One Click models
+        """
+        checkpoint_directories = self.checkpoint_directories()
+        config = stages.read_harmonize_config(
+            self._directory('references/config_harmonize.yml')
+        )
+        stored_bio_data_short = stages.read_stored_carbon_database(
+            self._directory('references/stored_carbon_database.xlsx'), self.storage.excel_engine
+        )
+
+        self.logger.info('Run tally models.')
+        tally_dfs = map_files(
+            run_tally_model,
+            self._directory('data/lca_results/raw/tally').glob('*.csv'),
+            self.workers,
+            stored_bio_data_short=stored_bio_data_short,
+            checkpoint_directories=checkpoint_directories,
+            storage=self.storage,
+            cache=self.cache,
+            report=self.report
+        )
+        self.logger.info('Run oneclick models.')
+        oneclick_dfs = map_files(
+            run_oneclick_model,
+            self._directory('data/lca_results/raw/oneclick').glob('*.xlsx'),
+            self.workers,
+            checkpoint_directories=checkpoint_directories,
+            storage=self.storage,
+            cache=self.cache,
+            report=self.report
+        )
+
+        self.logger.info('Combine tally and oneclick models.')
+        with measure(self.report, 'combine') as measurement:
+            measurement.rows_in = sum(len(df) for df in tally_dfs + oneclick_dfs)
+            combined_tally = stages.combine_models(tally_dfs)
+            combined_oneclick = stages.combine_models(oneclick_dfs)
+            measurement.rows_out = len(combined_tally) + len(combined_oneclick)
+            if self.checkpoints:
+                combined_directory = self._directory('data/lca_results/combined')
+                self.storage.write(combined_tally, combined_directory, 'Tally_Model_Combined')
+                self.storage.write(
+                    combined_oneclick, combined_directory, 'OneClick_Model_Combined'
+                )
+
+        self.logger.info('Harmonize tally and oneclick models.')
+        with measure(
+                self.report, 'harmonize', rows_in=len(combined_tally) + len(combined_oneclick)
+        ) as measurement:
+            combined_tally_adjusted, combined_oneclick_adjusted, combined_raw_wblca_output = \
+                stages.harmonize_models(combined_tally, combined_oneclick, config)
+            measurement.rows_out = len(combined_raw_wblca_output)
+
+        harmonized_write_path = self._directory('data/lca_results/harmonized')
+        # harmonized files are part of the public record, so they are always csv
+        gen.write_to_csv(combined_tally_adjusted, harmonized_write_path, 'tally_harmonized')
+        gen.write_to_csv(
+            combined_oneclick_adjusted, harmonized_write_path, 'oneclick_harmonized'
+        )
+        gen.write_to_csv(combined_raw_wblca_output, harmonized_write_path, 'combined_harmonized')
+        gen.write_to_csv(
+            combined_raw_wblca_output,
+            self._directory('data/data_record/raw'),
+            'combined_harmonized'
+        )
+        return combined_raw_wblca_output
@@ -0,0 +1,457 @@
+"""Defines filter predicates and a store that evaluates each distinct predicate once."""
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from logging import getLogger
+from time import perf_counter
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+import numpy as np
+import pandas as pd
+from wblca_benchmark_v2_data_prep.lca_results.literal_scan import LiteralScanner, \
+    literal_alternatives
+from wblca_benchmark_v2_data_prep.lca_results.masks import to_mask
+
+predicates_logger = getLogger('lca_results.predicates')
+
+
+@dataclass(frozen=True)
+class Predicate():
+    """Criteria on a single column used to create a filter.
+
+    Attributes:
+        column (str): Column the criteria is applied to
+        operation (str): One of contains, match, fullmatch, eq or isna
+        pattern (Any): Pattern or value the column is compared to
+        flags (Tuple[Tuple[str, Any], ...]): Keyword arguments passed to the operation
+    """
+    column: str
+    operation: str
+    pattern: Any = None
+    flags: Tuple[Tuple[str, Any], ...] = ()
+
+    @property
+    def is_string_operation(self) -> bool:
+        """Whether the predicate uses the pandas str accessor."""
+        return self.operation in ('contains', 'match', 'fullmatch')
+
+    @property
+    def literals(self) -> Tuple[str, ...]:
+        """Literals of a case sensitive string predicate made of alternated literals.
+
+        Returns:
+            Tuple[str, ...]: literals of the pattern, None if the pattern is a regex
+        """
+        flags = dict(self.flags)
+        if (not self.is_string_operation or not isinstance(self.pattern, str)
+                or set(flags) - {'na', 'regex'}):
+            return None
+        if flags.get('regex', True) or self.operation != 'contains':
+            return literal_alternatives(self.pattern)
+        return (self.pattern,) if self.pattern and '\x00' not in self.pattern else None
+
+    def evaluate(self, series: pd.Series) -> pd.Series:
+        """Apply the criteria to a column.
+
+        Args:
+            series (pd.Series): Column of the DataFrame
+
+        Returns:
+            pd.Series: filter of the column
+        """
+        if self.operation == 'eq':
+            return series == self.pattern
+        if self.operation == 'isna':
+            return pd.isna(series)
+        return getattr(series.str, self.operation)(self.pattern, **dict(self.flags))
+
+
+class PredicateStringMethods():
+    """String methods of a PredicateColumn following the pandas str accessor."""
+
+    # keyword arguments left out of the predicate key when they match the pandas default
+    _defaults = {'case': True, 'flags': 0, 'regex': True}
+
+    def __init__(self, column: 'PredicateColumn'):
+        self._column = column
+
+    def _predicate(self, operation: str, pat: str, **kwargs) -> Predicate:
+        flags = tuple(sorted(
+            (key, value) for key, value in kwargs.items()
+            if key not in self._defaults or self._defaults[key] != value
+        ))
+        return self._column.finish(Predicate(self._column.name, operation, pat, flags))
+
+    def contains(self, pat: str, **kwargs) -> Predicate:
+        """Predicate of pd.Series.str.contains"""
+        return self._predicate('contains', pat, **kwargs)
+
+    def match(self, pat: str, **kwargs) -> Predicate:
+        """Predicate of pd.Series.str.match"""
+        return self._predicate('match', pat, **kwargs)
+
+    def fullmatch(self, pat: str, **kwargs) -> Predicate:
+        """Predicate of pd.Series.str.fullmatch"""
+        return self._predicate('fullmatch', pat, **kwargs)
+
+
+class PredicateColumn():
+    """Column of a PredicateFrame creating predicates with the pandas syntax."""
+
+    __hash__ = None
+
+    def __init__(self, name: str, store: 'PredicateStore' = None):
+        self.name = name
+        self._store = store
+        self.str = PredicateStringMethods(self)
+
+    def __eq__(self, other: Any) -> Predicate:
+        return self.finish(Predicate(self.name, 'eq', other))
+
+    def isna(self) -> Predicate:
+        """Predicate of pd.isna"""
+        return self.finish(Predicate(self.name, 'isna'))
+
+    def finish(self, predicate: Predicate) -> Predicate:
+        """Return the predicate, or its filter if the column belongs to a store.
+
+        Args:
+            predicate (Predicate): Predicate created on the column
+
+        Returns:
+            Predicate: the predicate, or the filter evaluated by the store
+        """
+        if self._store is None:
+            return predicate
+        return self._store.evaluate(predicate)
+
+
+class PredicateFrame():
+    """Stand-in for a DataFrame so dictionaries of filters can be written as predicates.
+
+    Args:
+        store (PredicateStore): store evaluating the predicates right away, None to return
+            the predicates
+    """
+
+    def __init__(self, store: 'PredicateStore' = None):
+        self._store = store
+
+    def __getitem__(self, column: str) -> PredicateColumn:
+        return PredicateColumn(column, self._store)
+
+
+@dataclass
+class PredicateStore():
+    """Evaluates predicates on a DataFrame and caches each distinct filter.
+
+    The cache is scoped to the DataFrame the store is bound to. Binding another DataFrame
+    clears the cache and marking a column as changed drops the filters of that column, so
+    a store can be shared by the mappers of a model while its columns are updated.
+
+    Text columns are factorized once, so string predicates are evaluated on the unique
+    values of a column and broadcast back to the rows through the codes. Categorical
+    columns already hold their codes and are not factorized. The pending string
+    predicates registered for a column that are made of literals are matched together, so
+    the unique values are scanned once for all of them.
+
+    Filters are numpy boolean arrays with one value per row, see masks.to_mask, so combining
+    them skips the index alignment of pd.Series.
+
+    Attributes:
+        df (pd.DataFrame): DataFrame of raw WBLCA entries
+        hits (int): Number of predicates returned from the cache
+        misses (int): Number of predicates evaluated on the DataFrame
+        requested (Set[str]): Keys of filters requested by the filter classes
+        timings (Dict[Predicate, float]): Seconds spent evaluating each predicate. Pending
+            predicates matched together with a predicate are charged to it.
+    """
+    df: pd.DataFrame = field(repr=False)
+    hits: int = 0
+    misses: int = 0
+    requested: Set[str] = field(default_factory=set, repr=False)
+    timings: Dict[Predicate, float] = field(default_factory=dict, repr=False)
+    _cache: Dict[Predicate, np.ndarray] = field(default_factory=dict, repr=False)
+    _codes: Dict[str, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict, repr=False)
+    _known: Dict[str, Dict[Predicate, None]] = field(default_factory=dict, repr=False)
+
+    def register(self, predicates: Iterable[Predicate]) -> None:
+        """Register predicates that may be evaluated together with their column.
+
+        Args:
+            predicates (Iterable[Predicate]): predicates of a dictionary of filters
+        """
+        for predicate in predicates:
+            self._known.setdefault(predicate.column, {})[predicate] = None
+
+    def bind(self, df: pd.DataFrame) -> None:
+        """Bind the store to a DataFrame, clearing the cache if it is a different DataFrame.
+
+        Args:
+            df (pd.DataFrame): DataFrame of raw WBLCA entries
+        """
+        if df is not self.df:
+            self.df = df
+            self._cache.clear()
+            self._codes.clear()
+
+    def evaluate(self, predicate: Predicate) -> np.ndarray:
+        """Return the filter of a predicate, evaluating it only if it is not cached.
+
+        Args:
+            predicate (Predicate): Predicate to evaluate
+
+        Returns:
+            np.ndarray: filter of the predicate
+        """
+        if predicate in self._cache:
+            self.hits += 1
+            return self._cache[predicate]
+        self.misses += 1
+        start = perf_counter()
+        series = self.df[predicate.column]
+        if predicate.is_string_operation and (
+                series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype)):
+            result = self._evaluate_unique(predicate, series)
+        else:
+            result = to_mask(predicate.evaluate(series))
+        self._cache[predicate] = result
+        self._add_time(predicate, start)
+        return result
+
+    def pop_timings(self) -> Dict[Predicate, float]:
+        """Return the evaluation time of each predicate and reset it.
+
+        Returns:
+            Dict[Predicate, float]: seconds spent evaluating each predicate since the last call
+        """
+        timings, self.timings = self.timings, {}
+        return timings
+
+    def _add_time(self, predicate: Predicate, start: float) -> None:
+        self.timings[predicate] = self.timings.get(predicate, 0.0) + perf_counter() - start
+
+    def _evaluate_unique(self, predicate: Predicate, series: pd.Series) -> np.ndarray:
+        """Evaluate a string predicate on the unique values of a column.
+
+        Args:
+            predicate (Predicate): Predicate to evaluate
+            series (pd.Series): Column of the DataFrame
+
+        Returns:
+            np.ndarray: filter of the predicate, identical to evaluating it on every row
+        """
+        if predicate.column not in self._codes:
+            self._codes[predicate.column] = _factorize(series)
+        codes, uniques = self._codes[predicate.column]
+        unique_filters = self._match_combined(predicate, uniques)
+        if unique_filters is None:
+            try:
+                unique_filter = predicate.evaluate(pd.Series(uniques, dtype=object)).to_numpy()
+            except AttributeError:
+                return to_mask(predicate.evaluate(series))
+            unique_filters = {predicate: unique_filter}
+        for other, unique_filter in unique_filters.items():
+            if other != predicate:
+                self.misses += 1
+                self._cache[other] = _broadcast(other, unique_filter, codes)
+        return _broadcast(predicate, unique_filters[predicate], codes)
+
+    def _match_combined(self, predicate: Predicate,
+                        uniques: np.ndarray) -> Dict[Predicate, np.ndarray]:
+        """Evaluate a predicate and the pending predicates of its column in one scan.
+
+        Args:
+            predicate (Predicate): Predicate to evaluate
+            uniques (np.ndarray): Unique values of the column
+
+        Returns:
+            Dict[Predicate, np.ndarray]: filters of the unique values per predicate, None if
+                the predicate is not made of literals
+        """
+        if (predicate.literals is None
+                or pd.api.types.infer_dtype(uniques, skipna=False) not in ('string', 'empty')):
+            return None
+        batch = [predicate] + [
+            other for other in self._known.get(predicate.column, {})
+            if other != predicate and other not in self._cache and other.literals is not None
+        ]
+        hits = _literal_scanner(tuple(batch)).scan(uniques)
+        if hits is None:
+            return None
+        return {other: hits[:, i] for i, other in enumerate(batch)}
+
+    def evaluate_all(self, predicates: Dict[str, Predicate]) -> Dict[str, np.ndarray]:
+        """Evaluate a dictionary of predicates.
+
+        Args:
+            predicates (Dict[str, Predicate]): dictionary of predicates
+
+        Returns:
+            Dict[str, np.ndarray]: dictionary of filters with the same keys
+        """
+        self.register(predicates.values())
+        return {key: self.evaluate(predicate) for key, predicate in predicates.items()}
+
+    def mark_changed(self, column: str) -> None:
+        """Drop the cached filters of a column after it has been updated.
+
+        Args:
+            column (str): Column that has been updated
+        """
+        for predicate in [pred for pred in self._cache if pred.column == column]:
+            del self._cache[predicate]
+        self._codes.pop(column, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters of the store.
+
+        Returns:
+            Dict[str, int]: hits, misses and number of cached filters
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'cached': len(self._cache)}
+
+
+def _factorize(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Codes and unique values of a text column.
+
+    Args:
+        series (pd.Series): Text or categorical column of the DataFrame
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: code of each row, -1 for missing values, and the
+            values of the codes
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories.to_numpy(dtype=object)
+    return pd.factorize(series)
+
+
+@lru_cache(maxsize=None)
+def _literal_scanner(predicates: Tuple[Predicate, ...]) -> LiteralScanner:
+    """Scanner of the literals of predicates on the same column.
+
+    Args:
+        predicates (Tuple[Predicate, ...]): predicates made of alternated literals
+
+    Returns:
+        LiteralScanner: scanner with one pattern per predicate
+    """
+    return LiteralScanner(
+        tuple((predicate.operation, predicate.literals) for predicate in predicates)
+    )
+
+
+def _broadcast(predicate: Predicate, unique_filter: np.ndarray,
+               codes: np.ndarray) -> np.ndarray:
+    """Expand the filter of the unique values of a column to its rows.
+
+    Args:
+        predicate (Predicate): Predicate of the filter
+        unique_filter (np.ndarray): Filter of the unique values
+        codes (np.ndarray): Codes of the rows, -1 for missing values
+
+    Returns:
+        np.ndarray: filter of the predicate, identical to evaluating it on every row
+    """
+    if (codes == -1).any():
+        # missing values have code -1, so their result goes at the end
+        na_filter = predicate.evaluate(pd.Series([np.nan], dtype=object)).to_numpy()
+        unique_filter = np.concatenate([unique_filter, na_filter])
+    unique_filter = to_mask(unique_filter)
+    if isinstance(unique_filter, np.ma.MaskedArray):
+        return np.ma.MaskedArray(unique_filter.data[codes], mask=unique_filter.mask[codes])
+    return unique_filter[codes]
+
+
+class LazyFilterDict(Mapping):
+    """Dictionary of filters evaluated the first time a filter class requests them.
+
+    A filter keeps the values of its column at the time it is evaluated, so pending filters
+    of a column have to be frozen before the column is updated. Each filter depends on the
+    column of its predicate only, so updating a column invalidates the filters of that
+    column and leaves the others cached.
+
+    Args:
+        predicates (Dict[str, Predicate]): dictionary of predicates
+        store (PredicateStore): store evaluating the predicates
+    """
+
+    def __init__(self, predicates: Dict[str, Predicate], store: PredicateStore):
+        self._predicates = predicates
+        self._store = store
+        self._store.register(predicates.values())
+        self._filters: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        predicate = self._predicates[key]
+        self._store.requested.add(key)
+        if key not in self._filters:
+            self._filters[key] = self._store.evaluate(predicate)
+        return self._filters[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._predicates)
+
+    def __len__(self) -> int:
+        return len(self._predicates)
+
+    def freeze(self, column: str) -> None:
+        """Evaluate the pending filters of a column before it is updated.
+
+        Args:
+            column (str): Column that is about to be updated
+        """
+        for key, predicate in self._predicates.items():
+            if predicate.column == column and key not in self._filters:
+                self._filters[key] = self._store.evaluate(predicate)
+
+    def invalidate(self, column: str) -> None:
+        """Drop the filters of a column after it has been updated.
+
+        Args:
+            column (str): Column that has been updated
+        """
+        self._store.mark_changed(column)
+        for key in [key for key in self._filters if self._predicates[key].column == column]:
+            del self._filters[key]
+
+    @property
+    def predicates(self) -> Dict[str, Predicate]:
+        """Dict[str, Predicate]: dictionary of predicates."""
+        return self._predicates
+
+    def columns(self) -> List[str]:
+        """Columns read by the predicates.
+
+        Returns:
+            List[str]: columns in the order of the predicates
+        """
+        return list(dict.fromkeys(predicate.column for predicate in self._predicates.values()))
+
+    def unused_keys(self) -> List[str]:
+        """Keys that no filter class sharing the store has requested.
+
+        Returns:
+            List[str]: keys of unused filters
+        """
+        return [key for key in self._predicates if key not in self._store.requested]
+
+
+def evaluate_predicates(df: pd.DataFrame, predicates: Dict[str, Predicate],
+                        store: PredicateStore = None) -> Dict[str, np.ndarray]:
+    """Evaluate a dictionary of predicates on a DataFrame.
+
+    Args:
+        df (pd.DataFrame): DataFrame of raw WBLCA entries
+        predicates (Dict[str, Predicate]): dictionary of predicates
+        store (PredicateStore): store shared with other mappers, a new store if None
+
+    Returns:
+        Dict[str, np.ndarray]: dictionary of filters
+    """
+    if store is None:
+        store = PredicateStore(df)
+    store.bind(df)
+    filters = store.evaluate_all(predicates)
+    predicates_logger.info('Predicate store %s', store.stats())
+    return filters
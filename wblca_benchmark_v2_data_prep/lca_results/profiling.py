@@ -0,0 +1,222 @@
+"""Records where the time of the mapping stages goes, by filter class, rule and filter."""
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from wblca_benchmark_v2_data_prep.lca_results.masks import differs
+from wblca_benchmark_v2_data_prep.lca_results.rule_engine import RuleTable
+
+
+@dataclass
+class FilterProfile():
+    """Time and rows of the filter classes, rules and filters applied to a model.
+
+    Mappers given a profile record every filter class they apply, every rule of those
+    classes and the filters evaluated for them. Rules are the loc, and_loc, or_loc and
+    and_or_loc calls of a filter class. The time of a rule is the time since the previous
+    rule of its class, which includes evaluating the filters it is the first to request.
+    Changed rows of a rule are the rows whose final value depends on it when the rules are
+    compiled into a rule table, and the rows it writes a new value to with do_filtering.
+
+    Attributes:
+        name (str): Name of the profiled model
+        filters (List[dict]): mapper, filter class and seconds of each filter class
+        rules (List[dict]): mapper, filter class, call, source, column, result, seconds and
+            rows matched and changed of each rule
+        masks (List[dict]): mapper, keys, predicate and seconds of each evaluated filter
+    """
+    name: str = None
+    filters: List[dict] = field(default_factory=list, repr=False)
+    rules: List[dict] = field(default_factory=list, repr=False)
+    masks: List[dict] = field(default_factory=list, repr=False)
+    _mapper: str = field(default=None, init=False, repr=False)
+    _weights: np.ndarray = field(default=None, init=False, repr=False)
+    _clock: float = field(default=None, init=False, repr=False)
+
+    def start(self, mapper: str, row_counts: np.ndarray = None) -> None:
+        """Start recording the filter classes of a mapper.
+
+        Args:
+            mapper (str): Name of the mapper class
+            row_counts (np.ndarray): Number of model rows of each row the filter classes are
+                applied to, None to count each row once
+        """
+        self._mapper = mapper
+        self._weights = row_counts
+        self._clock = perf_counter()
+
+    def record_filter(self, filter_name: str, seconds: float) -> None:
+        """Record the time of a filter class.
+
+        Args:
+            filter_name (str): Name of the filter class
+            seconds (float): Time spent in the filter class
+        """
+        self.filters.append({'mapper': self._mapper, 'filter': filter_name, 'seconds': seconds})
+        self._clock = perf_counter()
+
+    def record_write(self, filter_name: str, call: str, source: str, column: str,
+                     result: str, mask: np.ndarray, values: np.ndarray) -> None:
+        """Record a rule written directly to the DataFrame.
+
+        Args:
+            filter_name (str): Name of the filter class
+            call (str): Method of the filter class writing the rule
+            source (str): Module and line of the call in the filter class
+            column (str): Column the rule writes to
+            result (str): Value written to the column
+            mask (np.ndarray): Boolean array of the rows the rule writes to
+            values (np.ndarray): Values of the column before the rule is written
+        """
+        now = perf_counter()
+        weights = np.ones(len(mask), dtype=np.int64) if self._weights is None else self._weights
+        self.rules.append({
+            'mapper': self._mapper,
+            'filter': filter_name,
+            'call': call,
+            'source': source,
+            'column': column,
+            'result': result,
+            'seconds': now - self._clock,
+            'matched': int(weights[mask].sum()),
+            'changed': int(weights[mask][differs(values[mask], result)].sum()),
+        })
+        self._clock = now
+
+    def record_rule_table(self, rule_table: RuleTable, usage: pd.DataFrame,
+                          apply_seconds: float) -> None:
+        """Record the filter classes and rules of a rule table.
+
+        Args:
+            rule_table (RuleTable): Rule table compiled from the filter classes
+            usage (pd.DataFrame): Usage of the rules, see RuleTable.usage
+            apply_seconds (float): Time spent applying the rule table
+        """
+        for filter_name, seconds in rule_table.filter_seconds.items():
+            self.filters.append(
+                {'mapper': self._mapper, 'filter': filter_name, 'seconds': seconds}
+            )
+        self.filters.append(
+            {'mapper': self._mapper, 'filter': 'RuleTable.apply', 'seconds': apply_seconds}
+        )
+        columns = ['filter', 'call', 'source', 'column', 'result', 'seconds', 'matched',
+                   'changed']
+        for rule in usage[columns].to_dict('records'):
+            self.rules.append({'mapper': self._mapper, **rule})
+        self._clock = perf_counter()
+
+    def record_masks(self, timings: Dict, keys: Dict) -> None:
+        """Record the time spent evaluating filters.
+
+        Args:
+            timings (Dict[Predicate, float]): Seconds spent evaluating each predicate, see
+                PredicateStore.pop_timings
+            keys (Dict[str, Predicate]): Keys of the filters of the mapper by predicate
+        """
+        names = {}
+        for key, predicate in keys.items():
+            names.setdefault(predicate, []).append(key)
+        for predicate, seconds in timings.items():
+            self.masks.append({
+                'mapper': self._mapper,
+                'keys': ', '.join(names.get(predicate, [])),
+                'predicate': repr(predicate),
+                'seconds': seconds,
+            })
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """Records of the profile as DataFrames.
+
+        Returns:
+            Dict[str, pd.DataFrame]: filters, rules and masks DataFrames with a model column
+        """
+        return {
+            records: pd.DataFrame(getattr(self, records)).assign(model=self.name)
+            for records in ('filters', 'rules', 'masks')
+        }
+
+    def write(self, write_directory: Path) -> Path:
+        """Write the profile to a json file named after the model.
+
+        Args:
+            write_directory (Path): Directory of the profiles
+
+        Returns:
+            Path: File path of the profile
+        """
+        write_path = write_directory.joinpath(f'{self.name}_profile.json')
+        record = {key: value for key, value in asdict(self).items() if not key.startswith('_')}
+        write_path.write_text(json.dumps(record, default=str, indent=1), encoding='utf-8')
+        return write_path
+
+    @classmethod
+    def read(cls, profile_path: Path) -> 'FilterProfile':
+        """Read a profile written by write.
+
+        Args:
+            profile_path (Path): File path of the profile
+
+        Returns:
+            FilterProfile: the profile
+        """
+        return cls(**json.loads(profile_path.read_text(encoding='utf-8')))
+
+
+def summarize_profiles(profiles: List[FilterProfile]) -> pd.DataFrame:
+    """Add up the profiles of several models by filter class.
+
+    Args:
+        profiles (List[FilterProfile]): Profiles of the models of a stage
+
+    Returns:
+        pd.DataFrame: models, seconds, rules and rows matched and changed of each filter
+            class, slowest first
+    """
+    filters = pd.concat([profile.frames()['filters'] for profile in profiles])
+    rules = pd.concat([profile.frames()['rules'] for profile in profiles])
+    summary = (filters.groupby(['mapper', 'filter'], sort=False)
+               .agg(models=('model', 'nunique'), seconds=('seconds', 'sum')))
+    if len(rules):
+        rule_totals = (rules.groupby(['mapper', 'filter', 'model'], sort=False)
+                       .agg(rules=('call', 'size'), matched=('matched', 'sum'),
+                            changed=('changed', 'sum'))
+                       .groupby(level=['mapper', 'filter'], sort=False)
+                       .agg(rules=('rules', 'max'), matched=('matched', 'sum'),
+                            changed=('changed', 'sum')))
+        summary = summary.join(rule_totals)
+    return summary.reset_index().sort_values('seconds', ascending=False, kind='stable')
+
+
+def fold_profiles(profiles: List[FilterProfile]) -> List[str]:
+    """Fold the profiles of several models into stacks for flame graph tools.
+
+    Each line is a stack of mapper, filter class and rule followed by its time in
+    microseconds. Time spent in a filter class outside of its rules is given to the filter
+    class itself.
+
+    Args:
+        profiles (List[FilterProfile]): Profiles of the models of a stage
+
+    Returns:
+        List[str]: folded stacks, e.g. "TallyElementMapper;Walls;and_loc@tally_ele_filters:40 12"
+    """
+    stacks = {}
+    for profile in profiles:
+        rule_seconds = {}
+        for rule in profile.rules:
+            key = (rule['mapper'], rule['filter'])
+            rule_seconds[key] = rule_seconds.get(key, 0.0) + rule['seconds']
+            stack = f"{rule['mapper']};{rule['filter']};{rule['call']}@{rule['source']}"
+            stacks[stack] = stacks.get(stack, 0.0) + rule['seconds']
+        for fil in profile.filters:
+            key = (fil['mapper'], fil['filter'])
+            stack = f"{fil['mapper']};{fil['filter']}"
+            own_seconds = max(fil['seconds'] - rule_seconds.pop(key, 0.0), 0.0)
+            stacks[stack] = stacks.get(stack, 0.0) + own_seconds
+    return [
+        f'{stack} {round(seconds * 1e6)}'
+        for stack, seconds in stacks.items() if round(seconds * 1e6) > 0
+    ]
@@ -1,19 +1,20 @@
 """Creates dictionaries of filters for refined element mapping."""
 from typing import Dict
+import numpy as np
 import pandas as pd
 from wblca_benchmark_v2_data_prep.lca_results.enums import \
     MaterialQuantityOne, MaterialQuantityTwo, OmniClassLevelOne
+from wblca_benchmark_v2_data_prep.lca_results.predicates import \
+    Predicate, PredicateFrame, PredicateStore, evaluate_predicates
 
 
-def create_all_refined_filters(df: pd.DataFrame) -> Dict[str, pd.Series]:
-    """Creates a dictionary of filters to be implemented for refined element mapping.
-
-    Args:
-        df (pd.DataFrame): DataFrame of entries
+def create_all_refined_predicates() -> Dict[str, Predicate]:
+    """Creates a dictionary of predicates to be implemented for refined element mapping.
 
     Returns:
-        Dict[str, pd.Series]: dictionary of filters
+        Dict[str, Predicate]: dictionary of predicates
     """
+    df = PredicateFrame()
     filters = {
         'acous_ceilings_mq_one': df['MQ_1'].str.fullmatch(
             MaterialQuantityOne.ACOUSTIC_CEILINGS.value
@@ -53,3 +54,17 @@ def create_all_refined_filters(df: pd.DataFrame) -> Dict[str, pd.Series]:
     }
 
     return filters
+
+
+def create_all_refined_filters(df: pd.DataFrame,
+                               store: PredicateStore = None) -> Dict[str, np.ndarray]:
+    """Creates a dictionary of filters to be implemented for refined element mapping.
+
+    Args:
+        df (pd.DataFrame): DataFrame of entries
+        store (PredicateStore): store shared with other mappers, a new store if None
+
+    Returns:
+        Dict[str, np.ndarray]: dictionary of filters
+    """
+    return evaluate_predicates(df, create_all_refined_predicates(), store)
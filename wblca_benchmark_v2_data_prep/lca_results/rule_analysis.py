@@ -0,0 +1,89 @@
+"""Finds the rules of the filter classes that never change a row of a corpus of models."""
+from logging import getLogger
+from typing import Iterable, List, Type
+import pandas as pd
+from wblca_benchmark_v2_data_prep.lca_results.abstract_filters import AbstractFilter
+
+rule_analysis_logger = getLogger('lca_results.rule_analysis')
+
+# columns identifying a rule in every model
+RULE_COLUMNS = ['step', 'filter', 'rule', 'source', 'column', 'result']
+
+
+def model_rule_usage(df: pd.DataFrame, mapper_class: Type,
+                     filter_stages: List[List[AbstractFilter]]) -> pd.DataFrame:
+    """Map a model and count the rows each rule matches, wins and changes.
+
+    Args:
+        df (pd.DataFrame): DataFrame of a model, mapped in place
+        mapper_class (Type): Mapper class of the stage
+        filter_stages (List[List[AbstractFilter]]): Filter classes of each step of the stage
+
+    Returns:
+        pd.DataFrame: Usage of every rule of every step, see RuleTable.usage
+    """
+    mapper = mapper_class(df, deduplicate=True, rule_usage=[])
+    for filter_stage in filter_stages:
+        mapper.apply_filters(filter_stage)
+    return pd.concat(
+        [usage.assign(step=step) for step, usage in enumerate(mapper.rule_usage)],
+        ignore_index=True
+    )
+
+
+def corpus_rule_usage(dfs: Iterable[pd.DataFrame], mapper_class: Type,
+                      filter_stages: List[List[AbstractFilter]]) -> pd.DataFrame:
+    """Add up the usage of the rules of a stage over the models of a corpus.
+
+    A rule changes a row when removing it would give the row another value, so rules with
+    no changed rows are dead on the corpus: they never match, are always overwritten by a
+    later rule, or write the value the row already has. Rules are only dead for the models
+    analyzed, a new model can still need them.
+
+    Args:
+        dfs (Iterable[pd.DataFrame]): DataFrames of the models the stage reads
+        mapper_class (Type): Mapper class of the stage
+        filter_stages (List[List[AbstractFilter]]): Filter classes of each step of the stage
+
+    Returns:
+        pd.DataFrame: One row per rule in the order they are applied, with the summed
+            seconds and rows matched, won and changed, the number of models the rule
+            changed and whether the rule is dead
+    """
+    usages = []
+    for df in dfs:
+        usage = model_rule_usage(df, mapper_class, filter_stages)
+        usages.append(usage.assign(models=(usage['changed'] > 0).astype(int)))
+    if not usages:
+        return pd.DataFrame(
+            columns=RULE_COLUMNS + ['seconds', 'matched', 'won', 'changed', 'models', 'dead']
+        )
+
+    corpus = (pd.concat(usages, ignore_index=True)
+              .groupby(RULE_COLUMNS, sort=False, dropna=False)
+              [['seconds', 'matched', 'won', 'changed', 'models']]
+              .sum()
+              .reset_index())
+    corpus['dead'] = corpus['changed'] == 0
+    rule_analysis_logger.info(
+        '%s of %s rules changed no row of %s models.',
+        int(corpus['dead'].sum()), len(corpus), len(usages)
+    )
+    return corpus
+
+
+def summarize_filters(corpus: pd.DataFrame) -> pd.DataFrame:
+    """Summarize the usage of the rules by filter class.
+
+    Args:
+        corpus (pd.DataFrame): Usage of the rules of a corpus, see corpus_rule_usage
+
+    Returns:
+        pd.DataFrame: Number of rules, dead rules, seconds and changed rows of each filter
+            class, slowest first
+    """
+    return (corpus.groupby(['step', 'filter'], sort=False)
+            .agg(rules=('rule', 'size'), dead=('dead', 'sum'), seconds=('seconds', 'sum'),
+                 changed=('changed', 'sum'))
+            .reset_index()
+            .sort_values('seconds', ascending=False, kind='stable'))
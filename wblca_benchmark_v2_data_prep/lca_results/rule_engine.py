@@ -0,0 +1,217 @@
+"""Compiles filter classes into an ordered rule table applied in one vectorized pass."""
+from dataclasses import dataclass, field
+from logging import getLogger
+from time import perf_counter
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from wblca_benchmark_v2_data_prep.lca_results.abstract_filters import AbstractFilter
+from wblca_benchmark_v2_data_prep.lca_results.masks import differs, matches
+
+
+@dataclass
+class Rule():
+    """Single loc call recorded from a filter class.
+
+    Attributes:
+        filter_name (str): Name of the filter class the rule came from
+        column (str): Column the rule writes to
+        result (str): Value written to the column
+        mask (np.ndarray): Boolean array of the rows the rule writes to
+        cast_float_to_object (bool): Whether the rule casts a float column to object
+        call (str): Method of the filter class recording the rule, e.g. and_loc
+        source (str): Module and line of the call in the filter class
+        seconds (float): Time spent in the filter class since the previous rule, mostly
+            evaluating the filters of the rule. Filters shared by several rules are
+            evaluated once and charged to the first of them.
+    """
+    filter_name: str
+    column: str
+    result: str
+    mask: np.ndarray = field(repr=False)
+    cast_float_to_object: bool = False
+    call: str = 'loc'
+    source: str = None
+    seconds: float = 0.0
+
+
+@dataclass
+class RuleTable():
+    """Ordered rules of a list of filter classes.
+
+    Rules are applied with last-writer-wins priority, which gives the same result as
+    applying each loc call one after another on masks computed before the first write.
+
+    Attributes:
+        rules (List[Rule]): Rules in the order they were recorded
+        filter_seconds (Dict[str, float]): Time spent compiling each filter class
+    """
+    rules: List[Rule] = field(default_factory=list)
+    filter_seconds: Dict[str, float] = field(default_factory=dict, repr=False)
+    _clock: float = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.logger = getLogger(self.__class__.__name__)
+
+    @classmethod
+    def compile(cls, filters: List[AbstractFilter], df: pd.DataFrame,
+                all_filters: Dict[str, np.ndarray]) -> 'RuleTable':
+        """Record the rules of each filter class without changing the DataFrame.
+
+        Args:
+            filters (List[AbstractFilter]): Filter classes in the order they are applied
+            df (pd.DataFrame): DataFrame of raw WBLCA entries
+            all_filters (Dict[str, np.ndarray]): All filters for raw WBLCA entries
+
+        Returns:
+            RuleTable: rule table of all the filter classes
+        """
+        rule_table = cls()
+        for fil in filters:
+            rule_table.logger.info('Compiling the following class: %s', fil.__class__.__name__)
+            fil.record_rules(rule_table)
+            start = rule_table._clock = perf_counter()
+            try:
+                fil.filtering(df, all_filters)
+            finally:
+                fil.record_rules(None)
+            rule_table.filter_seconds[fil.__class__.__name__] = perf_counter() - start
+        rule_table.logger.info('Compiled %s rules.', len(rule_table.rules))
+        return rule_table
+
+    def add_rule(self, filter_name: str, column: str, result: str, loc_filter: np.ndarray,
+                 cast_float_to_object: bool = False, call: str = 'loc',
+                 source: str = None) -> None:
+        """Add a rule to the end of the rule table.
+
+        Args:
+            filter_name (str): Name of the filter class the rule came from
+            column (str): Column the rule writes to
+            result (str): Value written to the column
+            loc_filter (np.ndarray): Reduced filter of the loc call
+            cast_float_to_object (bool): Whether the rule casts a float column to object
+            call (str): Method of the filter class recording the rule
+            source (str): Module and line of the call in the filter class
+        """
+        mask = matches(loc_filter)
+        now = perf_counter()
+        self.rules.append(
+            Rule(
+                filter_name=filter_name,
+                column=column,
+                result=result,
+                mask=mask,
+                cast_float_to_object=cast_float_to_object,
+                call=call,
+                source=source,
+                seconds=now - self._clock if self._clock is not None else 0.0
+            )
+        )
+        self._clock = now
+
+    def winners(self, column: str) -> np.ndarray:
+        """Find the last rule writing to each row of a column.
+
+        Args:
+            column (str): Column the rules write to
+
+        Returns:
+            np.ndarray: Position of the winning rule in the rule table per row, -1 if none.
+                Empty if no rules write to the column.
+        """
+        positions = [i for i, rule in enumerate(self.rules) if rule.column == column]
+        if not positions:
+            return np.array([], dtype=np.intp)
+        # np.select takes the first true condition, so the last rule goes first
+        return np.select(
+            [self.rules[i].mask for i in reversed(positions)],
+            list(reversed(positions)),
+            default=-1
+        )
+
+    def usage(self, df: pd.DataFrame, row_counts: np.ndarray = None) -> pd.DataFrame:
+        """Count the rows each rule matches, wins and changes.
+
+        A rule changes a row when it is the last rule writing to the row and the value it
+        writes differs from the value the row would get without the rule, i.e. the result
+        of the previous rule matching the row or the value of the row before the rules. A
+        rule that changes no row can be removed without changing the DataFrame.
+
+        Args:
+            df (pd.DataFrame): DataFrame the rules were compiled on, before apply
+            row_counts (np.ndarray): Number of model rows of each row of df, e.g. when df
+                holds signatures, None to count each row once
+
+        Returns:
+            pd.DataFrame: One row per rule in order, with the filter class, the position of
+                the rule in the filter class, its call, source line, column, result and seconds,
+                and the number of rows it matched, won and changed
+        """
+        results = np.empty(len(self.rules), dtype=object)
+        results[:] = [rule.result for rule in self.rules]
+        matched = np.zeros(len(self.rules), dtype=np.int64)
+        won = np.zeros(len(self.rules), dtype=np.int64)
+        changed = np.zeros(len(self.rules), dtype=np.int64)
+        weights = np.ones(len(df), dtype=np.int64) if row_counts is None else row_counts
+        for column in dict.fromkeys(rule.column for rule in self.rules):
+            positions = [i for i, rule in enumerate(self.rules) if rule.column == column]
+            winners = self.winners(column)
+            # last rule matching each row besides its winner, -1 to keep its value
+            runners_up = np.select(
+                [self.rules[i].mask & (winners != i) for i in reversed(positions)],
+                list(reversed(positions)),
+                default=-1
+            )
+            fallback = df[column].to_numpy(dtype=object).copy()
+            fallback[runners_up >= 0] = results[runners_up[runners_up >= 0]]
+            hits = winners >= 0
+            changes = np.zeros(len(df), dtype=bool)
+            changes[hits] = differs(results[winners[hits]], fallback[hits])
+            for i in positions:
+                matched[i] = weights[self.rules[i].mask].sum()
+            won += np.bincount(winners[hits], weights[hits], len(self.rules)).astype(np.int64)
+            changed += np.bincount(
+                winners[changes], weights[changes], len(self.rules)
+            ).astype(np.int64)
+
+        usage = pd.DataFrame({
+            'filter': [rule.filter_name for rule in self.rules],
+            'call': [rule.call for rule in self.rules],
+            'source': [rule.source for rule in self.rules],
+            'column': [rule.column for rule in self.rules],
+            'result': results,
+            'seconds': [rule.seconds for rule in self.rules],
+            'matched': matched,
+            'won': won,
+            'changed': changed,
+        })
+        usage.insert(1, 'rule', usage.groupby('filter', sort=False).cumcount())
+        return usage
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Write the results of all rules to the DataFrame in one pass per column.
+
+        Args:
+            df (pd.DataFrame): DataFrame the rules were compiled on
+
+        Returns:
+            pd.DataFrame: DataFrame with updated columns
+        """
+        results = np.empty(len(self.rules), dtype=object)
+        results[:] = [rule.result for rule in self.rules]
+        for column in dict.fromkeys(rule.column for rule in self.rules):
+            winners = self.winners(column)
+            hits = winners >= 0
+            casts = any(rule.cast_float_to_object for rule in self.rules if rule.column == column)
+            if df[column].dtype == 'float64' and (casts or hits.any()):
+                df[column] = df[column].astype(object)
+            if hits.any():
+                if isinstance(df[column].dtype, pd.CategoricalDtype):
+                    new_categories = pd.Index(results[winners[hits]]).unique().difference(
+                        df[column].cat.categories
+                    )
+                    if len(new_categories):
+                        df[column] = df[column].cat.add_categories(new_categories)
+                df.loc[hits, column] = results[winners[hits]]
+            self.logger.info('Updated %s rows of %s.', int(hits.sum()), column)
+        return df
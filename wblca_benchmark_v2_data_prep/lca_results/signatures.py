@@ -0,0 +1,100 @@
+"""Deduplicates the rows of a model into the distinct values of the columns filters read."""
+import json
+from dataclasses import dataclass, field
+from typing import Iterable, List
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import ExtensionArray
+
+
+@dataclass
+class SignatureTable():
+    """Distinct rows of the columns read and written by the filter classes.
+
+    Filter classes only read the columns of their predicates, so rows with the same values
+    in those columns and in the columns they write get the same result. Filtering the
+    signatures and broadcasting the written columns back through the codes gives the same
+    DataFrame as filtering every row.
+
+    Attributes:
+        df (pd.DataFrame): One row per distinct signature, in order of first appearance
+        codes (np.ndarray): Row of df holding the signature of each row of the model
+    """
+    df: pd.DataFrame = field(repr=False)
+    codes: np.ndarray = field(repr=False)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Iterable[str]) -> 'SignatureTable':
+        """Project a DataFrame on the signature columns and deduplicate it.
+
+        Args:
+            df (pd.DataFrame): DataFrame of raw WBLCA entries
+            columns (Iterable[str]): Columns read or written by the filter classes, columns
+                missing from the DataFrame are ignored
+
+        Returns:
+            SignatureTable: signatures of the DataFrame
+        """
+        columns = [col for col in dict.fromkeys(columns) if col in df.columns]
+        if not columns:
+            return cls(pd.DataFrame(index=range(min(len(df), 1))), np.zeros(len(df), np.intp))
+        codes = (df[columns]
+                 .groupby(columns, dropna=False, sort=False, observed=True)
+                 .ngroup()
+                 .to_numpy(dtype=np.intp))
+        # codes number the signatures in order of first appearance
+        _, first_rows = np.unique(codes, return_index=True)
+        return cls(df[columns].iloc[first_rows].reset_index(drop=True), codes)
+
+    @property
+    def columns(self) -> List[str]:
+        """List[str]: Columns of the signatures."""
+        return list(self.df.columns)
+
+    def covers(self, columns: Iterable[str]) -> bool:
+        """Check if the signatures hold a set of columns.
+
+        Args:
+            columns (Iterable[str]): columns read or written by filter classes
+
+        Returns:
+            bool: True if every column is part of the signatures
+        """
+        return set(columns) <= set(self.df.columns)
+
+    def keys(self) -> List[str]:
+        """Text key of each signature that is the same for the same values in any model.
+
+        Returns:
+            List[str]: json list of the values of each signature, missing values as null
+        """
+        return [
+            json.dumps([json_value(value) for value in row], ensure_ascii=False)
+            for row in self.df.itertuples(index=False, name=None)
+        ]
+
+    def broadcast(self, column: str) -> ExtensionArray:
+        """Values of a signature column for every row of the model.
+
+        Args:
+            column (str): Column of the signatures
+
+        Returns:
+            ExtensionArray: values with the dtype of the signature column, without an index
+                so they can be assigned to a model with any index
+        """
+        return self.df[column].array.take(self.codes)
+
+
+def json_value(value):
+    """Convert a value of a DataFrame to a value json can write.
+
+    Args:
+        value: value of a DataFrame cell
+
+    Returns:
+        value as a python scalar, None if it is missing
+    """
+    if pd.isna(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
@@ -0,0 +1,697 @@
+# pylint: disable=C0103
+"""Stages of the lca results workflow applied to a single model.
+
+Each stage has a function taking and returning the DataFrame of a model, and a function
+reading a model file, applying the stage and writing the result. The mapping stages share
+map_model and map_model_file, driven by MAPPING_STAGES. The file functions are defined at
+module level so they can be sent to worker processes. Mappers filter the distinct values
+of the columns the filter classes read rather than every row.
+"""
+from pathlib import Path
+from logging import getLogger
+from typing import List, Tuple
+import numpy as np
+import pandas as pd
+from wblca_benchmark_v2_data_prep.lca_results.abstract_filters import AbstractFilter
+from wblca_benchmark_v2_data_prep.lca_results.batch import map_models, map_with_cache
+from wblca_benchmark_v2_data_prep.lca_results.classification_cache import ClassificationCache
+from wblca_benchmark_v2_data_prep.lca_results.column_types import column_dtypes
+from wblca_benchmark_v2_data_prep.lca_results.enum_codes import decode_enum_columns
+from wblca_benchmark_v2_data_prep.lca_results.MappingImplementation import \
+    TallyElementMapper, OneClickElementMapper, TallyMaterialQuantityMapper, \
+    OneClickMaterialQuantityMapper, TallyRefinedElementMapper, OneClickRefinedElementMapper
+import wblca_benchmark_v2_data_prep.lca_results.clean as clean_util
+import wblca_benchmark_v2_data_prep.lca_results.comb_refined_ele_filters as ref
+import wblca_benchmark_v2_data_prep.lca_results.oneclick_ele_filters as oc_ele
+import wblca_benchmark_v2_data_prep.lca_results.oneclick_mat_filters as oc_mat
+import wblca_benchmark_v2_data_prep.lca_results.tally_ele_filters as t_ele
+import wblca_benchmark_v2_data_prep.lca_results.tally_mat_filters as t_mat
+import wblca_benchmark_v2_data_prep.utils.general as gen
+from wblca_benchmark_v2_data_prep.utils.excel_cache import read_excel_sheet
+from wblca_benchmark_v2_data_prep.utils.instrumentation import RunReport, measure
+from wblca_benchmark_v2_data_prep.utils.manifest import rules_hash
+from wblca_benchmark_v2_data_prep.utils.storage import ColumnKinds, TableStorage
+
+stages_logger = getLogger('lca_results.stages')
+
+# code of the workflow, a change to any module reprocesses every model
+PACKAGE_DIRECTORY = Path(__file__).parents[1]
+
+
+def stage_rules_hash(*reference_files: Path) -> str:
+    """Hash the code of the workflow and the reference files read by a stage.
+
+    Args:
+        *reference_files (Path): Config and reference files that change the stage output
+
+    Returns:
+        str: Hash recorded in the manifest of the stage
+    """
+    return rules_hash([
+        PACKAGE_DIRECTORY.joinpath('lca_results'),
+        PACKAGE_DIRECTORY.joinpath('utils'),
+        *reference_files
+    ])
+
+
+def table_storage(storage_config_path: Path, harmonize_config_path: Path) -> TableStorage:
+    """Storage of the intermediate files, reading csv files with the known column types.
+
+    Args:
+        storage_config_path (Path): File path of config_storage.yml
+        harmonize_config_path (Path): File path of config_harmonize.yml, see
+            column_types.column_dtypes
+
+    Returns:
+        TableStorage: storage with the configured format and column dtypes
+    """
+    harmonize_config = gen.read_yaml(harmonize_config_path)
+    assert harmonize_config is not None, 'The harmonize config dictionary could not be set'
+    return TableStorage.from_config(storage_config_path, column_dtypes(harmonize_config))
+
+
+def tally_element_filters() -> List[AbstractFilter]:
+    """Filter classes of Tally element mapping.
+
+    Returns:
+        List[AbstractFilter]: Filter classes in the order they are applied
+    """
+    return [
+        t_ele.Ceilings('CLF Omni'),
+        t_ele.CurtainWallPanels('CLF Omni'),
+        t_ele.CurtainWallMullions('CLF Omni'),
+        t_ele.Doors('CLF Omni'),
+        t_ele.Floors('CLF Omni'),
+        t_ele.Roofs('CLF Omni'),
+        t_ele.Railings('CLF Omni'),
+        t_ele.Stairs('CLF Omni'),
+        t_ele.StructuralColumns('CLF Omni'),
+        t_ele.StructuralConnections('CLF Omni'),
+        t_ele.StructuralFoundations('CLF Omni'),
+        t_ele.StructuralFraming('CLF Omni'),
+        t_ele.Walls('CLF Omni'),
+        t_ele.Windows('CLF Omni'),
+    ]
+
+
+def oneclick_element_filters() -> List[AbstractFilter]:
+    """Filter classes of One Click element mapping.
+
+    Returns:
+        List[AbstractFilter]: Filter classes in the order they are applied
+    """
+    return [
+        oc_ele.OmniClassSubstructure('CLF Omni'),
+        oc_ele.OmniClassShellSuperstructure('CLF Omni'),
+        oc_ele.OmniClassShellEnclosure('CLF Omni'),
+        oc_ele.OmniClassInteriorConstruction('CLF Omni'),
+        oc_ele.OmniClassInteriorFinishes('CLF Omni'),
+        oc_ele.OmniClassMEP('CLF Omni'),
+        oc_ele.OmniClassNotDefined('CLF Omni'),
+        oc_ele.CSIDivision('CLF Omni'),
+    ]
+
+
+def tally_material_filters() -> List[List[AbstractFilter]]:
+    """Filter classes of each Tally material mapping stage.
+
+    The stages map "MQ_1", then "MQ_2", then "MQ_1" and "MQ_2" of materials that are still
+    "Other", and finally replace "MQ_2" values that are other with a material specific other
+    category (e.g. Concrete - other).
+
+    Returns:
+        List[List[AbstractFilter]]: Filter classes of each stage in the order they are applied
+    """
+    return [
+        [
+            t_mat.ConcreteMaterialQuantityOne('MQ_1'),
+            t_mat.SteelMaterialQuantityOne('MQ_1'),
+            t_mat.MasonryMaterialQuantityOne('MQ_1'),
+            t_mat.AluminumMaterialQuantityOne('MQ_1'),
+            t_mat.WoodMaterialQuantityOne('MQ_1'),
+            t_mat.GlazingMaterialQuantityOne('MQ_1'),
+            t_mat.RoofMaterialQuantityOne('MQ_1'),
+            t_mat.InsulationMaterialQuantityOne('MQ_1'),
+            t_mat.GypsumMaterialQuantityOne('MQ_1'),
+            t_mat.FireproofMaterialQuantityOne('MQ_1'),
+        ],
+        [
+            t_mat.ConcreteMaterialQuantityTwo('MQ_2'),
+            t_mat.SteelMaterialQuantityTwo('MQ_2'),
+            t_mat.MasonryMaterialQuantityTwo('MQ_2'),
+            t_mat.AluminumMaterialQuantityTwo('MQ_2'),
+            t_mat.WoodMaterialQuantityTwo('MQ_2'),
+            t_mat.GlazingMaterialQuantityTwo('MQ_2'),
+            t_mat.RoofMaterialQuantityTwo('MQ_2'),
+            t_mat.InsulationMaterialQuantityTwo('MQ_2'),
+            t_mat.GypsumMaterialQuantityTwo('MQ_2'),
+            t_mat.FireproofMaterialQuantityTwo('MQ_2'),
+        ],
+        [
+            t_mat.DoorFrameMaterialQuantityOneOther('MQ_1'),
+            t_mat.WindowFrameMaterialQuantityOneOther('MQ_1'),
+            t_mat.AcousticCeilingsMaterialQuantityOneOther('MQ_1'),
+            t_mat.SyntheticCompositesMaterialQuantityOneOther('MQ_1'),
+            t_mat.CladdingMaterialQuantityOneOther('MQ_1'),
+            t_mat.AdhesivesMaterialQuantityOneOther('MQ_1'),
+            t_mat.AirVaporMaterialQuantityOneOther('MQ_1'),
+            t_mat.CoatingsMaterialQuantityOneOther('MQ_1'),
+            t_mat.FloorTileMaterialQuantityOneOther('MQ_1'),
+            t_mat.WallCoveringsMaterialQuantityOneOther('MQ_1'),
+            t_mat.OtherMetalsMaterialQuantityOneOther('MQ_1'),
+        ],
+        [
+            t_mat.DoorFrameMaterialQuantityTwoOther('MQ_2'),
+            t_mat.WindowFrameMaterialQuantityTwoOther('MQ_2'),
+            t_mat.AcousticCeilingsMaterialQuantityTwoOther('MQ_2'),
+            t_mat.SyntheticCompositesMaterialQuantityTwoOther('MQ_2'),
+            t_mat.CladdingMaterialQuantityTwoOther('MQ_2'),
+            t_mat.AdhesivesMaterialQuantityTwoOther('MQ_2'),
+            t_mat.AirVaporMaterialQuantityTwoOther('MQ_2'),
+            t_mat.CoatingsMaterialQuantityTwoOther('MQ_2'),
+            t_mat.FloorTileMaterialQuantityTwoOther('MQ_2'),
+            t_mat.OtherMetalsMaterialQuantityTwoOther('MQ_2'),
+        ],
+        [
+            t_mat.FinalOtherMaterialQuantityTwoOther('MQ_2'),
+        ],
+    ]
+
+
+def oneclick_material_filters() -> List[List[AbstractFilter]]:
+    """Filter classes of each One Click material mapping stage.
+
+    The stages are the same as in tally_material_filters.
+
+    Returns:
+        List[List[AbstractFilter]]: Filter classes of each stage in the order they are applied
+    """
+    return [
+        [
+            oc_mat.ConcreteMaterialQuantityOne('MQ_1'),
+            oc_mat.SteelMaterialQuantityOne('MQ_1'),
+            oc_mat.MasonryMaterialQuantityOne('MQ_1'),
+            oc_mat.AluminumMaterialQuantityOne('MQ_1'),
+            oc_mat.WoodMaterialQuantityOne('MQ_1'),
+            oc_mat.GlazingMaterialQuantityOne('MQ_1'),
+            oc_mat.RoofMaterialQuantityOne('MQ_1'),
+            oc_mat.InsulationMaterialQuantityOne('MQ_1'),
+            oc_mat.GypsumMaterialQuantityOne('MQ_1'),
+            oc_mat.FireproofMaterialQuantityOne('MQ_1'),
+        ],
+        [
+            oc_mat.ConcreteMaterialQuantityTwo('MQ_2'),
+            oc_mat.SteelMaterialQuantityTwo('MQ_2'),
+            oc_mat.MasonryMaterialQuantityTwo('MQ_2'),
+            oc_mat.AluminumMaterialQuantityTwo('MQ_2'),
+            oc_mat.WoodMaterialQuantityTwo('MQ_2'),
+            oc_mat.GlazingMaterialQuantityTwo('MQ_2'),
+            oc_mat.RoofMaterialQuantityTwo('MQ_2'),
+            oc_mat.InsulationMaterialQuantityTwo('MQ_2'),
+            oc_mat.GypsumMaterialQuantityTwo('MQ_2'),
+            oc_mat.FireproofMaterialQuantityTwo('MQ_2'),
+        ],
+        [
+            oc_mat.DoorFrameMaterialQuantityOneOther('MQ_1'),
+            oc_mat.WindowFrameMaterialQuantityOneOther('MQ_1'),
+            oc_mat.AcousticCeilingsMaterialQuantityOneOther('MQ_1'),
+            oc_mat.SyntheticCompositesMaterialQuantityOneOther('MQ_1'),
+            oc_mat.CladdingMaterialQuantityOneOther('MQ_1'),
+            oc_mat.AdhesivesMaterialQuantityOneOther('MQ_1'),
+            oc_mat.AirVaporMaterialQuantityOneOther('MQ_1'),
+            oc_mat.CoatingsMaterialQuantityOneOther('MQ_1'),
+            oc_mat.FloorTileMaterialQuantityOneOther('MQ_1'),
+            oc_mat.OtherMetalsMaterialQuantityOneOther('MQ_1'),
+            oc_mat.WallCoveringsMaterialQuantityOneOther('MQ_1'),
+        ],
+        [
+            oc_mat.DoorFrameMaterialQuantityTwoOther('MQ_2'),
+            oc_mat.WindowFrameMaterialQuantityTwoOther('MQ_2'),
+            oc_mat.AcousticCeilingsMaterialQuantityTwoOther('MQ_2'),
+            oc_mat.SyntheticCompositesMaterialQuantityTwoOther('MQ_2'),
+            oc_mat.CladdingMaterialQuantityTwoOther('MQ_2'),
+            oc_mat.AdhesivesMaterialQuantityTwoOther('MQ_2'),
+            oc_mat.AirVaporMaterialQuantityTwoOther('MQ_2'),
+            oc_mat.CoatingsMaterialQuantityTwoOther('MQ_2'),
+            oc_mat.FloorTileMaterialQuantityTwoOther('MQ_2'),
+            oc_mat.OtherMetalsMaterialQuantityTwoOther('MQ_2'),
+            oc_mat.ConcreteReadyMixMaterialQuantityTwo('MQ_2'),
+        ],
+        [
+            oc_mat.FinalOtherMaterialQuantityTwoOther('MQ_2'),
+        ],
+    ]
+
+
+def refined_element_filters() -> List[AbstractFilter]:
+    """Filter classes of refined element mapping for Tally and One Click.
+
+    Returns:
+        List[AbstractFilter]: Filter classes in the order they are applied
+    """
+    return [ref.RefinedElementFilter('CLF Omni')]
+
+
+def clean_tally(tally_df: pd.DataFrame, tally_file: Path) -> pd.DataFrame:
+    """Clean a raw Tally model and adjust the revit building element of its walls.
+
+    Args:
+        tally_df (pd.DataFrame): raw DataFrame of a Tally model
+        tally_file (Path): File path location of the Tally model
+
+    Returns:
+        pd.DataFrame: Cleaned Tally DataFrame
+    """
+    tally_df = clean_util.clean_tally_df(tally_df=tally_df, tally_file=tally_file)
+    return clean_util.adjust_tally_walls(tally_df)
+
+
+def clean_oneclick(oneclick_df: pd.DataFrame, oneclick_file: Path) -> pd.DataFrame:
+    """Clean a raw One Click LCA model.
+
+    Args:
+        oneclick_df (pd.DataFrame): raw DataFrame of a One Click LCA model
+        oneclick_file (Path): File path location of the One Click LCA model
+
+    Returns:
+        pd.DataFrame: Cleaned One Click LCA DataFrame
+    """
+    return clean_util.clean_oneclick_df(oneclick_df=oneclick_df, oneclick_file=oneclick_file)
+
+
+def read_stored_carbon_database(stored_bio_database_path: Path,
+                                engine: str = None) -> pd.DataFrame:
+    """Read the material names and stored carbon factors of the stored carbon database.
+
+    Args:
+        stored_bio_database_path (Path): File path of the stored carbon database
+        engine (str): Engine parsing the database if it is not cached, see excel_cache
+
+    Returns:
+        pd.DataFrame: Tally material names and their stored carbon factors
+    """
+    stages_logger.info('Read stored carbon database.')
+    full_stored_bio_database = read_excel_sheet(stored_bio_database_path, 'csc', engine)
+    return full_stored_bio_database[['Name_Tally Material', 'Stored Carbon (C02eq/kg)']]
+
+
+def add_stored_carbon(tally_df: pd.DataFrame,
+                      stored_bio_data_short: pd.DataFrame) -> pd.DataFrame:
+    """Add the stored biogenic carbon of A1-A3 entries to a Tally model.
+
+    Args:
+        tally_df (pd.DataFrame): DataFrame of a cleaned Tally model
+        stored_bio_data_short (pd.DataFrame): Tally material names and stored carbon factors
+
+    Returns:
+        pd.DataFrame: Tally DataFrame with a Stored Biogenic Carbon column
+    """
+    stages_logger.info('Merge stored carbon database based on material name.')
+    merged_tally_df = tally_df.merge(
+        right=stored_bio_data_short,
+        left_on='Material Name',
+        right_on='Name_Tally Material',
+        how='left'
+    )
+
+    merged_tally_df['Stored Biogenic Carbon'] = 0.0
+
+    stages_logger.info('Calculate stored carbon for materials in A1-A3 stage')
+    merged_tally_df.loc[
+        (merged_tally_df['Life Cycle Stage'] == '[A1-A3] Product')
+        | (merged_tally_df['Life Cycle Stage'] == 'Product'),
+        'Stored Biogenic Carbon'
+    ] = merged_tally_df['Mass Total (kg)'] * merged_tally_df['Stored Carbon (C02eq/kg)']
+    return merged_tally_df
+
+
+# mapper class, filter classes of each step and output suffix of each mapping stage
+MAPPING_STAGES = {
+    'tally_elements': (TallyElementMapper, lambda: [tally_element_filters()], '_EleMapped'),
+    'oneclick_elements': (
+        OneClickElementMapper, lambda: [oneclick_element_filters()], '_EleMapped'
+    ),
+    'tally_materials': (TallyMaterialQuantityMapper, tally_material_filters, '_MatMapped'),
+    'oneclick_materials': (
+        OneClickMaterialQuantityMapper, oneclick_material_filters, '_MatMapped'
+    ),
+    'tally_elements_refined': (
+        TallyRefinedElementMapper, lambda: [refined_element_filters()], '_RefMapped'
+    ),
+    'oneclick_elements_refined': (
+        OneClickRefinedElementMapper, lambda: [refined_element_filters()], '_EleMapped'
+    ),
+}
+
+# directories of the models each mapping stage reads, relative to the main directory
+MAPPING_INPUT_DIRECTORIES = {
+    'tally_elements': 'data/lca_results/csc',
+    'oneclick_elements': 'data/lca_results/cleaned/oneclick',
+    'tally_materials': 'data/lca_results/element_mapped/tally',
+    'oneclick_materials': 'data/lca_results/element_mapped/oneclick',
+    'tally_elements_refined': 'data/lca_results/material_mapped/tally',
+    'oneclick_elements_refined': 'data/lca_results/material_mapped/oneclick',
+}
+
+
+def map_model(df: pd.DataFrame, stage: str, cache: ClassificationCache = None) -> pd.DataFrame:
+    """Map a model with the mapper and filter classes of a mapping stage.
+
+    A stage of several steps runs them with one mapper, filters are only reevaluated when
+    their column changes.
+
+    Args:
+        df (pd.DataFrame): DataFrame of a model
+        stage (str): Name of the mapping stage, a key of MAPPING_STAGES
+        cache (ClassificationCache): Results of known signatures, None to map every signature
+
+    Returns:
+        pd.DataFrame: Mapped DataFrame
+    """
+    mapper_class, filter_stages, _ = MAPPING_STAGES[stage]
+    if cache is not None:
+        return map_with_cache(df, mapper_class, filter_stages(), stage, cache)
+    Mapper = mapper_class(df, deduplicate=True)
+    filter_stages = filter_stages()
+    for step, filters in enumerate(filter_stages, 1):
+        stages_logger.info('%s: step %s of %s', stage, step, len(filter_stages))
+        Mapper.apply_filters(filters)
+    Mapper.unused_filters()
+    stages_logger.info('Predicate store: %s', Mapper.predicate_store.stats())
+    return Mapper.df
+
+
+def clean_tally_file(tally_file: Path, write_directory: Path,
+                     storage: TableStorage = None, report: RunReport = None) -> Path:
+    """Clean a raw Tally file and write it to the cleaned directory.
+
+    Args:
+        tally_file (Path): File path of the raw Tally model
+        write_directory (Path): Directory of cleaned Tally models
+        storage (TableStorage): Format of the files, csv if not given
+        report (RunReport): Report of the run, None to not measure the stage
+
+    Returns:
+        Path: File path of the cleaned Tally model
+    """
+    storage = storage or TableStorage()
+    stages_logger.info('Begin cleaning of %s', tally_file.stem)
+    with measure(report, 'clean_tally', tally_file.stem) as measurement:
+        raw_df = gen.read_csv(tally_file, dtype=storage.column_dtypes)
+        measurement.rows_in = len(raw_df)
+        tally_df = clean_tally(raw_df, tally_file)
+        measurement.rows_out = len(tally_df)
+        write_path = storage.write(tally_df, write_directory, tally_file.stem, index=True)
+    stages_logger.info('End cleaning of %s', tally_file.stem)
+    return write_path
+
+
+def clean_oneclick_file(oneclick_file: Path, write_directory: Path,
+                        storage: TableStorage = None, report: RunReport = None) -> Path:
+    """Clean a raw One Click file and write it to the cleaned directory.
+
+    Args:
+        oneclick_file (Path): File path of the raw One Click model
+        write_directory (Path): Directory of cleaned One Click models
+        storage (TableStorage): Format of the files, csv if not given
+        report (RunReport): Report of the run, None to not measure the stage
+
+    Returns:
+        Path: File path of the cleaned One Click model
+    """
+    storage = storage or TableStorage()
+    stages_logger.info('Begin cleaning of %s', oneclick_file.stem)
+    with measure(report, 'clean_oneclick', oneclick_file.stem) as measurement:
+        raw_df = clean_util.read_excel(oneclick_file, storage.excel_engine)
+        measurement.rows_in = len(raw_df)
+        oneclick_df = clean_oneclick(raw_df, oneclick_file)
+        measurement.rows_out = len(oneclick_df)
+        write_path = storage.write(oneclick_df, write_directory, oneclick_file.stem, index=True)
+    stages_logger.info('End cleaning of %s', oneclick_file.stem)
+    return write_path
+
+
+def add_stored_carbon_file(tally_file: Path, write_directory: Path,
+                           stored_bio_data_short: pd.DataFrame,
+                           storage: TableStorage = None,
+                           report: RunReport = None) -> Path:
+    """Add stored carbon to a cleaned Tally file and write it to the csc directory.
+
+    Args:
+        tally_file (Path): File path of the cleaned Tally model
+        write_directory (Path): Directory of Tally models with stored carbon
+        stored_bio_data_short (pd.DataFrame): Tally material names and stored carbon factors
+        storage (TableStorage): Format of the files, csv if not given
+        report (RunReport): Report of the run, None to not measure the stage
+
+    Returns:
+        Path: File path of the Tally model with stored carbon
+    """
+    storage = storage or TableStorage()
+    stages_logger.info('Begin adding stored carbon to %s', tally_file.name)
+    with measure(report, 'add_stored_carbon', tally_file.stem) as measurement:
+        tally_df = storage.read(tally_file)
+        measurement.rows_in = len(tally_df)
+        tally_df = add_stored_carbon(tally_df, stored_bio_data_short)
+        measurement.rows_out = len(tally_df)
+        write_path = storage.write(
+            tally_df, write_directory, f'{tally_file.stem}_csc', index=True
+        )
+    stages_logger.info('Added stored carbon to %s', tally_file.name)
+    return write_path
+
+
+def map_model_file(file: Path, write_directory: Path, stage: str,
+                   storage: TableStorage = None, cache: ClassificationCache = None,
+                   report: RunReport = None) -> Path:
+    """Map a model file with a mapping stage and write it to the directory of the stage.
+
+    Args:
+        file (Path): File path of the model, in the input directory of the stage
+        write_directory (Path): Directory of the mapped models
+        stage (str): Name of the mapping stage, a key of MAPPING_STAGES
+        storage (TableStorage): Format of the files, csv if not given
+        cache (ClassificationCache): Results of known signatures, None to map every signature
+        report (RunReport): Report of the run, None to not measure the stage
+
+    Returns:
+        Path: File path of the mapped model
+    """
+    storage = storage or TableStorage()
+    _, _, suffix = MAPPING_STAGES[stage]
+    stages_logger.info('Begin %s mapping of %s', stage, file.name)
+    with measure(report, stage, file.stem) as measurement:
+        df = storage.read(file)
+        measurement.rows_in = len(df)
+        df = map_model(df, stage, cache)
+        measurement.rows_out = len(df)
+        write_path = storage.write(df, write_directory, f'{file.stem}{suffix}')
+    stages_logger.info('End %s mapping of %s', stage, file.name)
+    return write_path
+
+
+def map_files_batched(files: List[Path], write_directory: Path, stage: str,
+                      storage: TableStorage = None, cache: ClassificationCache = None,
+                      report: RunReport = None) -> List[Path]:
+    """Map the model files of a tool in one pass of the filter classes and write each of them.
+
+    Gives the same files as map_model_file applied to each file, but the filters are
+    evaluated once for the signatures of all models instead of once per model.
+
+    Args:
+        files (List[Path]): File paths of the models
+        write_directory (Path): Directory of the mapped models
+        stage (str): Name of the mapping stage, a key of MAPPING_STAGES
+        storage (TableStorage): Format of the files, csv if not given
+        cache (ClassificationCache): Results of known signatures, None to map every signature
+        report (RunReport): Report of the run, None to not measure the stage
+
+    Returns:
+        List[Path]: File path of each mapped model in the order of files
+    """
+    storage = storage or TableStorage()
+    mapper_class, filter_stages, suffix = MAPPING_STAGES[stage]
+    stages_logger.info('Begin batch mapping of %s for %s files', stage, len(files))
+    with measure(report, f'{stage}_batch') as measurement:
+        dfs = [storage.read(file) for file in files]
+        measurement.rows_in = sum(len(df) for df in dfs)
+        dfs = map_models(dfs, mapper_class, filter_stages(), stage, cache)
+        measurement.rows_out = sum(len(df) for df in dfs)
+        return [
+            storage.write(df, write_directory, f'{file.stem}{suffix}')
+            for file, df in zip(files, dfs)
+        ]
+
+
+def combine_models(dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    """Combine the models of a tool into one DataFrame.
+
+    Args:
+        dfs (List[pd.DataFrame]): DataFrames of refined element mapped models
+
+    Returns:
+        pd.DataFrame: Combined DataFrame, with the labels of the enum columns
+    """
+    return pd.concat([decode_enum_columns(df) for df in dfs])
+
+
+def combine_model_files(files: List[Path], write_directory: Path, file_name: str,
+                        storage: TableStorage) -> int:
+    """Combine the model files of a tool into one file, holding one model at a time.
+
+    Writes the same table as combine_models of every model. The models are read once to
+    find the columns and dtypes of the combined table, with the columns some models do not
+    have, and for the columnar formats the column types and categories of the whole table.
+    They are then read again and appended to the combined file one at a time, with the
+    missing columns filled with NaN, so nothing but the combined file is written.
+
+    Args:
+        files (List[Path]): Refined element mapped model files
+        write_directory (Path): Directory to write the combined file to
+        file_name (str): File name of the combined file without suffix
+        storage (TableStorage): Format of the model files and of the combined file
+
+    Raises:
+        ValueError: Raised if there are no model files
+
+    Returns:
+        int: Number of rows of the combined file
+    """
+    if not files:
+        raise ValueError(f'No models to combine into {file_name}')
+    samples = []
+    kinds = ColumnKinds(storage.categorical_columns) if storage.is_columnar else None
+    rows = 0
+    for file in files:
+        df = decode_enum_columns(storage.read(file))
+        rows += len(df)
+        samples.append(_dtype_sample(df))
+        if kinds is not None:
+            kinds.update(df)
+    del df
+    # the dtypes pd.concat gives the whole table
+    dtypes = pd.concat(samples).dtypes.to_dict()
+
+    chunks = (
+        decode_enum_columns(storage.read(file)).reindex(columns=list(dtypes)).astype(dtypes)
+        for file in files
+    )
+    storage.write_chunks(chunks, write_directory, file_name, kinds)
+    stages_logger.info('Combined %s models with %s rows into %s.', len(files), rows, file_name)
+    return rows
+
+
+def _dtype_sample(df: pd.DataFrame) -> pd.DataFrame:
+    """Row of a model giving pd.concat the same dtypes as the whole model.
+
+    pd.concat leaves columns with missing values only out when finding the dtype of a
+    column, so each column of the row holds its first value that is not missing.
+
+    Args:
+        df (pd.DataFrame): DataFrame of a model
+
+    Returns:
+        pd.DataFrame: One row with the columns and dtypes of df, no rows if df has none
+    """
+    if df.empty:
+        return df.iloc[:0]
+    positions = df.notna().to_numpy().argmax(axis=0)
+    sample = df.iloc[[0]].reset_index(drop=True)
+    for column in np.flatnonzero(positions):
+        sample.isetitem(column, df.iloc[[positions[column]], column].array)
+    return sample
+
+
+def read_harmonize_config(config_path: Path) -> dict:
+    """Read and check the harmonization config.
+
+    Args:
+        config_path (Path): File path of config_harmonize.yml
+
+    Returns:
+        dict: harmonization config
+    """
+    config = gen.read_yaml(config_path)
+    assert config is not None, 'The config dictionary could not be set'
+
+    column_removal_tally = config.get('column_removal_tally')
+    assert column_removal_tally is not None, 'The list for column removal for Tally could not \
+be set'
+
+    column_rename_tally = config.get('column_rename_tally')
+    assert column_rename_tally is not None, 'The dict for column renaming for Tally could not \
+be set'
+
+    column_removal_oneclick = config.get('column_removal_oneclick')
+    assert column_removal_oneclick is not None, 'The list for column removal for One Click \
+could not be set'
+
+    column_rename_oneclick = config.get('column_rename_oneclick')
+    assert column_rename_oneclick is not None, 'The dict for column renaming for One Click \
+could not be set'
+
+    column_null_replacement = config.get('column_null_replacement')
+    assert column_null_replacement is not None, 'The list for column null replacement \
+could not be set'
+    return config
+
+
+def harmonize_models(combined_tally: pd.DataFrame, combined_oneclick: pd.DataFrame,
+                     config: dict) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Harmonize combined tally and one click models.
+
+    Args:
+        combined_tally (pd.DataFrame): Combined Tally models
+        combined_oneclick (pd.DataFrame): Combined One Click models
+        config (dict): harmonization config
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: harmonized Tally models, harmonized
+            One Click models and both of them combined
+    """
+    # get the combined sets of columns to drop
+    tally_columns_to_drop = list(
+        set(combined_tally.columns.to_list()) & set(config.get('column_removal_tally'))
+    )
+    oneclick_columns_to_drop = list(
+        set(combined_oneclick.columns.to_list()) & set(config.get('column_removal_oneclick'))
+    )
+
+    # rename, drop, and set index for tally and one click
+    stages_logger.info('Rename, drop, and set index of tally and oneclick files.')
+    combined_tally_adjusted = (combined_tally
+                               .rename(columns=config.get('column_rename_tally'))
+                               .drop(columns=tally_columns_to_drop)
+                               .set_index('CLF Model ID')
+                               )
+    combined_oneclick_adjusted = (combined_oneclick
+                                  .rename(columns=config.get('column_rename_oneclick'))
+                                  .drop(columns=oneclick_columns_to_drop)
+                                  .set_index('CLF Model ID')
+                                  )
+
+    # replace values for tally and one click
+    stages_logger.info('Replace values for tally and oneclick files.')
+    for df_key, value_to_replace_dict in config.get('column_value_replace_oneclick').items():
+        combined_oneclick_adjusted[df_key] = \
+            combined_oneclick_adjusted[df_key].replace(value_to_replace_dict)
+    for df_key, value_to_replace_dict in config.get('column_value_replace_tally').items():
+        combined_tally_adjusted[df_key] = \
+            combined_tally_adjusted[df_key].replace(value_to_replace_dict)
+
+    # fill nulls in impacts & other values
+    stages_logger.info('Fill null values for impacts and mess for tally and oneclick files.')
+    for col_null_replace in config.get('column_null_replacement'):
+        combined_oneclick_adjusted[col_null_replace] = \
+            combined_oneclick_adjusted[col_null_replace].fillna(0)
+    for col_null_replace in config.get('column_null_replacement'):
+        combined_tally_adjusted[col_null_replace] = \
+            combined_tally_adjusted[col_null_replace].fillna(0)
+
+    # combine the raw wblca output files
+    stages_logger.info('Concatenate tally and oneclick files.')
+    combined_raw_wblca_output = pd.concat(
+        [combined_tally_adjusted, combined_oneclick_adjusted],
+        join='outer'
+    )
+    return combined_tally_adjusted, combined_oneclick_adjusted, combined_raw_wblca_output
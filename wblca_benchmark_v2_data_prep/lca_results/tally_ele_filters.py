@@ -1,6 +1,7 @@
 # pylint: disable=C0103, W0718
 """Defines Tally Filter classes to update values in CLF Omni Column"""
 from typing import Dict
+import numpy as np
 import pandas as pd
 from wblca_benchmark_v2_data_prep.lca_results.abstract_filters import AbstractFilter
 from wblca_benchmark_v2_data_prep.lca_results.enums import \
@@ -11,7 +12,7 @@ class Ceilings(AbstractFilter):
     """Methods to update CLF Omni column for ceiling entries"""
 
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.UNKNOWN.value,
@@ -149,7 +150,7 @@ class Ceilings(AbstractFilter):
 class CurtainWallPanels(AbstractFilter):
     """Methods to update CLF Omni column for curtain wall panel entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.UNKNOWN.value,
@@ -217,7 +218,7 @@ class CurtainWallPanels(AbstractFilter):
 class CurtainWallMullions(AbstractFilter):
     """Methods to update CLF Omni column for curtain wall mullion entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.UNKNOWN.value,
@@ -268,7 +269,7 @@ class CurtainWallMullions(AbstractFilter):
 class Doors(AbstractFilter):
     """Methods to update CLF Omni column for door entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.UNKNOWN.value,
@@ -337,7 +338,7 @@ class Doors(AbstractFilter):
 class Floors(AbstractFilter):
     """Methods to update CLF Omni column for floor entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.SUPERSTRUCTURE.value,
@@ -471,7 +472,7 @@ class Floors(AbstractFilter):
 class Roofs(AbstractFilter):
     """Methods to update CLF Omni column for roof entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.UNKNOWN.value,
@@ -555,7 +556,7 @@ class Roofs(AbstractFilter):
 class Railings(AbstractFilter):
     """Methods to update CLF Omni column for railing entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.SUPERSTRUCTURE.value,
@@ -579,7 +580,7 @@ class Railings(AbstractFilter):
 class Stairs(AbstractFilter):
     """Methods to update CLF Omni column for stair entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.SUPERSTRUCTURE.value,
@@ -594,7 +595,7 @@ class Stairs(AbstractFilter):
 class StructuralColumns(AbstractFilter):
     """Methods to update CLF Omni column for structural column entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.SUPERSTRUCTURE.value,
@@ -627,7 +628,7 @@ class StructuralColumns(AbstractFilter):
 class StructuralConnections(AbstractFilter):
     """Methods to update CLF Omni column for structural connection entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.SUPERSTRUCTURE.value,
@@ -642,7 +643,7 @@ class StructuralConnections(AbstractFilter):
 class StructuralFoundations(AbstractFilter):
     """Methods to update CLF Omni column for structural foundation entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.SUBSTRUCTURE.value,
@@ -657,7 +658,7 @@ class StructuralFoundations(AbstractFilter):
 class StructuralFraming(AbstractFilter):
     """Methods to update CLF Omni column for structural framing entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.SUPERSTRUCTURE.value,
@@ -690,7 +691,7 @@ class StructuralFraming(AbstractFilter):
 class Walls(AbstractFilter):
     """Methods to update CLF Omni column for wall entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         # then adjust CLF Omni
         self.and_loc(
             df=df,
@@ -889,7 +890,7 @@ class Walls(AbstractFilter):
 class Windows(AbstractFilter):
     """Methods to update CLF Omni column for window entries"""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=OmniClassLevelOne.ENCLOSURE.value,
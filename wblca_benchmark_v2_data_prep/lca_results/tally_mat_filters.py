@@ -1,6 +1,7 @@
 # pylint: disable=C0103, W0718
 """Defines Tally Filter classes to update values in Material Quantity Columns"""
 from typing import Dict
+import numpy as np
 import pandas as pd
 from wblca_benchmark_v2_data_prep.lca_results.abstract_filters import AbstractFilter
 from wblca_benchmark_v2_data_prep.lca_results.enums import \
@@ -10,7 +11,7 @@ from wblca_benchmark_v2_data_prep.lca_results.enums import \
 class ConcreteMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Concrete entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.CONCRETE.value,
@@ -38,7 +39,7 @@ class ConcreteMaterialQuantityOne(AbstractFilter):
 class SteelMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Steel entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.STEEL.value,
@@ -129,11 +130,12 @@ class SteelMaterialQuantityOne(AbstractFilter):
 class MasonryMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Masonry entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('stone_cat_mat_two'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.MASONRY.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.MASONRY.value,
+            loc_filter=all_filters.get('stone_cat_mat_two')
+        )
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.MASONRY.value,
@@ -159,11 +161,12 @@ class MasonryMaterialQuantityOne(AbstractFilter):
 class AluminumMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Aluminum entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('aluminum_cat_mat_three'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.ALUMINUM.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.ALUMINUM.value,
+            loc_filter=all_filters.get('aluminum_cat_mat_three')
+        )
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.OTHER.value,
@@ -207,32 +210,35 @@ class AluminumMaterialQuantityOne(AbstractFilter):
                 all_filters.get('extru_cat_mat_three'),
             ]
         )
-        df.loc[
-            all_filters.get('alum_mull_sys_cat_mat_five'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.OTHER.value
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.OTHER.value,
+            loc_filter=all_filters.get('alum_mull_sys_cat_mat_five')
+        )
         return df
 
 
 class WoodMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Wood entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('wood_cat_mat_two'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.WOOD.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.WOOD.value,
+            loc_filter=all_filters.get('wood_cat_mat_two')
+        )
         return df
 
 
 class GlazingMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Glazing entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('glazing_cat_mat_two'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.GLAZING.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.GLAZING.value,
+            loc_filter=all_filters.get('glazing_cat_mat_two')
+        )
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.OTHER.value,
@@ -255,11 +261,12 @@ class GlazingMaterialQuantityOne(AbstractFilter):
 class RoofMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Roofing entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('roof_mem_cat_mat_two'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.ROOF.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.ROOF.value,
+            loc_filter=all_filters.get('roof_mem_cat_mat_two')
+        )
         self.or_loc(
             df=df,
             result=MaterialQuantityOne.ROOF.value,
@@ -350,11 +357,12 @@ class RoofMaterialQuantityOne(AbstractFilter):
 class InsulationMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Insulation entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('insulation_cat_mat_two'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.INSULATION.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.INSULATION.value,
+            loc_filter=all_filters.get('insulation_cat_mat_two')
+        )
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.OTHER.value,
@@ -372,11 +380,12 @@ class InsulationMaterialQuantityOne(AbstractFilter):
 class GypsumMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Gypsum entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('plaster_cat_mat_two'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.GYPSUM.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.GYPSUM.value,
+            loc_filter=all_filters.get('plaster_cat_mat_two')
+        )
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.GYPSUM.value,
@@ -392,11 +401,12 @@ class GypsumMaterialQuantityOne(AbstractFilter):
 class FireproofMaterialQuantityOne(AbstractFilter):
     """Method to update MQ_1 column for Fireproof entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('fireproof_cat_mat_two'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.FIREPROOF.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.FIREPROOF.value,
+            loc_filter=all_filters.get('fireproof_cat_mat_two')
+        )
         return df
 
 
@@ -406,7 +416,7 @@ class DoorFrameMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.DOOR_FRAME.value,
@@ -418,10 +428,11 @@ class DoorFrameMaterialQuantityOneOther(AbstractFilter):
                 all_filters.get('opening_hardware_cat_mat_two'),
             ]
         )
-        df.loc[
-            all_filters.get('door_cat_ele_four'),
-            self.column_name_to_change
-        ] = MaterialQuantityOne.DOOR_FRAME.value
+        self.loc(
+            df=df,
+            result=MaterialQuantityOne.DOOR_FRAME.value,
+            loc_filter=all_filters.get('door_cat_ele_four')
+        )
         return df
 
 
@@ -431,7 +442,7 @@ class WindowFrameMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.WINDOW_FRAME.value,
@@ -452,7 +463,7 @@ class AcousticCeilingsMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.ACOUSTIC_CEILINGS.value,
@@ -470,7 +481,7 @@ class SyntheticCompositesMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.SYNTH_COMP.value,
@@ -491,7 +502,7 @@ class CladdingMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.CLADDING.value,
@@ -568,7 +579,7 @@ class AdhesivesMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.ADHES_SEAL.value,
@@ -589,7 +600,7 @@ class AirVaporMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.AIR_VAPOR.value,
@@ -619,7 +630,7 @@ class CoatingsMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.COATINGS.value,
@@ -654,7 +665,7 @@ class FloorTileMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.FLOOR.value,
@@ -675,7 +686,7 @@ class OtherMetalsMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityOne.OTH_METALS.value,
@@ -701,7 +712,7 @@ class WallCoveringsMaterialQuantityOneOther(AbstractFilter):
     This must be implemented after the first set of MQ_1 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityOne.WALL_COVERINGS.value,
@@ -727,7 +738,7 @@ class WallCoveringsMaterialQuantityOneOther(AbstractFilter):
 class ConcreteMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Aluminum entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.READY_MIX_OTHER.value,
@@ -876,7 +887,7 @@ class ConcreteMaterialQuantityTwo(AbstractFilter):
 class SteelMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Glazing entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityTwo.HOT_ROLLED.value,
@@ -981,7 +992,7 @@ class SteelMaterialQuantityTwo(AbstractFilter):
 class MasonryMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Gypsum entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.CMU.value,
@@ -1074,7 +1085,7 @@ class MasonryMaterialQuantityTwo(AbstractFilter):
 class AluminumMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Insulation entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.EXTRUSION.value,
@@ -1099,7 +1110,7 @@ class AluminumMaterialQuantityTwo(AbstractFilter):
 class WoodMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Roofing entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.HEAVY_TIMBER.value,
@@ -1205,7 +1216,7 @@ class WoodMaterialQuantityTwo(AbstractFilter):
 class GlazingMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Glazing entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.IGU.value,
@@ -1220,11 +1231,12 @@ class GlazingMaterialQuantityTwo(AbstractFilter):
 class GypsumMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Gypsum entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
-        df.loc[
-            all_filters.get('gypsum_mq_one'),
-            self.column_name_to_change
-        ] = MaterialQuantityTwo.INT_GYPSUM.value
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
+        self.loc(
+            df=df,
+            result=MaterialQuantityTwo.INT_GYPSUM.value,
+            loc_filter=all_filters.get('gypsum_mq_one')
+        )
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.GLASSMAT_SHEATHING.value,
@@ -1239,7 +1251,7 @@ class GypsumMaterialQuantityTwo(AbstractFilter):
 class InsulationMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Insulation entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.XPS.value,
@@ -1327,7 +1339,7 @@ class InsulationMaterialQuantityTwo(AbstractFilter):
 class RoofMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Roofing entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.BITUMEN.value,
@@ -1377,7 +1389,7 @@ class RoofMaterialQuantityTwo(AbstractFilter):
 class FireproofMaterialQuantityTwo(AbstractFilter):
     """Method to update MQ_2 column for Fireproof entries."""
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.CEMENTITIOUS.value,
@@ -1403,7 +1415,7 @@ class DoorFrameMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.ALUM_DOOR.value,
@@ -1468,7 +1480,7 @@ class WindowFrameMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_or_loc(
             df=df,
             result=MaterialQuantityTwo.ALUM_WINDOW.value,
@@ -1533,7 +1545,7 @@ class AcousticCeilingsMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.ACOUS_CEIL_FIBER.value,
@@ -1588,7 +1600,7 @@ class SyntheticCompositesMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         return df
 
 
@@ -1598,7 +1610,7 @@ class CladdingMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.ACM.value,
@@ -1711,7 +1723,7 @@ class AdhesivesMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         return df
 
 
@@ -1721,7 +1733,7 @@ class AirVaporMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         return df
 
 
@@ -1731,7 +1743,7 @@ class CoatingsMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.PAINT.value,
@@ -1758,7 +1770,7 @@ class FloorTileMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.CARPET.value,
@@ -1811,7 +1823,7 @@ class OtherMetalsMaterialQuantityTwoOther(AbstractFilter):
     This must be implemented after the first set of MQ_2 values are run.
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.BRASS.value,
@@ -1871,7 +1883,7 @@ class FinalOtherMaterialQuantityTwoOther(AbstractFilter):
     based on the MQ_1 value
     """
     def filtering(self, df: pd.DataFrame,
-                  all_filters: Dict[str, pd.Series]) -> pd.DataFrame:
+                  all_filters: Dict[str, np.ndarray]) -> pd.DataFrame:
         self.and_loc(
             df=df,
             result=MaterialQuantityTwo.CONCRETE_OTHER.value,
@@ -3,6 +3,7 @@ from pathlib import Path
 import logging
 import pandas as pd
 import yaml
+from wblca_benchmark_v2_data_prep.utils.general import parse_csv
 # pylint: disable=W0703, W0719
 
 general_logger = logging.getLogger('metadata.general')
@@ -24,9 +25,7 @@ def read_csv(file_path: Path) -> pd.DataFrame:
     """
     try:
         general_logger.info('Reading %s', file_path.stem)
-        df = pd.read_csv(
-            file_path,
-        )
+        df = parse_csv(file_path)
     except PermissionError as pe:
         general_logger.exception('Permission Error probably caused by having file open')
         raise PermissionError('Try closing out the file you are trying to read') from pe
@@ -1,9 +1,10 @@
 """Utility functions for src.data.merge."""
 from pathlib import Path
 from logging import getLogger
+from typing import Dict, Iterable, Tuple
 import pandas as pd
 from wblca_benchmark_v2_data_prep.metadata.general import read_csv
-# pylint: disable=W0703
+# pylint: disable=W0703, W0719
 
 merge_logger = getLogger('metadata.merge')
 
@@ -32,3 +33,86 @@ def read_energy_csv(file_path: Path) -> pd.DataFrame:
 
     merge_logger.info('Read %s and removed project and firm ids', file_path.stem)
     return df
+
+
+def index_dets(file_paths: Iterable[Path], project_file_suffix: str,
+               energy_file_suffix: str) -> Dict[str, Tuple[Path, Path]]:
+    """Pair the cleaned project and energy csv files of each firm by their file names.
+
+    Cleaned files are named after the firm followed by the project or energy suffix, so
+    files are paired without reading them.
+
+    Args:
+        file_paths (Iterable[Path]): file paths of cleaned csv files
+        project_file_suffix (str): end of the file names of cleaned project tabs
+        energy_file_suffix (str): end of the file names of cleaned energy tabs
+
+    Raises:
+        ValueError: Raised if a file is neither a project nor an energy tab, or if a firm
+            does not have both tabs
+
+    Returns:
+        Dict[str, Tuple[Path, Path]]: project and energy file paths by firm, sorted by firm
+    """
+    dets = {'project': {}, 'energy': {}}
+    unmatched = []
+    for file_path in sorted(file_paths):
+        if file_path.name.endswith(project_file_suffix):
+            dets['project'][file_path.name[:-len(project_file_suffix)]] = file_path
+        elif file_path.name.endswith(energy_file_suffix):
+            dets['energy'][file_path.name[:-len(energy_file_suffix)]] = file_path
+        else:
+            unmatched.append(file_path.name)
+    if unmatched:
+        merge_logger.error('Files are not project or energy tabs: %s', unmatched)
+        raise ValueError(f'Files are not project or energy tabs: {unmatched}')
+
+    missing = {
+        firm: [tab for tab, tab_dets in dets.items() if firm not in tab_dets]
+        for firm in dets['project'].keys() ^ dets['energy'].keys()
+    }
+    if missing:
+        merge_logger.error('Firms missing a tab: %s', missing)
+        raise ValueError(f'Firms missing a tab: {missing}')
+
+    merge_logger.info('Paired project and energy tabs of %s firms', len(dets['project']))
+    return {
+        firm: (dets['project'][firm], dets['energy'][firm])
+        for firm in sorted(dets['project'])
+    }
+
+
+def merge_dets(det_paths: Tuple[Path, Path]) -> pd.DataFrame:
+    """Merge the cleaned project and energy tabs of a firm.
+
+    Args:
+        det_paths (Tuple[Path, Path]): file paths of the cleaned project and energy csv
+
+    Raises:
+        ValueError: Raised if the tabs are of different firms
+        Exception: Raised if the tabs cannot be joined
+
+    Returns:
+        pd.DataFrame: DataFrame of the project tab joined with the energy tab by model
+    """
+    project_det, energy_det = det_paths
+    p_det_df = read_csv(project_det)
+    e_det_df = read_energy_csv(energy_det)
+    firm = p_det_df.attrs.get('name')
+    if e_det_df.attrs.get('name') != firm:
+        merge_logger.error(
+            '%s and %s are of different firms', project_det.name, energy_det.name
+        )
+        raise ValueError(f'{project_det.name} and {energy_det.name} are of different firms')
+
+    try:
+        merged_det = p_det_df.join(e_det_df)
+        merged_det.attrs = {
+            'name': firm
+        }
+    except Exception as e:
+        merge_logger.exception('Issue during joining')
+        raise Exception("Issue during joining") from e
+
+    merge_logger.info('Merged project and energy data entry templates of firm %s', firm)
+    return merged_det
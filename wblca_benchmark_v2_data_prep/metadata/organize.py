@@ -1,18 +1,21 @@
 """Utility functions of src.data.organize."""
 from pathlib import Path
 import logging
+from typing import Dict, List
 import pandas as pd
+import wblca_benchmark_v2_data_prep.utils.excel_cache as excel_cache
 # pylint: disable=W0703, W0719
 
 organize_logger = logging.getLogger('metadata.organize')
 
 
-def read_excel(file_path: Path, sheet_name: str) -> pd.DataFrame:
-    """Read raw Data Entry Templates excel files.
+def read_excel(file_path: Path, sheet_name: str, engine: str = None) -> pd.DataFrame:
+    """Read raw Data Entry Templates excel files, from the excel cache if they did not change.
 
     Args:
         file_path (Path): file path of raw data entry template
         sheet_name (str): Excel sheet name to read
+        engine (str): engine parsing the file if it is not cached, see excel_cache
 
     Raises:
         PermissionError: Raised if function does not have permission to access file
@@ -22,11 +25,32 @@ def read_excel(file_path: Path, sheet_name: str) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame of Excel sheet
     """
+    return read_excel_sheets(file_path, [sheet_name], engine)[sheet_name]
+
+
+def read_excel_sheets(file_path: Path, sheet_names: List[str],
+                      engine: str = None) -> Dict[str, pd.DataFrame]:
+    """Read sheets of a raw Data Entry Template, opening the workbook once for all of them.
+
+    Args:
+        file_path (Path): file path of raw data entry template
+        sheet_names (List[str]): Excel sheet names to read
+        engine (str): engine parsing the file if it is not cached, see excel_cache
+
+    Raises:
+        PermissionError: Raised if function does not have permission to access file
+        IOError: Raised if file cannot be read
+        Exception: General exception just in case
+
+    Returns:
+        Dict[str, pd.DataFrame]: DataFrame of each Excel sheet
+    """
     try:
         organize_logger.info('reading %s', file_path.stem)
-        df = pd.read_excel(
+        sheets = excel_cache.read_excel_sheets(
             file_path,
-            sheet_name=sheet_name
+            sheet_names,
+            engine=engine
         )
     except PermissionError as pe:
         organize_logger.exception('Permission Error probably caused by having file open')
@@ -37,7 +61,23 @@ def read_excel(file_path: Path, sheet_name: str) -> pd.DataFrame:
     except Exception as e:
         organize_logger.exception('Unknown error has occurred.')
         raise Exception("An unknown error has occured") from e
-    organize_logger.info('Read data from sheet %s from file %s', sheet_name, file_path.name)
+    for sheet_name, df in sheets.items():
+        organize_logger.info('Read data from sheet %s from file %s', sheet_name, file_path.name)
+        sheets[sheet_name] = _set_firm_name(df, file_path)
+    return sheets
+
+
+def _set_firm_name(df: pd.DataFrame, file_path: Path) -> pd.DataFrame:
+    """Set the firm name of a Data Entry Template sheet as the name attribute.
+
+    Args:
+        df (pd.DataFrame): Excel sheet of a raw data entry template
+        file_path (Path): file path of raw data entry template
+
+    Returns:
+        pd.DataFrame: the sheet, with the first two letters of the file name as firm name
+            if the sheet has no firm name
+    """
     try:
         df.attrs = {
             # hard coded value of the firm name
@@ -164,3 +204,74 @@ transpose for firm %s', df.attrs.get("name"))
         organize_logger.error(
             "Column Name issue after transpose for firm %s: %s", df.attrs.get('name'), column
         )
+
+
+def organize_sheet(df: pd.DataFrame, replacements_yaml: dict, sheet_config: dict) -> pd.DataFrame:
+    """Test, rename and transpose the project or energy sheet of a data entry template.
+
+    Args:
+        df (pd.DataFrame): raw data entry template sheet
+        replacements_yaml (dict): dictionary from the column name replacements yaml file
+        sheet_config (dict): project or energy config of 1_organize in config_metadata.yml
+
+    Returns:
+        pd.DataFrame: transposed data entry template
+    """
+    original_column_list = replacements_yaml.get(sheet_config.get('original_column_list'))
+    assert original_column_list is not None, 'The function was not able to read\
+the original column list'
+
+    # test column names
+    column_name_test(
+        df,
+        original_column_list
+    )
+
+    # replace column names
+    df = replace_columns(
+        df,
+        replacements_yaml,
+        sheet_config.get('replacement_list')
+    )
+
+    # transpose excel sheet
+    df1 = transpose_data(
+        df,
+        sheet_config.get('column_list_to_remove')
+    )
+
+    # recheck column names
+    column_name_after_transpose_test(
+        df1,
+        original_column_list
+    )
+    return df1
+
+
+def organize_workbook(file_path: Path, sheet_configs: Dict[str, dict], replacements_yaml: dict,
+                      engine: str = None) -> Dict[str, pd.DataFrame]:
+    """Organize the sheets of a data entry template, reading the workbook once.
+
+    Args:
+        file_path (Path): file path of raw data entry template
+        sheet_configs (Dict[str, dict]): config of each sheet to organize, e.g. project and
+            energy of 1_organize in config_metadata.yml
+        replacements_yaml (dict): dictionary from the column name replacements yaml file
+        engine (str): engine parsing the file if it is not cached, see excel_cache
+
+    Returns:
+        Dict[str, pd.DataFrame]: transposed data entry template of each sheet config
+    """
+    organize_logger.info('Begin organizing data entry template %s', file_path.stem)
+    sheets = read_excel_sheets(
+        file_path,
+        [sheet_config.get('sheet_name') for sheet_config in sheet_configs.values()],
+        engine
+    )
+    organized = {
+        key: organize_sheet(sheets[sheet_config.get('sheet_name')], replacements_yaml,
+                            sheet_config)
+        for key, sheet_config in sheet_configs.items()
+    }
+    organize_logger.info('End organizing data entry template %s', file_path.stem)
+    return organized
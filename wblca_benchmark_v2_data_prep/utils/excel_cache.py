@@ -0,0 +1,160 @@
+"""Keeps the parsed sheets of Excel workbooks next to them, so a workbook is parsed once."""
+import hashlib
+import importlib.util
+import os
+import pickle
+import threading
+from logging import getLogger
+from pathlib import Path
+from typing import Dict, List, Union
+import pandas as pd
+
+excel_cache_logger = getLogger('utils.excel_cache')
+
+# hidden directory of the cache next to the workbooks, left out by the globs of the stages
+EXCEL_CACHE_DIRECTORY = '.excel_cache'
+
+# engines of pd.read_excel and the module each one needs
+EXCEL_ENGINE_MODULES = {'openpyxl': 'openpyxl', 'calamine': 'python_calamine'}
+
+
+def excel_engine(engine: str = None) -> str:
+    """Engine used to parse workbooks that are not cached yet.
+
+    Args:
+        engine (str): openpyxl or calamine, None for the pandas default
+
+    Raises:
+        ValueError: Raised if the engine is not known
+
+    Returns:
+        str: the engine, None for the pandas default if the engine is not installed
+    """
+    if engine is None:
+        return None
+    if engine not in EXCEL_ENGINE_MODULES:
+        raise ValueError(
+            f'Unknown Excel engine {engine}, use one of {list(EXCEL_ENGINE_MODULES)}'
+        )
+    if importlib.util.find_spec(EXCEL_ENGINE_MODULES[engine]) is None:
+        excel_cache_logger.warning(
+            '%s is not installed, parsing workbooks with the pandas default.',
+            EXCEL_ENGINE_MODULES[engine]
+        )
+        return None
+    return engine
+
+
+def cache_path(file_path: Path, sheet_name: Union[str, int]) -> Path:
+    """File path of the cached sheet of a workbook.
+
+    Args:
+        file_path (Path): File path of the workbook
+        sheet_name (Union[str, int]): Name or position of the sheet
+
+    Returns:
+        Path: pickle file in the cache directory next to the workbook
+    """
+    sheet_hash = hashlib.sha256(repr(sheet_name).encode()).hexdigest()[:16]
+    return file_path.parent.joinpath(EXCEL_CACHE_DIRECTORY, f'{file_path.name}.{sheet_hash}.pkl')
+
+
+def read_excel_sheets(file_path: Path, sheet_names: List[Union[str, int]],
+                      engine: str = None) -> Dict[Union[str, int], pd.DataFrame]:
+    """Read sheets of a workbook, parsing the workbook only for the sheets not cached.
+
+    A cached sheet is used while the modification time and size of the workbook, the
+    engine and the pandas version are the ones it was parsed with. Sheets are stored as
+    pickles rather than parquet, as columns of Excel sheets often mix numbers, strings and
+    dates, which are given back as parsed. The sheets not cached are parsed in one pass and
+    written to the cache.
+
+    Args:
+        file_path (Path): File path of the workbook
+        sheet_names (List[Union[str, int]]): Names or positions of the sheets
+        engine (str): Engine parsing the workbook, see excel_engine
+
+    Returns:
+        Dict[Union[str, int], pd.DataFrame]: DataFrame of each sheet, like pd.read_excel
+    """
+    stat = file_path.stat()
+    key = {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'engine': engine,
+        'pandas': pd.__version__,
+    }
+    sheets = {}
+    for sheet_name in sheet_names:
+        cached = _read_cached(cache_path(file_path, sheet_name), {**key, 'sheet': sheet_name})
+        if cached is not None:
+            sheets[sheet_name] = cached
+    missing = [sheet_name for sheet_name in sheet_names if sheet_name not in sheets]
+    if not missing:
+        excel_cache_logger.info('Read %s from the Excel cache', file_path.name)
+        return sheets
+
+    parsed = pd.read_excel(file_path, sheet_name=missing, engine=engine)
+    for sheet_name, df in parsed.items():
+        _write_cached(cache_path(file_path, sheet_name), {**key, 'sheet': sheet_name}, df)
+    sheets.update(parsed)
+    return {sheet_name: sheets[sheet_name] for sheet_name in sheet_names}
+
+
+def read_excel_sheet(file_path: Path, sheet_name: Union[str, int] = 0,
+                     engine: str = None) -> pd.DataFrame:
+    """Read a sheet of a workbook from the cache, parsing the workbook if it changed.
+
+    Args:
+        file_path (Path): File path of the workbook
+        sheet_name (Union[str, int]): Name or position of the sheet, the first by default
+        engine (str): Engine parsing the workbook, see excel_engine
+
+    Returns:
+        pd.DataFrame: DataFrame of the sheet, like pd.read_excel
+    """
+    return read_excel_sheets(file_path, [sheet_name], engine)[sheet_name]
+
+
+def _read_cached(path: Path, key: dict) -> pd.DataFrame:
+    """Read a cached sheet if it was parsed from the same workbook.
+
+    Args:
+        path (Path): File path of the cached sheet
+        key (dict): Workbook modification time and size, engine, pandas version and sheet
+
+    Returns:
+        pd.DataFrame: the cached sheet, None if it is missing or out of date
+    """
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'rb') as file:
+            entry = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        excel_cache_logger.warning('Could not read the cached sheet %s, parsing it.', path.name)
+        return None
+    if entry.get('key') != key:
+        return None
+    return entry.get('df')
+
+
+def _write_cached(path: Path, key: dict, df: pd.DataFrame) -> None:
+    """Write a parsed sheet to the cache, replacing the previous entry of the sheet.
+
+    Args:
+        path (Path): File path of the cached sheet
+        key (dict): Workbook modification time and size, engine, pandas version and sheet
+        df (pd.DataFrame): Parsed sheet
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # written next to the entry and renamed, so parallel readers never see half of it
+        temporary_path = path.with_name(
+            f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp'
+        )
+        with open(temporary_path, 'wb') as file:
+            pickle.dump({'key': key, 'df': df}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+    except OSError:
+        excel_cache_logger.exception('Could not write the cached sheet %s', path.name)
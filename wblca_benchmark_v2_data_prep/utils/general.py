@@ -1,12 +1,21 @@
 """Utility functions for general use in general workflows."""
+import importlib.util
 from pathlib import Path
 from logging import getLogger
+from typing import Callable, Dict, List, Union
+import numpy as np
 import pandas as pd
 import yaml
 # pylint: disable=W0703, W0719
 
 general_logger = getLogger('utils.general')
 
+# strings read as missing values by pd.read_csv
+CSV_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
 
 def read_yaml(file_path: Path) -> dict:
     """Read yaml files for general use.
@@ -44,11 +53,21 @@ def read_yaml(file_path: Path) -> dict:
     return yaml_dict
 
 
-def read_csv(file_path: Path) -> pd.DataFrame:
+def read_csv(file_path: Path, usecols: Union[List[str], Callable[[str], bool]] = None,
+             dtype: Dict[str, str] = None) -> pd.DataFrame:
     """Read csv files for general use.
 
+    Files are parsed by the multithreaded csv reader of pyarrow when it is installed and by
+    pandas otherwise, giving the same DataFrame: numpy dtypes, object columns of strings and
+    NaN for missing values. Columns given a dtype are converted to it instead of inferring
+    their type; if a value does not convert, the types of the file are inferred.
+
     Args:
         file_path (Path): file path of csv to read
+        usecols (Union[List[str], Callable[[str], bool]]): columns to read, in the order of
+            the file, or a function giving True for them, None for every column
+        dtype (Dict[str, str]): float64, int64, bool or str for known columns, columns that
+            are not in the file are left out
 
     Raises:
         PermissionError: Raised if function does not have permission to access file
@@ -60,9 +79,7 @@ def read_csv(file_path: Path) -> pd.DataFrame:
     """
     try:
         general_logger.info('Reading %s', file_path.stem)
-        df = pd.read_csv(
-            file_path,
-        )
+        df = parse_csv(file_path, usecols, dtype)
     except PermissionError as pe:
         general_logger.exception('Permission Error probably caused by having file open')
         raise PermissionError('Try closing out the file you are trying to read') from pe
@@ -77,6 +94,118 @@ def read_csv(file_path: Path) -> pd.DataFrame:
     return df
 
 
+def parse_csv(file_path: Path, usecols: Union[List[str], Callable[[str], bool]] = None,
+              dtype: Dict[str, str] = None) -> pd.DataFrame:
+    """Parse a csv file with pyarrow if it is installed and can read it, with pandas otherwise.
+
+    Args:
+        file_path (Path): file path of csv to read
+        usecols (Union[List[str], Callable[[str], bool]]): columns to read, None for every
+            column
+        dtype (Dict[str, str]): dtypes of known columns, see read_csv
+
+    Returns:
+        pd.DataFrame: DataFrame of read csv file
+    """
+    dtype = dtype or {}
+    if importlib.util.find_spec('pyarrow') is not None:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        try:
+            return _read_csv_arrow(file_path, usecols, dtype)
+        except pa.ArrowInvalid:
+            general_logger.warning(
+                'pyarrow could not read %s as typed, reading it with pandas.', file_path.name
+            )
+    # round_trip parses floats to the nearest double like pyarrow, so both give the same values
+    try:
+        return pd.read_csv(
+            file_path, usecols=usecols, dtype=dtype or None, float_precision='round_trip'
+        )
+    except ValueError:
+        if not dtype:
+            raise
+        general_logger.warning(
+            'Values of %s do not match the known column types, inferring them.', file_path.name
+        )
+        return pd.read_csv(file_path, usecols=usecols, float_precision='round_trip')
+
+
+def _read_csv_arrow(file_path: Path, usecols: Union[List[str], Callable[[str], bool]],
+                    dtype: Dict[str, str]) -> pd.DataFrame:
+    """Read a csv file with the multithreaded csv reader of pyarrow like pd.read_csv does.
+
+    The header is read by pandas, so empty and repeated column names are named the same,
+    e.g. Unnamed: 3 and Mass.1. Dates and times stay strings as pandas does not parse them
+    unless asked to.
+
+    Args:
+        file_path (Path): file path of csv to read
+        usecols (Union[List[str], Callable[[str], bool]]): columns to read, None for every
+            column
+        dtype (Dict[str, str]): dtypes of known columns
+
+    Raises:
+        ValueError: Raised if a column of usecols is not in the file
+        ArrowInvalid: Raised if pyarrow cannot parse the file or convert a known column
+
+    Returns:
+        pd.DataFrame: DataFrame of read csv file
+    """
+    # pylint: disable=import-outside-toplevel
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    names = pd.read_csv(file_path, nrows=0).columns.to_list()
+    if callable(usecols):
+        usecols = [name for name in names if usecols(name)]
+    elif usecols is not None:
+        missing = set(usecols) - set(names)
+        if missing:
+            raise ValueError(f'Usecols do not match columns, columns expected but not found: '
+                             f'{sorted(missing)}')
+        usecols = [name for name in names if name in set(usecols)]
+    arrow_types = {'str': pa.string(), 'object': pa.string()}
+    column_types = {
+        name: arrow_types.get(kind) or pa.from_numpy_dtype(np.dtype(kind))
+        for name, kind in dtype.items() if name in names
+    }
+
+    def read(types: dict) -> pa.Table:
+        return pa_csv.read_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(column_names=names, skip_rows=1),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=types,
+                include_columns=usecols,
+                null_values=CSV_NA_VALUES,
+                true_values=['True', 'TRUE', 'true'],
+                false_values=['False', 'FALSE', 'false'],
+                strings_can_be_null=True,
+                quoted_strings_can_be_null=True
+            )
+        )
+
+    table = read(column_types)
+    temporal = {
+        field.name: pa.string() for field in table.schema if pa.types.is_temporal(field.type)
+    }
+    if temporal:
+        table = read({**column_types, **temporal})
+
+    df = table.to_pandas()
+    for field in table.schema:
+        if pa.types.is_null(field.type):
+            df[field.name] = np.nan
+        elif df[field.name].dtype == object and table.column(field.name).null_count:
+            # pyarrow gives None for missing strings and booleans, pandas NaN
+            values = df[field.name].to_numpy(dtype=object, copy=True)
+            values[pd.isna(values)] = np.nan
+            df[field.name] = values
+    return df
+
+
 def write_to_csv(df: pd.DataFrame, write_directory: Path,
                  file_name: str) -> None:
     """Write to csv for general use.
@@ -0,0 +1,218 @@
+"""Records the time, rows and memory of the stages of the scripts in a run report."""
+import json
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+from time import perf_counter
+from typing import Iterator, List
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    # resource is not available on Windows, peak RSS is then not recorded
+    resource = None
+
+instrumentation_logger = getLogger('utils.instrumentation')
+
+# file of the run report relative to the main directory
+RUN_REPORT_PATH = 'data/logs/run_report.jsonl'
+
+# measurements of the process that are still running, innermost last
+_running: List['StageMeasurement'] = []
+
+
+@dataclass
+class StageMeasurement():
+    """Time, rows and memory of a stage applied to a model.
+
+    The traced peak is only measured when tracemalloc is tracing, e.g. when the script is
+    run with python -X tracemalloc, as tracing slows the stages down. The RSS peak is the
+    peak of the process so far, so it covers the previous stages of a worker process too.
+
+    Attributes:
+        run (str): Start time of the run the stage belongs to
+        script (str): Script running the stage
+        stage (str): Name of the stage
+        model (str): Name of the model, None for stages of every model
+        rows_in (int): Rows read by the stage
+        rows_out (int): Rows written by the stage
+        started (str): Start time of the stage
+        seconds (float): Elapsed time of the stage
+        rows_per_second (float): Rows read per second, rows written if rows_in is not set
+        traced_peak_mb (float): Peak of the memory traced by tracemalloc during the stage
+        rss_peak_mb (float): Peak resident memory of the process at the end of the stage
+        pid (int): Id of the process running the stage
+    """
+    run: str
+    script: str
+    stage: str
+    model: str = None
+    rows_in: int = None
+    rows_out: int = None
+    started: str = None
+    seconds: float = None
+    rows_per_second: float = None
+    traced_peak_mb: float = None
+    rss_peak_mb: float = None
+    pid: int = None
+    _traced_peak: int = field(default=0, init=False, repr=False)
+
+
+@dataclass
+class RunReport():
+    """Machine readable report of the stages of a run, one json line per measurement.
+
+    Each process appends its measurements to the report file, so a report can be sent to
+    worker processes and shared by them. Measurements of every run are kept, the run
+    attribute tells them apart.
+
+    Attributes:
+        report_path (Path): File path of the json lines report
+        script (str): Script of the run
+        run (str): Start time of the run
+    """
+    report_path: Path
+    script: str
+    run: str = field(default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+
+    @classmethod
+    def for_script(cls, main_directory: Path, script: str) -> 'RunReport':
+        """Create the report of a script run in the logs directory.
+
+        Args:
+            main_directory (Path): Root directory of the repository
+            script (str): Name of the script, e.g. lca_results/1_clean
+
+        Returns:
+            RunReport: report of the run
+        """
+        report_path = main_directory.joinpath(RUN_REPORT_PATH)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        return cls(report_path, script)
+
+    @contextmanager
+    def measure(self, stage: str, model: str = None,
+                rows_in: int = None) -> Iterator[StageMeasurement]:
+        """Measure a stage and add it to the report.
+
+        Set rows_in and rows_out of the measurement inside the block when they are only
+        known there. The measurement is added even if the stage raises an exception.
+
+        Args:
+            stage (str): Name of the stage
+            model (str): Name of the model, None for stages of every model
+            rows_in (int): Rows read by the stage
+
+        Yields:
+            StageMeasurement: measurement of the stage
+        """
+        measurement = StageMeasurement(
+            run=self.run,
+            script=self.script,
+            stage=stage,
+            model=model,
+            rows_in=rows_in,
+            started=datetime.now().isoformat(timespec='seconds'),
+            pid=os.getpid()
+        )
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            _update_traced_peaks()
+            tracemalloc.reset_peak()
+        _running.append(measurement)
+        start = perf_counter()
+        try:
+            yield measurement
+        finally:
+            measurement.seconds = perf_counter() - start
+            if tracing:
+                _update_traced_peaks()
+                measurement.traced_peak_mb = measurement._traced_peak / 1e6
+            _running.remove(measurement)
+            rows = measurement.rows_in if measurement.rows_in is not None \
+                else measurement.rows_out
+            if rows is not None and measurement.seconds > 0:
+                measurement.rows_per_second = rows / measurement.seconds
+            measurement.rss_peak_mb = _rss_peak_mb()
+            self.record(measurement)
+
+    def record(self, measurement: StageMeasurement) -> None:
+        """Append a measurement to the report file.
+
+        Args:
+            measurement (StageMeasurement): measurement of a stage
+        """
+        record = {
+            key: value for key, value in asdict(measurement).items()
+            if not key.startswith('_')
+        }
+        instrumentation_logger.info(
+            '%s of %s took %.2f s.', measurement.stage, measurement.model or 'all models',
+            measurement.seconds
+        )
+        try:
+            # a single write per line, so lines of worker processes are not interleaved
+            with open(self.report_path, 'a', encoding='utf-8') as report_file:
+                report_file.write(json.dumps(record) + '\n')
+        except OSError:
+            instrumentation_logger.exception('Could not write to the run report')
+
+
+@contextmanager
+def measure(report: RunReport, stage: str, model: str = None,
+            rows_in: int = None) -> Iterator[StageMeasurement]:
+    """Measure a stage if a report is given.
+
+    Args:
+        report (RunReport): report of the run, None to run the stage without measuring it
+        stage (str): Name of the stage
+        model (str): Name of the model, None for stages of every model
+        rows_in (int): Rows read by the stage
+
+    Yields:
+        StageMeasurement: measurement of the stage, not recorded anywhere without a report
+    """
+    if report is None:
+        yield StageMeasurement(run=None, script=None, stage=stage, model=model,
+                               rows_in=rows_in)
+        return
+    with report.measure(stage, model, rows_in) as measurement:
+        yield measurement
+
+
+def read_run_report(report_path: Path) -> pd.DataFrame:
+    """Read the measurements of a run report.
+
+    Args:
+        report_path (Path): File path of the json lines report
+
+    Returns:
+        pd.DataFrame: One row per measurement
+    """
+    return pd.read_json(report_path, lines=True, dtype={'model': str, 'run': str})
+
+
+def _update_traced_peaks() -> None:
+    """Add the traced peak since the last reset to the running measurements."""
+    _, peak = tracemalloc.get_traced_memory()
+    for measurement in _running:
+        measurement._traced_peak = max(measurement._traced_peak, peak)
+
+
+def _rss_peak_mb() -> float:
+    """Peak resident memory of the process.
+
+    Returns:
+        float: peak in MB, None if it can not be measured on this platform
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
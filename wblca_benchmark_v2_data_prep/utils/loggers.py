@@ -1,12 +1,49 @@
 """Logging functions for preprocessing."""
 import logging
+import threading
 from logging import Logger
 from pathlib import Path
 
 
+class ThreadFilter(logging.Filter):
+    """Keeps the records logged by a thread and by the worker processes it started.
+
+    Worker processes set the parent_thread attribute of their records, see
+    parallel.map_files, so their records go to the log of the script that started them.
+
+    Attributes:
+        thread (int): Identifier of the thread
+    """
+    def __init__(self, thread: int):
+        super().__init__()
+        self.thread = thread
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return getattr(record, 'parent_thread', record.thread) == self.thread
+
+
+def _thread_of(handler: logging.Handler) -> int:
+    """Thread a handler was set up for by setup_logger.
+
+    Args:
+        handler (logging.Handler): Handler of the root logger
+
+    Returns:
+        int: Identifier of the thread, None for handlers set up otherwise
+    """
+    for handler_filter in handler.filters:
+        if isinstance(handler_filter, ThreadFilter):
+            return handler_filter.thread
+    return None
+
+
 def setup_logger(log_file_path: Path, level: str) -> Logger:
     """Create loggers in each method.
 
+    The log file only receives the records of the calling thread, so scripts run
+    concurrently in one process each write their own log, see orchestrator. The handlers
+    the thread set up before are closed and replaced, those of other threads are kept.
+
     Args:
         log_file_path (Path): Path of log
         level (str): Log level
@@ -38,7 +75,22 @@ def setup_logger(log_file_path: Path, level: str) -> Logger:
         filename=log_file_path,
         mode='w'
     )
-    logger.handlers = []
+    thread = threading.get_ident()
+    for handler in list(logger.handlers):
+        if _thread_of(handler) in (None, thread):
+            logger.removeHandler(handler)
+            handler.close()
+    output.addFilter(ThreadFilter(thread))
     output.setFormatter(typical_format)
     logger.addHandler(output)
     logger.setLevel(logging_level)
+
+
+def remove_thread_handlers() -> None:
+    """Close and remove the handlers setup_logger set up for the calling thread."""
+    logger = logging.getLogger()
+    thread = threading.get_ident()
+    for handler in list(logger.handlers):
+        if _thread_of(handler) == thread:
+            logger.removeHandler(handler)
+            handler.close()
@@ -0,0 +1,237 @@
+"""Skips model files a stage has already processed with the same inputs and rules."""
+import hashlib
+import json
+from dataclasses import dataclass, field
+from logging import getLogger
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+from wblca_benchmark_v2_data_prep.utils.parallel import map_files
+
+manifest_logger = getLogger('utils.manifest')
+
+MANIFEST_FILE_NAME = '.manifest.json'
+
+
+def file_hash(file_path: Path) -> str:
+    """Hash the content of a file.
+
+    Args:
+        file_path (Path): File to hash
+
+    Returns:
+        str: sha256 hex digest of the file
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def rules_hash(paths: Iterable[Path]) -> str:
+    """Hash the code and reference files that decide the output of a stage.
+
+    Args:
+        paths (Iterable[Path]): Files, and directories whose python files are all hashed
+
+    Returns:
+        str: sha256 hex digest of the files
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        files = sorted(path.rglob('*.py')) if path.is_dir() else [path]
+        for file in files:
+            digest.update(file.name.encode())
+            digest.update(file_hash(file).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class StageManifest():
+    """Input hash, rules hash and output of every model file a stage has processed.
+
+    The manifest is a json file in the write directory of the stage. A model file is
+    current if its content and the rules are the same as when its output was written and
+    the output still exists, in which case the stage reuses the output. Outputs of unchanged
+    models are unchanged as well, so the next stage skips them too.
+
+    Attributes:
+        write_directory (Path): Directory the stage writes its outputs to
+        rules (str): Hash of the code and reference files of the stage
+        entries (Dict[str, dict]): Record of each processed model file by file name
+    """
+    write_directory: Path
+    rules: str
+    entries: Dict[str, dict] = field(default_factory=dict, repr=False)
+
+    @property
+    def manifest_path(self) -> Path:
+        """Path: File path of the manifest."""
+        return self.write_directory.joinpath(MANIFEST_FILE_NAME)
+
+    @classmethod
+    def load(cls, write_directory: Path, rules: str) -> 'StageManifest':
+        """Read the manifest of a stage, or start an empty one.
+
+        Args:
+            write_directory (Path): Directory the stage writes its outputs to
+            rules (str): Hash of the code and reference files of the stage
+
+        Returns:
+            StageManifest: manifest of the stage
+        """
+        manifest = cls(write_directory, rules)
+        if manifest.manifest_path.exists():
+            try:
+                with open(manifest.manifest_path, 'r', encoding='utf-8') as file:
+                    manifest.entries = json.load(file)
+            except (IOError, ValueError):
+                manifest_logger.warning(
+                    'Could not read %s, processing every file.', manifest.manifest_path
+                )
+        return manifest
+
+    def _input_hash(self, file: Path) -> str:
+        """Hash of a model file, reusing the recorded hash if its size and time are unchanged.
+
+        Args:
+            file (Path): Model file read by the stage
+
+        Returns:
+            str: sha256 hex digest of the file
+        """
+        stat = file.stat()
+        entry = self.entries.get(file.name, {})
+        if entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return entry['input_hash']
+        return file_hash(file)
+
+    def is_current(self, file: Path) -> bool:
+        """Check if the recorded output of a model file can be reused.
+
+        Args:
+            file (Path): Model file read by the stage
+
+        Returns:
+            bool: True if the file and rules are unchanged and the output exists
+        """
+        entry = self.entries.get(file.name)
+        if entry is None or entry.get('rules_hash') != self.rules:
+            return False
+        if not self.write_directory.joinpath(entry['output']).exists():
+            return False
+        return entry.get('input_hash') == self._input_hash(file)
+
+    def output(self, file: Path) -> Path:
+        """Recorded output of a model file.
+
+        Args:
+            file (Path): Model file read by the stage
+
+        Returns:
+            Path: File path of the output
+        """
+        return self.write_directory.joinpath(self.entries[file.name]['output'])
+
+    def record(self, file: Path, output: Path) -> None:
+        """Record the output written for a model file.
+
+        Args:
+            file (Path): Model file read by the stage
+            output (Path): File path of the output written by the stage
+        """
+        stat = file.stat()
+        self.entries[file.name] = {
+            'input_hash': file_hash(file),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'rules_hash': self.rules,
+            'output': output.name,
+        }
+
+    def drop_missing(self, files: List[Path]) -> None:
+        """Forget model files that are no longer read by the stage.
+
+        Their outputs are left in place and logged, as the stages never delete files.
+
+        Args:
+            files (List[Path]): Model files read by the stage
+        """
+        names = {file.name for file in files}
+        for name in [name for name in self.entries if name not in names]:
+            manifest_logger.warning(
+                '%s was removed, its output %s is left in %s.',
+                name, self.entries[name]['output'], self.write_directory
+            )
+            del self.entries[name]
+
+    def save(self) -> None:
+        """Write the manifest next to the outputs of the stage."""
+        temporary_path = self.manifest_path.with_suffix('.tmp')
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file, indent=2, sort_keys=True)
+        temporary_path.replace(self.manifest_path)
+
+
+def map_changed_files(function: Callable[..., Path], files: Iterable[Path],
+                      manifest: StageManifest, workers: int = 1, **kwargs) -> List[Path]:
+    """Apply a stage to the model files that changed since the stage last ran.
+
+    Args:
+        function (Callable[..., Path]): Module level function taking a file as first argument
+            and returning the file path of its output
+        files (Iterable[Path]): Model files to process
+        manifest (StageManifest): Manifest of the stage
+        workers (int): Number of worker processes, 1 to process files one at a time
+        **kwargs: Keyword arguments passed to the function for every file
+
+    Returns:
+        List[Path]: Output of each file in sorted order, reused or written
+    """
+    files = sorted(files)
+    changed = _changed_files(files, manifest)
+    for file, output in zip(changed, map_files(function, changed, workers, **kwargs)):
+        manifest.record(file, output)
+    manifest.save()
+    return [manifest.output(file) for file in files]
+
+
+def map_changed_files_batched(function: Callable[..., List[Path]], files: Iterable[Path],
+                              manifest: StageManifest, **kwargs) -> List[Path]:
+    """Apply a stage to all the model files that changed since the stage last ran at once.
+
+    Args:
+        function (Callable[..., List[Path]]): Function taking a list of files as first
+            argument and returning the file path of the output of each of them
+        files (Iterable[Path]): Model files to process
+        manifest (StageManifest): Manifest of the stage
+        **kwargs: Keyword arguments passed to the function
+
+    Returns:
+        List[Path]: Output of each file in sorted order, reused or written
+    """
+    files = sorted(files)
+    changed = _changed_files(files, manifest)
+    if changed:
+        for file, output in zip(changed, function(changed, **kwargs)):
+            manifest.record(file, output)
+    manifest.save()
+    return [manifest.output(file) for file in files]
+
+
+def _changed_files(files: List[Path], manifest: StageManifest) -> List[Path]:
+    """Model files whose recorded output cannot be reused.
+
+    Args:
+        files (List[Path]): Model files to process, in sorted order
+        manifest (StageManifest): Manifest of the stage
+
+    Returns:
+        List[Path]: Model files to process again
+    """
+    manifest.drop_missing(files)
+    changed = [file for file in files if not manifest.is_current(file)]
+    manifest_logger.info(
+        '%s of %s files changed for %s.', len(changed), len(files), manifest.write_directory
+    )
+    return changed
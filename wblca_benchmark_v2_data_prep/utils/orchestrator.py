@@ -0,0 +1,328 @@
+"""Runs the scripts of the pipelines as a graph of stages in one process."""
+import runpy
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Iterable, List, Set
+from wblca_benchmark_v2_data_prep.utils.loggers import remove_thread_handlers
+
+orchestrator_logger = getLogger('utils.orchestrator')
+
+# directory of the stamps of the stages relative to the main directory
+STAMP_DIRECTORY = 'data/logs/stages'
+
+
+@dataclass
+class Stage():
+    """Script of a pipeline with the files it reads and writes.
+
+    Inputs and outputs are files or directories relative to the main directory. A stage
+    runs after the stages writing one of its inputs.
+
+    Attributes:
+        name (str): Name of the stage, e.g. lca_results/1_clean
+        module (str): Module of the script run as __main__
+        inputs (List[str]): Files and directories read by the stage, including its code
+        outputs (List[str]): Files and directories written by the stage
+    """
+    name: str
+    module: str
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+
+    def reads_from(self, other: 'Stage') -> bool:
+        """Check if the stage reads a file or directory the other stage writes.
+
+        Args:
+            other (Stage): Stage that may write an input of the stage
+
+        Returns:
+            bool: True if an input and an output are the same or one contains the other
+        """
+        return any(
+            _contains(output, stage_input) or _contains(stage_input, output)
+            for output in other.outputs for stage_input in self.inputs
+        )
+
+
+@dataclass
+class StageGraph():
+    """Stages of the pipelines ordered by the files they read and write.
+
+    Stages run in threads of one process as soon as the stages they read from are done,
+    so independent pipelines overlap. A stage is up to date, and skipped, when its stamp
+    is newer than all of its inputs and its outputs exist. Stages that fail are logged and
+    the stages reading from them are not run; the other branches carry on.
+
+    Scripts share the process, so they should not change global state other than the
+    loggers, which setup_logger keeps apart by thread. Traced peaks of the run report
+    cover every stage running at the same time.
+
+    Attributes:
+        main_directory (Path): Root directory of the repository
+        stages (List[Stage]): Stages of the graph
+        jobs (int): Number of stages run at the same time
+    """
+    main_directory: Path
+    stages: List[Stage] = field(repr=False)
+    jobs: int = 4
+    _upstream: Dict[str, Set[str]] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        names = [stage.name for stage in self.stages]
+        if len(set(names)) != len(names):
+            raise ValueError('Stage names must be unique')
+        self._upstream = {
+            stage.name: {
+                other.name for other in self.stages
+                if other is not stage and stage.reads_from(other)
+            }
+            for stage in self.stages
+        }
+        self.order(names)
+
+    def order(self, names: Iterable[str]) -> List[str]:
+        """Sort stages so each stage comes after the stages it reads from.
+
+        Args:
+            names (Iterable[str]): Names of the stages to sort
+
+        Raises:
+            ValueError: Raised if the stages read from each other in a cycle
+
+        Returns:
+            List[str]: Names of the stages in the order of the graph
+        """
+        names = set(names)
+        remaining = [stage.name for stage in self.stages if stage.name in names]
+        ordered = []
+        while remaining:
+            ready = [
+                name for name in remaining
+                if not self._upstream[name].intersection(remaining)
+            ]
+            if not ready:
+                raise ValueError(f'Stages read from each other in a cycle: {remaining}')
+            ordered.extend(ready)
+            remaining = [name for name in remaining if name not in ready]
+        return ordered
+
+    def select(self, targets: Iterable[str] = None, upstream: bool = True) -> List[str]:
+        """Stages needed to run some targets, with the stages they read from.
+
+        Args:
+            targets (Iterable[str]): Names or name prefixes of stages, e.g. metadata or
+                lca_results/7_harmonize, None for every stage
+            upstream (bool): Add the stages the targets read from, False to select the
+                targets only and read the files already written
+
+        Raises:
+            ValueError: Raised if a target matches no stage
+
+        Returns:
+            List[str]: Names of the stages in the order of the graph
+        """
+        if targets is None:
+            return self.order(stage.name for stage in self.stages)
+        selected = set()
+        for target in targets:
+            matched = [
+                stage.name for stage in self.stages
+                if stage.name == target or stage.name.startswith(target.rstrip('/') + '/')
+            ]
+            if not matched:
+                raise ValueError(f'No stage matches {target}')
+            selected.update(matched)
+        if not upstream:
+            return self.order(selected)
+        pending = list(selected)
+        while pending:
+            upstream = self._upstream[pending.pop()] - selected
+            selected.update(upstream)
+            pending.extend(upstream)
+        return self.order(selected)
+
+    def stamp_path(self, name: str) -> Path:
+        """File path of the stamp written when a stage succeeds.
+
+        Args:
+            name (str): Name of the stage
+
+        Returns:
+            Path: stamp file in the stamp directory
+        """
+        return self.main_directory.joinpath(STAMP_DIRECTORY, f'{name}.done')
+
+    def is_current(self, stage: Stage) -> bool:
+        """Check if a stage is up to date.
+
+        Args:
+            stage (Stage): Stage to check
+
+        Returns:
+            bool: True if the stamp of the stage is newer than its inputs and every output
+                exists
+        """
+        stamp_path = self.stamp_path(stage.name)
+        if not stamp_path.exists():
+            return False
+        if not all(self.main_directory.joinpath(output).exists() for output in stage.outputs):
+            return False
+        stamp_time = stamp_path.stat().st_mtime
+        return all(
+            _newest_mtime(self.main_directory.joinpath(stage_input)) <= stamp_time
+            for stage_input in stage.inputs
+        )
+
+    def run(self, targets: Iterable[str] = None, force: bool = False,
+            upstream: bool = True) -> List[str]:
+        """Run the stages that are not up to date.
+
+        Args:
+            targets (Iterable[str]): Names or name prefixes of the stages to run, with the
+                stages they read from, None for every stage
+            force (bool): Run the stages even if they are up to date
+            upstream (bool): Also run the stages the targets read from, see select
+
+        Raises:
+            RuntimeError: Raised after the other stages are done if a stage failed
+
+        Returns:
+            List[str]: Names of the stages that ran
+        """
+        names = self.select(targets, upstream)
+        stages = {stage.name: stage for stage in self.stages if stage.name in names}
+        upstream = {name: self._upstream[name].intersection(names) for name in names}
+        waiting = list(names)
+        running: Dict[Future, str] = {}
+        done, ran, failed = set(), [], []
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            while waiting or running:
+                for name in list(waiting):
+                    if upstream[name] & set(failed):
+                        orchestrator_logger.warning(
+                            'Skipping %s, a stage it reads from failed.', name
+                        )
+                        waiting.remove(name)
+                        failed.append(name)
+                    elif upstream[name] <= done:
+                        waiting.remove(name)
+                        # stages ran in this run have newer outputs, so is_current sees them
+                        if not force and self.is_current(stages[name]):
+                            orchestrator_logger.info('%s is up to date.', name)
+                            done.add(name)
+                        else:
+                            orchestrator_logger.info('Start %s.', name)
+                            running[executor.submit(self._run_stage, stages[name])] = name
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if future.exception() is None:
+                        orchestrator_logger.info('%s took %.2f s.', name, future.result())
+                        done.add(name)
+                        ran.append(name)
+                    else:
+                        orchestrator_logger.error(
+                            '%s failed.', name, exc_info=future.exception()
+                        )
+                        failed.append(name)
+        if failed:
+            raise RuntimeError(f'Stages failed or were skipped: {", ".join(failed)}')
+        return ran
+
+    def _run_stage(self, stage: Stage) -> float:
+        """Run the script of a stage as __main__ and write its stamp.
+
+        Args:
+            stage (Stage): Stage to run
+
+        Raises:
+            RuntimeError: Raised if the script exits with an error code
+
+        Returns:
+            float: Elapsed time of the stage in seconds
+        """
+        start = perf_counter()
+        try:
+            runpy.run_module(stage.module, run_name='__main__')
+        except SystemExit as e:
+            # argparse exits on invalid options
+            if e.code not in (None, 0):
+                raise RuntimeError(f'{stage.name} exited with {e.code}') from e
+        finally:
+            remove_thread_handlers()
+        stamp_path = self.stamp_path(stage.name)
+        stamp_path.parent.mkdir(parents=True, exist_ok=True)
+        stamp_path.write_text(datetime.now().isoformat(timespec='seconds'), encoding='utf-8')
+        return perf_counter() - start
+
+
+def run_stages(graph: StageGraph, targets: Iterable[str] = None, force: bool = False,
+               arguments: List[str] = None, upstream: bool = True) -> List[str]:
+    """Run a stage graph with the command line arguments given to the scripts.
+
+    The scripts share sys.argv, so every script of the run parses the same arguments.
+
+    Args:
+        graph (StageGraph): Stages to run
+        targets (Iterable[str]): Names or name prefixes of the stages to run, see
+            StageGraph.select
+        force (bool): Run the stages even if they are up to date
+        arguments (List[str]): Command line arguments of the scripts, e.g. --workers 4
+        upstream (bool): Also run the stages the targets read from, see StageGraph.select
+
+    Returns:
+        List[str]: Names of the stages that ran
+    """
+    argv = sys.argv
+    sys.argv = [argv[0], *(arguments or [])]
+    try:
+        return graph.run(targets, force, upstream)
+    finally:
+        sys.argv = argv
+
+
+def _contains(path: str, other: str) -> bool:
+    """Check if a relative path is the same as or contains another one.
+
+    Args:
+        path (str): File or directory
+        other (str): File or directory
+
+    Returns:
+        bool: True if other is path or inside of it
+    """
+    return Path(other) == Path(path) or Path(path) in Path(other).parents
+
+
+def _newest_mtime(path: Path) -> float:
+    """Latest modification time of a file or of the files in a directory.
+
+    Hidden files, such as the manifests of the stages, and __pycache__ are left out.
+
+    Args:
+        path (Path): File or directory
+
+    Returns:
+        float: modification time, 0 if there are no files
+    """
+    if path.is_file():
+        return path.stat().st_mtime
+    if not path.is_dir():
+        return 0.0
+    return max(
+        (
+            file.stat().st_mtime for file in path.rglob('*')
+            if file.is_file() and not any(
+                part.startswith('.') or part == '__pycache__'
+                for part in file.relative_to(path).parts
+            )
+        ),
+        default=0.0
+    )
@@ -0,0 +1,152 @@
+"""Functions to process model files in parallel."""
+import argparse
+import logging
+import logging.handlers
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Callable, Iterable, List
+
+parallel_logger = getLogger('utils.parallel')
+
+
+def _worker_count(value: str) -> int:
+    """Convert the --workers option to a number of workers.
+
+    Args:
+        value (str): value given to --workers
+
+    Raises:
+        argparse.ArgumentTypeError: Raised if the value is not a whole number above 0
+
+    Returns:
+        int: Number of worker processes
+    """
+    try:
+        workers = int(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f'invalid number of workers: {value}') from e
+    if workers < 1:
+        raise argparse.ArgumentTypeError('--workers must be at least 1')
+    return workers
+
+
+def workers_parser(description: str) -> argparse.ArgumentParser:
+    """Create the argument parser of a script with a --workers option.
+
+    Args:
+        description (str): Description of the script shown by --help
+
+    Returns:
+        argparse.ArgumentParser: Parser to add the other options of the script to
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        '--workers',
+        type=_worker_count,
+        default=1,
+        help='number of worker processes used to process model files (default: 1)'
+    )
+    return parser
+
+
+def parse_workers(description: str) -> int:
+    """Parse the --workers option of a script.
+
+    Args:
+        description (str): Description of the script shown by --help
+
+    Returns:
+        int: Number of worker processes, 1 to process files one at a time
+    """
+    return workers_parser(description).parse_args().workers
+
+
+class _ParentThread(logging.Filter):
+    """Sets the thread of the main process that started the worker on its records."""
+    def __init__(self, parent_thread: int):
+        super().__init__()
+        self.parent_thread = parent_thread
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.parent_thread = self.parent_thread
+        return True
+
+
+def _init_worker(log_queue: multiprocessing.Queue, level: int, parent_thread: int) -> None:
+    """Send the log records of a worker process to the main process.
+
+    Args:
+        log_queue (multiprocessing.Queue): Queue read by the listener of the main process
+        level (int): Log level of the main process
+        parent_thread (int): Thread of the main process whose log file receives the records
+    """
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(_ParentThread(parent_thread))
+    logger = logging.getLogger()
+    logger.handlers = [handler]
+    logger.setLevel(level)
+
+
+def _process_context() -> multiprocessing.context.BaseContext:
+    """Start method of the worker processes.
+
+    Workers are not forked from the process itself, as run_stages runs scripts in threads
+    and forking a process while other threads hold locks of pandas or logging can leave
+    the worker deadlocked. forkserver forks workers from a single threaded server, spawn
+    starts a fresh interpreter where forkserver is not available.
+
+    Returns:
+        multiprocessing.context.BaseContext: forkserver context, or spawn context
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def map_files(function: Callable[..., Any], files: Iterable[Path], workers: int = 1,
+              **kwargs) -> List[Any]:
+    """Apply a function to each model file, using a process pool if workers is above 1.
+
+    Files are processed in sorted order and the results are returned in that order, so the
+    outputs do not depend on the number of workers. Log records of the workers are written
+    by the handlers set up in the main process with setup_logger. Workers are started with
+    forkserver or spawn, so the function and keyword arguments must be picklable.
+
+    Args:
+        function (Callable[..., Any]): Module level function taking a file as first argument
+        files (Iterable[Path]): Model files to process
+        workers (int): Number of worker processes, 1 to process files one at a time
+        **kwargs: Keyword arguments passed to the function for every file
+
+    Returns:
+        List[Any]: Result of the function for each file in sorted order
+    """
+    files = sorted(files)
+    file_function = partial(function, **kwargs)
+    if workers <= 1 or len(files) <= 1:
+        return [file_function(file) for file in files]
+
+    workers = min(workers, len(files))
+    parallel_logger.info('Processing %s files with %s workers.', len(files), workers)
+    root_logger = logging.getLogger()
+    context = _process_context()
+    log_queue = context.Queue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *root_logger.handlers, respect_handler_level=True
+    )
+    listener.start()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(log_queue, root_logger.level, threading.get_ident())
+        ) as executor:
+            results = list(executor.map(file_function, files))
+    finally:
+        listener.stop()
+    return results
@@ -0,0 +1,521 @@
+"""Reads and writes the intermediate files of the workflows as csv, parquet or feather."""
+import importlib.util
+from dataclasses import dataclass, field
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Set
+import pandas as pd
+import wblca_benchmark_v2_data_prep.utils.general as gen
+from wblca_benchmark_v2_data_prep.utils.excel_cache import excel_engine
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+storage_logger = getLogger('utils.storage')
+
+FILE_SUFFIXES = {'csv': '.csv', 'parquet': '.parquet', 'feather': '.feather'}
+COLUMNAR_FORMATS = ('parquet', 'feather')
+
+
+def index_as_column(df: pd.DataFrame) -> pd.DataFrame:
+    """Move the index into the columns like writing a csv with its index and reading it back.
+
+    Args:
+        df (pd.DataFrame): DataFrame written with its index
+
+    Returns:
+        pd.DataFrame: DataFrame with a default index and the index as the first column
+    """
+    index_name = df.index.name if df.index.name is not None else 'Unnamed: 0'
+    return df.reset_index(names=index_name)
+
+
+def _arrow_compatible(df: pd.DataFrame, conversions: Dict[str, str] = None) -> pd.DataFrame:
+    """Give object columns holding numbers and strings a single type, as reading a csv does.
+
+    Columns of numbers only become numeric and other mixed columns become strings, so
+    the columnar formats can store them and give back what reading a csv would.
+
+    Args:
+        df (pd.DataFrame): DataFrame to write
+        conversions (Dict[str, str]): numeric or string for each column to convert, see
+            ColumnKinds, None to decide from the values of df
+
+    Returns:
+        pd.DataFrame: DataFrame with a single type per column
+    """
+    if conversions is None:
+        kinds = ColumnKinds()
+        kinds.update(df.select_dtypes(include=object))
+        conversions = kinds.conversions(df.dtypes)
+    converted = {}
+    for column, conversion in conversions.items():
+        values = df[column]
+        if conversion == 'numeric':
+            converted[column] = pd.to_numeric(values, errors='coerce')
+        else:
+            converted[column] = values.where(values.isna(), values.astype(str))
+    return df.assign(**converted) if converted else df
+
+
+def _sorted_categories(values: Set) -> list:
+    """Categories of a column in the order astype('category') gives them.
+
+    Args:
+        values (Set): Values of the column that are not missing
+
+    Returns:
+        list: sorted values, in any order if they cannot be compared
+    """
+    try:
+        return sorted(values)
+    except TypeError:
+        return list(values)
+
+
+def _arrow_type(dtype) -> 'pa.DataType':
+    """Arrow type pyarrow gives a column of a dtype.
+
+    Args:
+        dtype: dtype of the column
+
+    Returns:
+        pa.DataType: type of the column, null for object columns
+    """
+    # pylint: disable=import-outside-toplevel
+    import pyarrow as pa
+    column = pd.DataFrame({'column': pd.Series(dtype=dtype)})
+    return pa.Schema.from_pandas(column, preserve_index=False).field(0).type
+
+
+@dataclass
+class ColumnKinds():
+    """Kinds of values of the columns of a table read one part at a time.
+
+    The columnar formats need a single type per column, decided from the values of the
+    whole column. Updated with every part of a table, gives the conversions
+    _arrow_compatible makes on the whole table, the schema of the converted table and
+    the categories of its categorical columns, so the table is written in one pass.
+
+    Attributes:
+        categorical_columns (List[str]): Columns whose values are kept as categories
+        inferred (Dict[str, Set[str]]): Types pandas infers for the column in each part
+        numbers (Dict[str, int]): Values of the column that are numbers
+        values (Dict[str, int]): Values of the column that are not missing
+        numeric_dtypes (Dict[str, Set[str]]): dtypes of the column as numbers in each part
+        parts (int): Parts with rows
+        column_parts (Dict[str, int]): Parts with rows holding the column
+        empty_parts (bool): Whether a part has no rows
+        categories (Dict[str, Set]): Values of the categorical columns
+    """
+    categorical_columns: List[str] = field(default_factory=list)
+    inferred: Dict[str, Set[str]] = field(default_factory=dict, repr=False)
+    numbers: Dict[str, int] = field(default_factory=dict, repr=False)
+    values: Dict[str, int] = field(default_factory=dict, repr=False)
+    numeric_dtypes: Dict[str, Set[str]] = field(default_factory=dict, repr=False)
+    parts: int = field(default=0, repr=False)
+    column_parts: Dict[str, int] = field(default_factory=dict, repr=False)
+    empty_parts: bool = field(default=False, repr=False)
+    categories: Dict[str, Set] = field(default_factory=dict, repr=False)
+
+    def update(self, df: pd.DataFrame) -> None:
+        """Add the values of a part of the table.
+
+        Args:
+            df (pd.DataFrame): Part of the table
+        """
+        if df.empty:
+            # its columns hold no values and are Int64 as numbers, whichever it has
+            self.empty_parts = True
+            return
+        self.parts += 1
+        for column in df.columns:
+            values = df[column]
+            present = int(values.notna().sum())
+            as_numbers = pd.to_numeric(values.astype(object), errors='coerce')
+            if pd.api.types.is_numeric_dtype(values):
+                numbers = present
+            else:
+                numbers = int(as_numbers.notna().sum())
+            self.inferred.setdefault(column, set()).add(
+                pd.api.types.infer_dtype(values, skipna=True)
+            )
+            self.numbers[column] = self.numbers.get(column, 0) + numbers
+            self.values[column] = self.values.get(column, 0) + present
+            self.numeric_dtypes.setdefault(column, set()).add(str(as_numbers.dtype))
+            self.column_parts[column] = self.column_parts.get(column, 0) + 1
+            if column in self.categorical_columns:
+                self.categories.setdefault(column, set()).update(values.dropna())
+
+    def conversions(self, dtypes: pd.Series) -> Dict[str, str]:
+        """Conversions of the object columns of the table.
+
+        Args:
+            dtypes (pd.Series): dtypes of the columns of the whole table
+
+        Returns:
+            Dict[str, str]: numeric for the columns of numbers only, string for the other
+                mixed columns
+        """
+        conversions = {}
+        for column in dtypes.index[dtypes == object]:
+            inferred = self.inferred.get(column, set()) - {'empty'}
+            if not inferred or (len(inferred) == 1 and inferred <= {'string', 'boolean'}):
+                continue
+            conversions[column] = 'numeric' if self.numbers[column] == self.values[column] \
+                else 'string'
+        return conversions
+
+    def schema(self, dtypes: pd.Series) -> 'pa.Schema':
+        """Arrow schema of the whole table once _arrow_compatible converted it.
+
+        Gives the types unify_schemas promotes the schemas of the converted parts to, parts
+        without a column holding it as missing values.
+
+        Args:
+            dtypes (pd.Series): dtypes of the columns of the whole table
+
+        Returns:
+            pa.Schema: Schema of the converted table, without categorical columns as such
+        """
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        conversions = self.conversions(dtypes)
+        fields = []
+        for column, dtype in dtypes.items():
+            inferred = self.inferred.get(column, set())
+            if dtype != object:
+                types = [_arrow_type(dtype)]
+            elif conversions.get(column) == 'numeric':
+                types = [_arrow_type(numeric_dtype)
+                         for numeric_dtype in self.numeric_dtypes[column]]
+                if self.column_parts[column] < self.parts:
+                    types.append(pa.float64())
+                if self.empty_parts:
+                    types.append(pa.int64())
+            elif conversions.get(column) == 'string' or 'string' in inferred:
+                types = [pa.string()]
+            elif 'boolean' in inferred:
+                types = [pa.bool_()]
+            else:
+                types = [pa.null()]
+            fields.append(pa.unify_schemas(
+                [pa.schema([(column, arrow_type)]) for arrow_type in types],
+                promote_options='permissive'
+            ).field(0))
+        return pa.schema(fields)
+
+    def categorical_dtypes(self, dtypes: pd.Series) -> Dict[str, pd.CategoricalDtype]:
+        """Categories of the categorical columns of the whole table once converted.
+
+        Args:
+            dtypes (pd.Series): dtypes of the columns of the whole table
+
+        Returns:
+            Dict[str, pd.CategoricalDtype]: dtype of each categorical column of the table
+        """
+        conversions = self.conversions(dtypes)
+        categorical_dtypes = {}
+        for column in self.categorical_columns:
+            if column not in dtypes.index:
+                continue
+            values = pd.DataFrame({column: list(self.categories.get(column, set()))},
+                                  dtype=object)
+            values = _arrow_compatible(
+                values, {column: conversions[column]} if column in conversions else {}
+            )
+            categorical_dtypes[column] = pd.CategoricalDtype(
+                _sorted_categories(set(values[column].dropna()))
+            )
+        return categorical_dtypes
+
+
+@dataclass
+class TableStorage():
+    """Format of the intermediate files of a workflow.
+
+    Parquet and feather keep the dtypes of every column and store the categorical columns
+    as dictionaries, so reading a file back skips parsing. Both need pyarrow; without it the
+    files are written as csv. Public record files are always written as csv. Csv files are
+    read with the dtypes of their known columns.
+
+    Attributes:
+        file_format (str): csv, parquet or feather
+        categorical_columns (List[str]): Columns stored as categoricals by the columnar formats
+        column_dtypes (Dict[str, str]): Dtypes of known columns of csv files, see
+            gen.read_csv
+        excel_engine (str): Engine parsing the raw Excel files that are not cached yet, see
+            excel_cache, None for the pandas default
+    """
+    file_format: str = 'csv'
+    categorical_columns: List[str] = field(default_factory=list)
+    column_dtypes: Dict[str, str] = field(default_factory=dict, repr=False)
+    excel_engine: str = None
+
+    def __post_init__(self):
+        if self.file_format not in FILE_SUFFIXES:
+            raise ValueError(
+                f'Unknown file format {self.file_format}, use one of {list(FILE_SUFFIXES)}'
+            )
+        if self.is_columnar and importlib.util.find_spec('pyarrow') is None:
+            storage_logger.warning(
+                'pyarrow is not installed, writing csv instead of %s.', self.file_format
+            )
+            self.file_format = 'csv'
+        self.excel_engine = excel_engine(self.excel_engine)
+
+    @classmethod
+    def from_config(cls, config_path: Path,
+                    column_dtypes: Dict[str, str] = None) -> 'TableStorage':
+        """Create the storage from a config file.
+
+        Args:
+            config_path (Path): File path of config_storage.yml
+            column_dtypes (Dict[str, str]): Dtypes of known columns of csv files
+
+        Returns:
+            TableStorage: storage with the configured format
+        """
+        config = gen.read_yaml(config_path)
+        assert config is not None, 'The storage config dictionary could not be set'
+        return cls(
+            file_format=config.get('intermediate_format', 'csv'),
+            categorical_columns=config.get('categorical_columns') or [],
+            column_dtypes=column_dtypes or {},
+            excel_engine=config.get('excel_engine')
+        )
+
+    @property
+    def is_columnar(self) -> bool:
+        """bool: True if the files are written as parquet or feather."""
+        return self.file_format in COLUMNAR_FORMATS
+
+    @property
+    def suffix(self) -> str:
+        """str: File suffix of the format."""
+        return FILE_SUFFIXES[self.file_format]
+
+    def path(self, directory: Path, file_name: str) -> Path:
+        """File path of a table.
+
+        Args:
+            directory (Path): Directory of the file
+            file_name (str): File name without suffix
+
+        Returns:
+            Path: File path with the suffix of the format
+        """
+        return directory.joinpath(f'{file_name}{self.suffix}')
+
+    def glob(self, directory: Path) -> List[Path]:
+        """Files of the format in a directory.
+
+        Args:
+            directory (Path): Directory to search
+
+        Returns:
+            List[Path]: Sorted file paths with the suffix of the format
+        """
+        return sorted(directory.glob(f'*{self.suffix}'))
+
+    def write(self, df: pd.DataFrame, directory: Path, file_name: str,
+              index: bool = False) -> Path:
+        """Write a table in the format of the storage.
+
+        Args:
+            df (pd.DataFrame): DataFrame to write
+            directory (Path): Directory to write to
+            file_name (str): File name without suffix
+            index (bool): Write the index as the first column, like writing a csv with its index
+
+        Raises:
+            PermissionError: Raised if the file is open
+            IOError: Raised if the file cannot be written
+
+        Returns:
+            Path: File path written to
+        """
+        write_path = self.path(directory, file_name)
+        if not self.is_columnar:
+            if index:
+                gen.write_to_csv(df, directory, file_name)
+                return write_path
+            try:
+                df.to_csv(write_path, index=False)
+            except PermissionError as pe:
+                storage_logger.exception('Permission Error probably caused by having file open')
+                raise PermissionError('Try closing the file you are trying to write to') from pe
+            storage_logger.info('Data has been saved to %s', write_path)
+            return write_path
+
+        df = index_as_column(df) if index else df.reset_index(drop=True)
+        df = _arrow_compatible(df)
+        categorical_columns = [col for col in self.categorical_columns if col in df.columns]
+        if categorical_columns:
+            df = df.astype({col: 'category' for col in categorical_columns})
+        try:
+            if self.file_format == 'parquet':
+                df.to_parquet(write_path, index=False)
+            else:
+                df.to_feather(write_path)
+        except PermissionError as pe:
+            storage_logger.exception('Permission Error probably caused by having file open')
+            raise PermissionError('Try closing the file you are trying to write to') from pe
+        except IOError as io:
+            storage_logger.exception('IO Error for %s file', self.file_format)
+            raise IOError(f'Trouble writing {self.file_format} file') from io
+        storage_logger.info('Data has been saved to %s', write_path)
+        return write_path
+
+    def write_chunks(self, chunks: Iterable[pd.DataFrame], directory: Path, file_name: str,
+                     kinds: ColumnKinds = None) -> Path:
+        """Write a table one chunk at a time, without holding the whole table in memory.
+
+        Csv chunks are appended under a single header. Parquet chunks are written as row
+        groups and feather chunks as record batches, with the column types and categories
+        kinds gives the whole table. Chunks must have the same columns and dtypes.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Chunks of the table
+            directory (Path): Directory to write to
+            file_name (str): File name without suffix
+            kinds (ColumnKinds): Kinds of the values of every chunk, with the categorical
+                columns of the storage, needed by the columnar formats
+
+        Raises:
+            ValueError: Raised if kinds is not given for a columnar format
+            PermissionError: Raised if the file is open
+            IOError: Raised if the file cannot be written
+
+        Returns:
+            Path: File path written to
+        """
+        if self.is_columnar and kinds is None:
+            raise ValueError(f'Writing {self.file_format} chunks needs the kinds of the table')
+        write_path = self.path(directory, file_name)
+        try:
+            if not self.is_columnar:
+                for number, chunk in enumerate(chunks):
+                    chunk.to_csv(
+                        write_path, index=False, header=number == 0,
+                        mode='w' if number == 0 else 'a'
+                    )
+            else:
+                self._write_columnar_chunks(chunks, write_path, kinds)
+        except PermissionError as pe:
+            storage_logger.exception('Permission Error probably caused by having file open')
+            raise PermissionError('Try closing the file you are trying to write to') from pe
+        except IOError as io:
+            storage_logger.exception('IO Error for %s file', self.file_format)
+            raise IOError(f'Trouble writing {self.file_format} file') from io
+        storage_logger.info('Data has been saved to %s', write_path)
+        return write_path
+
+    def _write_columnar_chunks(self, chunks: Iterable[pd.DataFrame], write_path: Path,
+                               kinds: ColumnKinds) -> None:
+        """Write the chunks of a table as parquet row groups or feather record batches.
+
+        Categorical columns get the categories of the whole table in every chunk, as
+        feather files hold a single dictionary per column.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Chunks of the table
+            write_path (Path): File path to write to
+            kinds (ColumnKinds): Kinds of the values of every chunk
+        """
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                if writer is None:
+                    conversions = kinds.conversions(chunk.dtypes)
+                    categorical_dtypes = kinds.categorical_dtypes(chunk.dtypes)
+                    schema = kinds.schema(chunk.dtypes)
+                chunk = _arrow_compatible(chunk.reset_index(drop=True), conversions)
+                table = pa.Table.from_pandas(
+                    chunk.astype(categorical_dtypes), preserve_index=False
+                )
+                if writer is None:
+                    # dictionaries are the same in every chunk, the other types are promoted
+                    schema = pa.schema(
+                        [table.schema.field(name) if name in categorical_dtypes
+                         else schema.field(name) for name in schema.names],
+                        metadata=table.schema.metadata
+                    )
+                    writer = pq.ParquetWriter(write_path, schema) \
+                        if self.file_format == 'parquet' else pa.ipc.new_file(write_path, schema)
+                writer.write_table(table.cast(schema))
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def read(self, file_path: Path, keep_categories: bool = False,
+             usecols: Callable[[str], bool] = None) -> pd.DataFrame:
+        """Read a table written in any of the formats, based on its suffix.
+
+        Parquet and feather files are memory mapped instead of parsed.
+
+        Args:
+            file_path (Path): File path of the table
+            keep_categories (bool): Keep categorical columns as categoricals, otherwise they
+                are given back as the object columns the stages work with
+            usecols (Callable[[str], bool]): True for the columns to read, None for every
+                column
+
+        Raises:
+            PermissionError: Raised if the file is open
+            IOError: Raised if the file cannot be read
+
+        Returns:
+            pd.DataFrame: DataFrame of the table
+        """
+        if file_path.suffix == FILE_SUFFIXES['csv']:
+            return gen.read_csv(file_path, usecols=usecols, dtype=self.column_dtypes)
+
+        try:
+            storage_logger.info('Reading %s', file_path.stem)
+            columns = None if usecols is None else [
+                name for name in self._column_names(file_path) if usecols(name)
+            ]
+            if file_path.suffix == FILE_SUFFIXES['parquet']:
+                df = pd.read_parquet(file_path, columns=columns, memory_map=True)
+            else:
+                # pylint: disable=import-outside-toplevel
+                from pyarrow import feather
+                df = feather.read_table(file_path, columns=columns, memory_map=True).to_pandas()
+        except PermissionError as pe:
+            storage_logger.exception('Permission Error probably caused by having file open')
+            raise PermissionError('Try closing out the file you are trying to read') from pe
+        except IOError as io:
+            storage_logger.exception('IO Error for %s file', file_path.suffix)
+            raise IOError(f'Trouble reading {file_path.suffix} file') from io
+
+        if not keep_categories:
+            categorical_columns = df.columns[
+                [isinstance(dtype, pd.CategoricalDtype) for dtype in df.dtypes]
+            ]
+            if len(categorical_columns):
+                df = df.astype({col: object for col in categorical_columns})
+        storage_logger.info('Read data from file %s', file_path.name)
+        return df
+
+    @staticmethod
+    def _column_names(file_path: Path) -> List[str]:
+        """Column names of a parquet or feather file, read from its schema.
+
+        Args:
+            file_path (Path): File path of the table
+
+        Returns:
+            List[str]: names of the columns
+        """
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        from pyarrow import parquet as pq
+        if file_path.suffix == FILE_SUFFIXES['parquet']:
+            return pq.read_schema(file_path, memory_map=True).names
+        with pa.memory_map(str(file_path)) as source:
+            return pa.ipc.open_file(source).schema.names